@@ -0,0 +1,246 @@
+import time
+import ctypes
+import threading
+from collections import deque
+import numpy as np
+
+DROP_POLICIES = ("oldest", "newest", "block")
+
+
+class CaptureStatistics:
+    def __init__(self, window=1000):
+        self.latencies = deque(maxlen=window)
+        self.readback_times = deque(maxlen=window)
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        self.max_queued = 0
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return 0.0
+        return float(np.percentile(np.fromiter(values, np.dtype('float64')), q))
+
+    def summary(self):
+        return {'frames_captured': self.captured,
+                'frames_written': self.written,
+                'frames_dropped': self.dropped,
+                'max_queued': self.max_queued,
+                'readback_p50_ms': 1000 * self._percentile(self.readback_times, 50),
+                'readback_p95_ms': 1000 * self._percentile(self.readback_times, 95),
+                'latency_p50_ms': 1000 * self._percentile(self.latencies, 50),
+                'latency_p95_ms': 1000 * self._percentile(self.latencies, 95),
+                'latency_max_ms': 1000 * self._percentile(self.latencies, 100)}
+
+
+class PixelBufferReader:
+    def __init__(self, screen_size, buffers=2):
+
+        '''
+            Reads the framebuffer as BGRA through a ring of GL_PIXEL_PACK_BUFFERs.
+            read() only queues the copy on the GPU; a buffer is mapped when the
+            ring comes back around to it, buffers - 1 frames later, by which time
+            the copy has finished. buffers=0 reads synchronously instead.
+            read(), repeat() and finish() return the frames completed by the call
+            as (pixels, stamp) pairs, oldest first, with pixels bottom-up.
+        '''
+        from OpenGL.GL import glGenBuffers, glBufferData, glBindBuffer, GL_STREAM_READ, GL_PIXEL_PACK_BUFFER
+        self.screen_size = tuple(screen_size)
+        self.frame_bytes = self.screen_size[0] * self.screen_size[1] * 4
+        self.buffers = [int(buffer) for buffer in np.atleast_1d(glGenBuffers(buffers))] if buffers else []
+        for buffer in self.buffers:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.frame_bytes, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        self._free = list(self.buffers)
+        # [buffer, stamp, stamps of idle frames that repeat it]
+        self._pending = deque()
+        self._last = None
+
+    def _read_into(self, target):
+        from OpenGL.GL import glPixelStorei, glReadPixels, GL_PACK_ALIGNMENT, GL_BGRA, GL_UNSIGNED_BYTE
+        width, height = self.screen_size
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        return glReadPixels(0, 0, width, height, GL_BGRA, GL_UNSIGNED_BYTE, target)
+
+    def _finish_oldest(self):
+        from OpenGL.GL import glBindBuffer, glMapBufferRange, glUnmapBuffer, GL_PIXEL_PACK_BUFFER, GL_MAP_READ_BIT
+        buffer, stamp, repeats = self._pending.popleft()
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+        address = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0, self.frame_bytes, GL_MAP_READ_BIT)
+        # the mapping is only valid until unmapped, so the frame is copied out of it
+        pixels = np.ctypeslib.as_array((ctypes.c_ubyte * self.frame_bytes).from_address(address)).copy()
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._free.append(buffer)
+        self._last = pixels
+        return [(pixels, stamp)] + [(pixels, repeat) for repeat in repeats]
+
+    def read(self, stamp):
+        from OpenGL.GL import glBindBuffer, GL_PIXEL_PACK_BUFFER
+        if not self.buffers:
+            self._last = np.frombuffer(self._read_into(None), np.dtype('uint8'))
+            return [(self._last, stamp)]
+
+        finished = self._finish_oldest() if not self._free else []
+        buffer = self._free.pop()
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+        self._read_into(ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._pending.append([buffer, stamp, []])
+        return finished
+
+    def repeat(self, stamp):
+        # an idle frame shows the same image as the last frame read
+        if self._pending:
+            self._pending[-1][2].append(stamp)
+            return []
+        if self._last is not None:
+            return [(self._last, stamp)]
+        return []
+
+    def finish(self):
+        finished = []
+        while self._pending:
+            finished += self._finish_oldest()
+        return finished
+
+    def close(self):
+        from OpenGL.GL import glDeleteBuffers
+        self._pending.clear()
+        if self.buffers:
+            glDeleteBuffers(len(self.buffers), self.buffers)
+            self.buffers = []
+            self._free = []
+
+
+class FrameCapture:
+    def __init__(self,
+                 path,
+                 screen_size,
+                 fps=30,
+                 fourcc="mp4v",
+                 queue_size=8,
+                 drop_policy="oldest",
+                 pixel_buffers=2,
+                 clock=time.perf_counter):
+
+        '''
+            Records the frames drawn in the current GL context to a video file.
+            capture() is called once a frame is drawn and before it is presented;
+            it only starts an asynchronous readback (see PixelBufferReader). The
+            frames that come back are handed to a background thread that flips,
+            converts and encodes them with cv2.VideoWriter. At most queue_size
+            frames wait for that thread. When the queue is full, "oldest" drops
+            the longest waiting frame, "newest" drops the incoming one and
+            "block" makes the render loop wait. Latency is measured from
+            capture() to the frame being written. If writing fails, the error
+            is raised from the next capture(), repeat() or close().
+        '''
+        import cv2
+
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError("drop_policy must be one of %s, got %r" % (DROP_POLICIES, drop_policy))
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1, got %r" % (queue_size,))
+
+        self.path = path
+        self.screen_size = tuple(screen_size)
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.clock = clock
+        self.statistics = CaptureStatistics()
+
+        self._writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, self.screen_size)
+        if not self._writer.isOpened():
+            raise RuntimeError("cv2.VideoWriter could not open %r with fourcc %r" % (path, fourcc))
+        self._reader = PixelBufferReader(self.screen_size, pixel_buffers)
+
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        # set by the writer thread when encoding fails, raised again on the render thread
+        self._error = None
+        self._thread = threading.Thread(target=self._write_frames, name="FrameCapture", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _raise_writer_error(self):
+        if self._error is not None:
+            raise RuntimeError("writing %r failed" % (self.path,)) from self._error
+
+    def capture(self):
+        self._raise_writer_error()
+        start = self.clock()
+        finished = self._reader.read(start)
+        self.statistics.readback_times.append(self.clock() - start)
+        self._offer(finished)
+
+    def repeat(self):
+        self._raise_writer_error()
+        self._offer(self._reader.repeat(self.clock()))
+
+    def _offer(self, finished):
+        with self._condition:
+            for item in finished:
+                self.statistics.captured += 1
+                if len(self._queue) >= self.queue_size:
+                    if self.drop_policy == "newest":
+                        self.statistics.dropped += 1
+                        continue
+                    if self.drop_policy == "oldest":
+                        self._queue.popleft()
+                        self.statistics.dropped += 1
+                    else:
+                        self._condition.wait_for(lambda: len(self._queue) < self.queue_size or self._error is not None)
+                        self._raise_writer_error()
+                self._queue.append(item)
+                self.statistics.max_queued = max(self.statistics.max_queued, len(self._queue))
+            self._condition.notify_all()
+
+    def _write_frames(self):
+        width, height = self.screen_size
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                pixels, stamp = self._queue.popleft()
+                self._condition.notify_all()
+
+            try:
+                # GL rows run bottom-up and the readback is BGRA; the writer wants top-down BGR
+                frame = np.ascontiguousarray(pixels.reshape(height, width, 4)[::-1, :, :3])
+                self._writer.write(frame)
+            except Exception as error:
+                with self._condition:
+                    self._error = error
+                    self._queue.clear()
+                    self._condition.notify_all()
+                return
+            self.statistics.written += 1
+            self.statistics.latencies.append(self.clock() - stamp)
+
+    def close(self):
+        if self._closed:
+            return
+        try:
+            # frames still in pixel buffers are mapped now, while the context is current
+            finished = self._reader.finish()
+            self._reader.close()
+            if self._error is None:
+                self._offer(finished)
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            self._thread.join()
+            self._writer.release()
+        self._raise_writer_error()
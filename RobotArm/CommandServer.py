@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import socket
+import asyncio
+import threading
+from collections import deque
+import numpy as np
+
+SETPOINT_FIELDS = ("theta", "theta_degree", "phi", "phi_degree", "origin")
+# a later setpoint in either unit replaces an earlier one in the other
+ALIASES = {"theta": "theta_degree", "theta_degree": "theta", "phi": "phi_degree", "phi_degree": "phi"}
+
+
+def parse_setpoint(command, part_names):
+    if not isinstance(command, dict):
+        raise ValueError("a command must be an object, got %r" % (command,))
+    part = command.get("part")
+    if part not in part_names:
+        raise ValueError("unknown part %r, expected one of %s" % (part, sorted(part_names)))
+
+    setpoint = {}
+    for field, value in command.items():
+        if field == "part":
+            continue
+        if field not in SETPOINT_FIELDS:
+            raise ValueError("unknown field %r, expected one of %s" % (field, SETPOINT_FIELDS))
+        if field == "origin":
+            value = np.asarray(value, np.dtype('float64'))
+            if value.shape != (3,) or not np.isfinite(value).all():
+                raise ValueError("origin must be 3 finite numbers, got %r" % (command[field],))
+        else:
+            value = float(value)
+            if not np.isfinite(value):
+                raise ValueError("%s must be finite, got %r" % (field, command[field]))
+        setpoint[field] = value
+    return part, setpoint
+
+
+class CommandStatistics:
+    def __init__(self, window=1000):
+        self.latencies = deque(maxlen=window)
+        self.batches = 0
+        self.commands = 0
+        self.applied = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return 0.0
+        return float(np.percentile(np.fromiter(values, np.dtype('float64')), q))
+
+    def summary(self):
+        return {'batches': self.batches,
+                'commands': self.commands,
+                'applied': self.applied,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected,
+                'latency_p50_ms': 1000 * self._percentile(self.latencies, 50),
+                'latency_p95_ms': 1000 * self._percentile(self.latencies, 95),
+                'latency_max_ms': 1000 * self._percentile(self.latencies, 100)}
+
+
+class CommandServer:
+    def __init__(self,
+                 parts,
+                 host="127.0.0.1",
+                 port=0,
+                 path=None,
+                 clock=time.perf_counter):
+
+        '''
+            Accepts joint setpoints for the named parts over TCP (host, port; port 0
+            picks a free one) or a Unix domain socket (path). The asyncio loop runs
+            on its own thread. Each line a client sends is one JSON batch:
+
+                {"id": 7, "commands": [{"part": "part0", "theta": 1.2, "origin": [0, -2, -5]}]}
+
+            Setpoints are absolute. Those arriving between two apply() calls are
+            merged per part, the latest value of each field winning, and applied
+            together by the render loop. Once the frame showing a batch is
+            presented (frame_presented()), the client gets back
+            {"id": 7, "frame": n, "latency_ms": ...}, measured from the batch
+            being received to that frame. Invalid batches are answered with
+            {"id": 7, "error": "..."} and not applied at all.
+        '''
+        self.parts = dict(parts)
+        self.host = host
+        self.port = port
+        self.path = path
+        self.clock = clock
+        self.statistics = CommandStatistics()
+        self.address = None
+
+        self._lock = threading.Lock()
+        self._setpoints = {}
+        self._received = []
+        self._applied = []
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+        self._error = None
+        # writer -> the task serving that client, so close() can end them
+        self._clients = {}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="CommandServer", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+        return self
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._listen())
+        except OSError as error:
+            self._error = error
+            self._started.set()
+            self._loop.close()
+            return
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _listen(self):
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+            self.address = self.path
+        else:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+
+    async def _serve(self, reader, writer):
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self._receive(line, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    def _receive(self, line, writer):
+        received = self.clock()
+        batch_id = None
+        try:
+            batch = json.loads(line)
+            batch_id = batch.get("id") if isinstance(batch, dict) else None
+            commands = batch.get("commands") if isinstance(batch, dict) else None
+            if not isinstance(commands, list):
+                raise ValueError("a batch must be an object with a list of commands")
+            setpoints = [parse_setpoint(command, self.parts) for command in commands]
+        except (ValueError, TypeError) as error:
+            self.statistics.rejected += 1
+            self._reply(writer, {"id": batch_id, "error": str(error)})
+            return
+
+        with self._lock:
+            self.statistics.batches += 1
+            self.statistics.commands += len(setpoints)
+            for part, setpoint in setpoints:
+                pending = self._setpoints.setdefault(part, {})
+                for field, value in setpoint.items():
+                    if field in pending or ALIASES.get(field) in pending:
+                        self.statistics.coalesced += 1
+                    pending.pop(ALIASES.get(field), None)
+                    pending[field] = value
+            self._received.append((batch_id, received, writer))
+
+    def _reply(self, writer, message):
+        if not writer.is_closing():
+            writer.write((json.dumps(message) + "\n").encode())
+
+    def apply(self):
+        # called from the render loop; the network thread only ever touches the pending dicts
+        with self._lock:
+            setpoints, self._setpoints = self._setpoints, {}
+            received, self._received = self._received, []
+
+        for name, setpoint in setpoints.items():
+            part = self.parts[name]
+            for field, value in setpoint.items():
+                setattr(part, field, value)
+                self.statistics.applied += 1
+        self._applied += received
+        return len(setpoints)
+
+    def frame_presented(self, frame):
+        if not self._applied:
+            return
+        now = self.clock()
+        replies = []
+        for batch_id, received, writer in self._applied:
+            latency = now - received
+            self.statistics.latencies.append(latency)
+            replies.append((writer, {"id": batch_id, "frame": frame, "latency_ms": 1000 * latency}))
+        self._applied = []
+        for writer, message in replies:
+            self._loop.call_soon_threadsafe(self._reply, writer, message)
+
+    def close(self):
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        async def shutdown():
+            self._server.close()
+            # batches never presented get an answer instead of silence; close() runs on the
+            # render thread, which waits here, so _applied is not touched concurrently
+            with self._lock:
+                pending, self._received = self._applied + self._received, []
+                self._setpoints = {}
+            self._applied = []
+            for batch_id, _, writer in pending:
+                self._reply(writer, {"id": batch_id, "error": "the command server closed before the batch was presented"})
+
+            # since 3.12 wait_closed() also waits for client connections, so they are ended first
+            tasks = list(self._clients.values())
+            for writer in list(self._clients):
+                if writer.can_write_eof():
+                    writer.write_eof()
+                writer.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class CommandClient:
+    def __init__(self, address, timeout=5.0):
+
+        '''
+            A blocking stand-in for an external planner: address is a (host, port)
+            pair or a Unix socket path, as in CommandServer.address.
+        '''
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        self.socket.connect(address if isinstance(address, str) else tuple(address))
+        self.file = self.socket.makefile('rb')
+        self.next_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def send(self, commands, batch_id=None):
+        if batch_id is None:
+            batch_id = self.next_id
+            self.next_id += 1
+        commands = [{field: (np.asarray(value).tolist() if field == "origin" else value)
+                     for field, value in command.items()} for command in commands]
+        self.socket.sendall((json.dumps({"id": batch_id, "commands": commands}) + "\n").encode())
+        return batch_id
+
+    def receive(self):
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("the command server closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
@@ -0,0 +1,174 @@
+import numpy as np
+
+
+class Chain:
+    def __init__(self, parts):
+        self.parts = list(parts)
+        if not self.parts:
+            raise ValueError("a chain needs at least one part")
+
+        self.lengths = np.array([part.length for part in self.parts], np.dtype('float64'))
+
+        # Part.x/y/z read the origin as (x, z, y); the chain keeps that convention so both agree
+        origin = np.asarray(self.parts[0].origin, np.dtype('float64'))
+        self.base = origin[[0, 2, 1]]
+
+    def __len__(self):
+        return len(self.parts)
+
+    @property
+    def joint_count(self):
+        return 2 * len(self.parts)
+
+    def joints(self):
+        return np.array([[part.theta, part.phi] for part in self.parts], np.dtype('float64')).ravel()
+
+    def forward(self, joints, cumulative=False, degrees=False):
+
+        '''
+            joints: (M, J) with J = 2 * len(parts), columns theta_0, phi_0, theta_1, phi_1, ...
+            returns (M, len(parts) + 1, 3): the chain base followed by the end point of every
+            part, each part starting at the end of the previous one. Angles are absolute
+            (as on Part) unless cumulative, where each one adds to the previous part's.
+            A single (J,) configuration returns (len(parts) + 1, 3).
+        '''
+        joints = np.asarray(joints, np.dtype('float64'))
+        single = joints.ndim == 1
+        joints = np.atleast_2d(joints)
+        if joints.ndim != 2 or joints.shape[1] != self.joint_count:
+            raise ValueError("joints must have shape (M, %d), got %s" % (self.joint_count, joints.shape))
+
+        if degrees:
+            joints = np.radians(joints)
+
+        theta = joints[:, 0::2]
+        phi = joints[:, 1::2]
+        if cumulative:
+            theta = np.cumsum(theta, axis=1)
+            phi = np.cumsum(phi, axis=1)
+
+        r = self.lengths * np.sin(phi)
+        positions = np.empty((joints.shape[0], len(self.parts) + 1, 3))
+        positions[:, 0] = self.base
+        positions[:, 1:, 0] = r * np.cos(theta)
+        positions[:, 1:, 1] = self.lengths * np.cos(phi)
+        positions[:, 1:, 2] = r * np.sin(theta)
+        np.cumsum(positions, axis=1, out=positions)
+
+        if single:
+            return positions[0]
+        return positions
+
+    def end_effector(self, joints, cumulative=False, degrees=False):
+        return self.forward(joints, cumulative, degrees)[..., -1, :]
+
+    def jacobian(self, joints, cumulative=False):
+        joints = np.atleast_2d(np.asarray(joints, np.dtype('float64')))
+        theta = joints[:, 0::2]
+        phi = joints[:, 1::2]
+        if cumulative:
+            theta = np.cumsum(theta, axis=1)
+            phi = np.cumsum(phi, axis=1)
+
+        sin_theta = np.sin(theta)
+        cos_theta = np.cos(theta)
+        r = self.lengths * np.sin(phi)
+        h = self.lengths * np.cos(phi)
+
+        jacobian = np.zeros((joints.shape[0], 3, self.joint_count))
+        jacobian[:, 0, 0::2] = -r * sin_theta
+        jacobian[:, 2, 0::2] = r * cos_theta
+        jacobian[:, 0, 1::2] = h * cos_theta
+        jacobian[:, 1, 1::2] = -r
+        jacobian[:, 2, 1::2] = h * sin_theta
+
+        if cumulative:
+            # a relative joint moves every part after it as well
+            jacobian[:, :, 0::2] = np.cumsum(jacobian[:, :, 0::2][:, :, ::-1], axis=2)[:, :, ::-1]
+            jacobian[:, :, 1::2] = np.cumsum(jacobian[:, :, 1::2][:, :, ::-1], axis=2)[:, :, ::-1]
+        return jacobian
+
+
+class IKResult:
+    def __init__(self, joints, iterations, residuals, tolerance):
+        self.joints = joints
+        self.iterations = iterations
+        self.residuals = residuals
+        self.converged = residuals <= tolerance
+
+    def __len__(self):
+        return self.joints.shape[0]
+
+    def summary(self):
+        return {'targets': len(self),
+                'converged': int(np.count_nonzero(self.converged)),
+                'mean_iterations': float(np.mean(self.iterations)),
+                'max_iterations': int(np.max(self.iterations)),
+                'mean_residual': float(np.mean(self.residuals)),
+                'max_residual': float(np.max(self.residuals))}
+
+
+class IKSolver:
+    def __init__(self,
+                 chain,
+                 max_iterations=100,
+                 tolerance=1e-4,
+                 damping=0.05,
+                 cumulative=False):
+
+        self.chain = chain
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.damping = damping
+        self.cumulative = cumulative
+        self.last_solution = None
+
+    def solve(self, targets, initial=None):
+
+        '''
+            Damped least squares: dq = J^T (J J^T + damping^2 I)^-1 (target - end_effector),
+            run on every target at once. Rows stop updating once their residual is below
+            tolerance. Without initial joints the previous solution is reused when it has
+            the same number of targets, else the chain's current joints.
+        '''
+        targets = np.atleast_2d(np.asarray(targets, np.dtype('float64')))
+        if targets.ndim != 2 or targets.shape[1] != 3:
+            raise ValueError("targets must have shape (M, 3), got %s" % (targets.shape,))
+
+        if initial is None:
+            if self.last_solution is not None and self.last_solution.shape[0] == targets.shape[0]:
+                initial = self.last_solution
+            else:
+                initial = self.chain.joints()
+        joints = np.array(np.broadcast_to(initial, (targets.shape[0], self.chain.joint_count)),
+                          np.dtype('float64'))
+
+        iterations = np.zeros(targets.shape[0], np.dtype('int64'))
+        errors = targets - self.chain.end_effector(joints, self.cumulative)
+        residuals = np.linalg.norm(errors, axis=1)
+        active = np.flatnonzero(residuals > self.tolerance)
+        damping = self.damping ** 2 * np.eye(3)
+
+        for _ in range(self.max_iterations):
+            if active.size == 0:
+                break
+            jacobian = self.chain.jacobian(joints[active], self.cumulative)
+            step = np.linalg.solve(np.matmul(jacobian, np.swapaxes(jacobian, 1, 2)) + damping,
+                                   errors[active][:, :, np.newaxis])
+            joints[active] += np.matmul(np.swapaxes(jacobian, 1, 2), step)[:, :, 0]
+            iterations[active] += 1
+
+            errors[active] = targets[active] - self.chain.end_effector(joints[active], self.cumulative)
+            residuals[active] = np.linalg.norm(errors[active], axis=1)
+            active = active[residuals[active] > self.tolerance]
+
+        self.last_solution = joints
+        return IKResult(joints, iterations, residuals, self.tolerance)
+
+
+def forward_kinematics(parts, joints, cumulative=False, degrees=False):
+    return Chain(parts).forward(joints, cumulative, degrees)
+
+
+def inverse_kinematics(parts, targets, initial=None, **options):
+    return IKSolver(Chain(parts), **options).solve(targets, initial)
@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class NoiseSource:
+    def __init__(self, std_deviation=0.1, seed=None, block_size=4096):
+        self.std_deviation = std_deviation
+        self.block_size = block_size
+        self.seed = seed
+        self.generator = np.random.default_rng(seed)
+
+        # standard normal samples, scaled on read so std_deviation can change between blocks
+        self._block = np.empty(0)
+        self._index = 0
+
+    def reseed(self, seed):
+        self.seed = seed
+        self.generator = np.random.default_rng(seed)
+        self._block = np.empty(0)
+        self._index = 0
+
+    def _refill(self):
+        self._block = self.generator.standard_normal(self.block_size)
+        self._index = 0
+
+    def sample(self):
+        if self._index == self._block.size:
+            self._refill()
+        value = self._block[self._index]
+        self._index += 1
+        return self.std_deviation * value
+
+    def samples(self, count):
+        samples = np.empty(count)
+        filled = 0
+        while filled < count:
+            if self._index == self._block.size:
+                self._refill()
+            taken = min(count - filled, self._block.size - self._index)
+            samples[filled:filled + taken] = self._block[self._index:self._index + taken]
+            self._index += taken
+            filled += taken
+        return self.std_deviation * samples
+
+
+def seed_parts(parts, seed):
+    # independent streams per part, all reproducible from one seed
+    for part, part_seed in zip(parts, np.random.SeedSequence(seed).spawn(len(parts))):
+        part.noise_source.reseed(part_seed)
+
+
+def chain_noise(parts, steps):
+    return np.stack([part.noise_source.samples(steps) for part in parts], axis=1)
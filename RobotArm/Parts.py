@@ -1,6 +1,10 @@
-from random import gauss
 import numpy as np
 from solids.Solids import *
+from solids.Baking import bake
+from solids.SceneGraph import SceneNode
+from solids.LevelOfDetail import LevelOfDetail
+from solids import Tracing
+from RobotArm.Noise import NoiseSource
 
 
 class Part:
@@ -11,20 +15,26 @@ class Part:
                  theta_degree=None,
                  phi=None,
                  phi_degree=None,
-                 noise_std_deviation=0.1):
+                 noise_std_deviation=0.1,
+                 noise_seed=None):
 
         self._origin = np.asarray(origin, np.dtype('float64'))
-        self.length = length
+        self._length = length
         self._theta = 0
         self._theta_degree = 0
         self._phi = 0
         self._phi_degree = 0
-        self.r = length * np.sin(phi)
-        self.x = int(self.r * np.cos(theta) + self._origin[0])
-        self.z = int(self.r * np.sin(theta) + self._origin[1])
-        self.y = int(length * np.cos(phi) + self._origin[2])
 
-        self.noise_std_deviation = noise_std_deviation
+        # r, x, y and z are derived from the pose on first read after a change
+        self._r = 0
+        self._x = 0
+        self._y = 0
+        self._z = 0
+        self._end_point_stale = True
+        self._pose_version = 0
+        self._drawn_pose_version = -1
+
+        self.noise_source = NoiseSource(noise_std_deviation, noise_seed)
 
         if theta is not None and theta_degree is None:
             self.theta = theta
@@ -37,8 +47,61 @@ class Part:
             self.phi_degree = phi_degree
 
     def draw(self, mode="spherical"):
+        if Tracing.tracer is None:
+            self._draw(mode)
+        else:
+            with Tracing.tracer.span(type(self).__name__ + ".draw", "draw", part=type(self).__name__):
+                self._draw(mode)
+        self._drawn_pose_version = self._pose_version
+
+    def _draw(self, mode="spherical"):
         pass
 
+    @property
+    def dirty(self):
+        return self._drawn_pose_version != self._pose_version
+
+    def _pose_changed(self):
+        self._end_point_stale = True
+        self._pose_version += 1
+
+    def _update_end_point(self):
+        if self._end_point_stale:
+            self._r = self._length * np.sin(self._phi)
+            self._x = self._r * np.cos(self._theta) + self._origin[0]
+            self._z = self._r * np.sin(self._theta) + self._origin[1]
+            self._y = self._length * np.cos(self._phi) + self._origin[2]
+            self._end_point_stale = False
+
+    @property
+    def r(self):
+        self._update_end_point()
+        return self._r
+
+    @property
+    def x(self):
+        self._update_end_point()
+        return self._x
+
+    @property
+    def y(self):
+        self._update_end_point()
+        return self._y
+
+    @property
+    def z(self):
+        self._update_end_point()
+        return self._z
+
+    @property
+    def length(self):
+        return self._length
+
+    @length.setter
+    def length(self, value):
+        self._length = value
+        self._pose_changed()
+
     @property
     def origin(self):
         return self._origin
@@ -46,10 +109,7 @@ class Part:
     @origin.setter
     def origin(self, value):
         self._origin = np.asarray(np.asarray(value, np.dtype('float64')))
-        self.r = self.length * np.sin(self.phi)
-        self.x = self.r * np.cos(self._theta) + self._origin[0]
-        self.z = self.r * np.sin(self._theta) + self._origin[1]
-        self.y = self.length * np.cos(self._phi) + self._origin[2]
+        self._pose_changed()
 
     @property
     def theta(self):
@@ -63,10 +123,7 @@ class Part:
         elif self._theta > 2*np.pi:
             self._theta -= 2*np.pi
         self._theta_degree = 180 * (value / np.pi)
-        self.r = self.length * np.sin(self.phi)
-        self.x = self.r * np.cos(self._theta) + self._origin[0]
-        self.z = self.r * np.sin(self._theta) + self._origin[1]
-        self.y = self.length * np.cos(self._phi) + self._origin[2]
+        self._pose_changed()
 
     @property
     def theta_degree(self):
@@ -80,10 +137,7 @@ class Part:
         elif self._theta_degree > 360:
             self._theta_degree -= 360
         self._theta = np.pi * (value / 180)
-        self.r = self.length * np.sin(self.phi)
-        self.x = self.r * np.cos(self._theta) + self._origin[0]
-        self.z = self.r * np.sin(self._theta) + self._origin[1]
-        self.y = self.length * np.cos(self._phi) + self._origin[2]
+        self._pose_changed()
 
     @property
     def phi(self):
@@ -97,10 +151,7 @@ class Part:
         elif self._phi > 2 * np.pi:
             self._phi -= 2 * np.pi
         self._phi_degree = 180 * (value / np.pi)
-        self.r = self.length * np.sin(self.phi)
-        self.x = self.r * np.cos(self._theta) + self._origin[0]
-        self.z = self.r * np.sin(self._theta) + self._origin[1]
-        self.y = self.length * np.cos(self._phi) + self._origin[2]
+        self._pose_changed()
 
     @property
     def phi_degree(self):
@@ -114,14 +165,22 @@ class Part:
         elif self._phi_degree > 360:
             self._phi_degree -= 360
         self._phi = np.pi * (value / 180)
-        self.r = self.length * np.sin(self.phi)
-        self.x = self.r * np.cos(self._theta) + self._origin[0]
-        self.z = self.r * np.sin(self._theta) + self._origin[1]
-        self.y = self.length * np.cos(self._phi) + self._origin[2]
+        self._pose_changed()
+
+    @property
+    def noise_std_deviation(self):
+        return self.noise_source.std_deviation
+
+    @noise_std_deviation.setter
+    def noise_std_deviation(self, value):
+        self.noise_source.std_deviation = value
 
     @property
     def noise(self):
-        return gauss(mu=0, sigma=self.noise_std_deviation)
+        return self.noise_source.sample()
+
+    def noise_samples(self, count):
+        return self.noise_source.samples(count)
 
 
 class MasterPart(Part):
@@ -132,7 +191,9 @@ class MasterPart(Part):
                  theta_degree=None,
                  phi=None,
                  phi_degree=None,
-                 noise_std_deviation=0.1):
+                 noise_std_deviation=0.1,
+                 noise_seed=None,
+                 level_of_detail=False):
 
         super().__init__(origin=origin,
                          theta=theta,
@@ -140,7 +201,8 @@ class MasterPart(Part):
                          phi=phi,
                          phi_degree=phi_degree,
                          length=length,
-                         noise_std_deviation=noise_std_deviation)
+                         noise_std_deviation=noise_std_deviation,
+                         noise_seed=noise_seed)
 
         self.fixed_base_list = []
 
@@ -160,22 +222,22 @@ class MasterPart(Part):
                                             phi=0,
                                             size=(1.5, 0.10)))
 
+        # the fixed bases never move, so they are drawn as one baked mesh (built on first draw, per mode)
+        self.fixed_base = None
+        self._fixed_base_mode = None
+
         self.base_list = []
 
         self.base_list.append(Hexagon(color=(0.1, 0.1, 0.7),
-                                      origin=(origin[0], origin[1], origin[2]),
+                                      origin=(0, 0, 0),
                                       origin_offset=(0, 0.61, 0),
                                       axis=(0, 0, 0),
-                                      theta=theta+np.pi/2,
-                                      phi=0,
                                       size=(0.9, 0.10)))
 
         self.base_list.append(Hexagon(color=(0.1, 0.1, 0.7),
-                                      origin=(origin[0], origin[1], origin[2]),
+                                      origin=(0, 0, 0),
                                       origin_offset=(0, 0.8, 0),
                                       axis=(0, 0, 0),
-                                      theta=theta+np.pi/2,
-                                      phi=0,
                                       size=(1.1, 0.40)))
 
         self.stalks_list = []
@@ -183,61 +245,82 @@ class MasterPart(Part):
         y_stalk_origin = 1.3
 
         self.stalks_list.append(Hexagon(color=(0.1, 0.1, 0.7),
-                                        origin=(origin[0], origin[1]+y_stalk_origin, origin[2]),
+                                        origin=(0, 0, 0),
                                         origin_offset=(0, 0, 0),
                                         origin_axis=(0, 0, 1),
                                         axis=(0, 0, 0),
                                         size=(0.5, 0.25)))
 
         self.stalks_list.append(Trapezoid(color=(0.1, 0.1, 0.7),
-                                          origin=(origin[0], origin[1]+y_stalk_origin, origin[2]),
+                                          origin=(0, 0, 0),
                                           origin_offset=(1, 0, 0),
                                           axis=(0, 0, 0),
-                                          theta=theta,
                                           size=(1.6, 1.6, 1.7, 1.7, 0.45, 0.25)))
 
         self.stalks_list.append(HexagonStalk(color=(0.1, 0.1, 0.9),
-                                             origin=(origin[0], origin[1]+y_stalk_origin, origin[2]),
+                                             origin=(0, 0, 0),
                                              origin_offset=(0, -0.25, -0.15),
                                              axis=(0, 0, 0),
-                                             theta=theta,
                                              size=(0.1, 2)))
 
         self.stalks_list.append(HexagonStalk(color=(0.1, 0.1, 0.9),
-                                             origin=(origin[0], origin[1]+y_stalk_origin, origin[2]),
+                                             origin=(0, 0, 0),
                                              origin_offset=(0, -0.25, 0.15),
                                              axis=(0, 0, 0),
-                                             theta=theta,
                                              size=(0.1, 2)))
 
         self.stalks_list.append(HexagonStalk(color=(0.1, 0.1, 0.9),
-                                             origin=(origin[0], origin[1]+y_stalk_origin, origin[2]),
+                                             origin=(0, 0, 0),
                                              origin_offset=(0, 0.25, -0.15),
                                              axis=(0, 0, 0),
-                                             theta=theta,
                                              size=(0.1, 2)))
 
         self.stalks_list.append(HexagonStalk(color=(0.1, 0.1, 0.9),
-                                             origin=(origin[0], origin[1]+y_stalk_origin, origin[2]),
+                                             origin=(0, 0, 0),
                                              origin_offset=(0, 0.25, 0.15),
                                              axis=(0, 0, 0),
-                                             theta=theta,
                                              size=(0.1, 2)))
 
-    def draw(self, mode=None):
-
-        for solid in self.fixed_base_list:
-            solid.draw(mode)
-
-        for solid in self.base_list:
-            # solid.phi = np.pi/2
-            solid.theta = self.theta+np.pi/2
-            solid.draw(mode)
-
-        for solid in self.stalks_list:
-            solid.phi = self.phi
-            solid.theta = self.theta
-            solid.draw(mode)
+        # base and stalks are posed through their nodes instead of solid by solid
+        self.node = SceneNode(origin=origin, mode="spherical")
+        self.base_node = SceneNode(self.base_list,
+                                   parent=self.node,
+                                   theta=theta+np.pi/2,
+                                   mode="spherical")
+        self.stalks_node = SceneNode(self.stalks_list,
+                                     parent=self.node,
+                                     origin=(0, y_stalk_origin, 0),
+                                     theta=theta,
+                                     phi=self.phi,
+                                     mode="spherical")
+
+        if level_of_detail:
+            self.base_node.level_of_detail = LevelOfDetail()
+            self.stalks_node.level_of_detail = LevelOfDetail()
+
+    def _draw(self, mode=None):
+        self._pose_nodes()
+        self._baked_fixed_base(mode).draw(mode)
+        self.node.draw(mode)
+
+    def submit(self, queue, mode=None):
+        self._pose_nodes()
+        queue.submit(self._baked_fixed_base(mode), mode)
+        self.node.submit(queue, mode)
+        self._drawn_pose_version = self._pose_version
+
+    def _pose_nodes(self):
+        # children only need re-posing when the part moved since the last draw
+        if self.dirty:
+            self.base_node.theta = self.theta+np.pi/2
+            self.stalks_node.phi = self.phi
+            self.stalks_node.theta = self.theta
+
+    def _baked_fixed_base(self, mode=None):
+        if self.fixed_base is None or self._fixed_base_mode != mode:
+            self.fixed_base = bake(self.fixed_base_list, mode)
+            self._fixed_base_mode = mode
+        return self.fixed_base
 
 
 class SlavePart(Part):
@@ -248,10 +331,8 @@ class SlavePart(Part):
                  phi=None,
                  phi_degree=None,
                  length=1,
-                 noise_std_deviation=0.1):
-
-        self.noise_std_deviation = noise_std_deviation
-        self.length = length
+                 noise_std_deviation=0.1,
+                 noise_seed=None):
 
         self.solids_list = []
 
@@ -261,5 +342,6 @@ class SlavePart(Part):
                          phi=phi,
                          phi_degree=phi_degree,
                          length=length,
-                         noise_std_deviation=noise_std_deviation)
+                         noise_std_deviation=noise_std_deviation,
+                         noise_seed=noise_seed)
 
@@ -0,0 +1,162 @@
+import os
+import time
+import numpy as np
+
+MAGIC = b'PARTTRJ1'
+HEADER_DTYPE = np.dtype([('magic', 'S8'),
+                         ('part_count', '<u4'),
+                         ('header_size', '<u4'),
+                         ('frames', '<u8')])
+HEADER_SIZE = 64
+
+
+def record_dtype(part_count):
+    return np.dtype([('time', '<f8'),
+                     ('wall_time', '<f8'),
+                     ('theta', '<f8', (part_count,)),
+                     ('phi', '<f8', (part_count,)),
+                     ('origin', '<f8', (part_count, 3))])
+
+
+def read_header(path):
+    header = np.fromfile(path, HEADER_DTYPE, count=1)
+    if header.size == 0 or header['magic'][0] != MAGIC:
+        raise ValueError("%s is not a trajectory file" % path)
+    return header[0]
+
+
+class TrajectoryRecorder:
+    def __init__(self, path, part_count, chunk_frames=65536):
+        self.path = path
+        self.part_count = part_count
+        self.chunk_frames = chunk_frames
+        self.dtype = record_dtype(part_count)
+        self.frames = 0
+
+        header = np.zeros(1, HEADER_DTYPE)
+        header['magic'] = MAGIC
+        header['part_count'] = part_count
+        header['header_size'] = HEADER_SIZE
+        with open(path, 'wb') as file:
+            file.write(header.tobytes().ljust(HEADER_SIZE, b'\0'))
+
+        self._header = np.memmap(path, HEADER_DTYPE, mode='r+', shape=(1,))
+        self._records = None
+        self._capacity = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _grow(self):
+        # the file is extended a chunk at a time; a memmap cannot grow in place, so it is remapped
+        self.flush()
+        self._records = None
+        self._capacity += self.chunk_frames
+        with open(self.path, 'r+b') as file:
+            file.truncate(HEADER_SIZE + self._capacity * self.dtype.itemsize)
+        self._records = np.memmap(self.path, self.dtype, mode='r+', offset=HEADER_SIZE, shape=(self._capacity,))
+
+    def record(self, parts, time_stamp):
+        if self.frames == self._capacity:
+            self._grow()
+
+        record = self._records[self.frames]
+        record['time'] = time_stamp
+        record['wall_time'] = time.time()
+        for index, part in enumerate(parts):
+            record['theta'][index] = part.theta
+            record['phi'][index] = part.phi
+            record['origin'][index] = part.origin
+        self.frames += 1
+        # the count goes in after the record it covers; both maps share the page cache, so readers see it now
+        self._header['frames'] = self.frames
+
+    def flush(self):
+        if self._records is not None:
+            self._records.flush()
+        # flush() makes the records and the count published by record() durable on disk
+        self._header['frames'] = self.frames
+        self._header.flush()
+
+    def close(self):
+        if self._header is None:
+            return
+        self.flush()
+        self._records = None
+        self._header = None
+        with open(self.path, 'r+b') as file:
+            file.truncate(HEADER_SIZE + self.frames * self.dtype.itemsize)
+
+
+class TrajectoryReader:
+    def __init__(self, path):
+        self.path = path
+        header = read_header(path)
+        self.part_count = int(header['part_count'])
+        self.dtype = record_dtype(self.part_count)
+
+        # an unclosed recording may be longer on disk than its last published frame count
+        stored_frames = (os.path.getsize(path) - HEADER_SIZE) // self.dtype.itemsize
+        frames = min(int(header['frames']), stored_frames)
+        self.records = np.memmap(path, self.dtype, mode='r', offset=HEADER_SIZE, shape=(frames,)) \
+            if frames > 0 else np.zeros(0, self.dtype)
+
+    def __len__(self):
+        return self.records.shape[0]
+
+    def __getitem__(self, frame):
+        return self.records[frame]
+
+    @property
+    def times(self):
+        return self.records['time']
+
+    @property
+    def duration(self):
+        if len(self) == 0:
+            return 0.0
+        return float(self.times[-1] - self.times[0])
+
+    def frame_at(self, time_stamp):
+        frame = int(np.searchsorted(self.times, time_stamp, side='right')) - 1
+        return min(max(frame, 0), len(self) - 1)
+
+    def apply(self, frame, parts):
+        record = self.records[frame]
+        for index, part in enumerate(parts):
+            part.theta = float(record['theta'][index])
+            part.phi = float(record['phi'][index])
+            part.origin = np.array(record['origin'][index])
+
+
+class TrajectoryPlayer:
+    def __init__(self, reader, speed=1.0, loop=False):
+        self.reader = reader
+        self.speed = speed
+        self.loop = loop
+        self.frame = None
+        self.time = 0.0
+        self._start_time = reader.times[0] if len(reader) > 0 else 0.0
+
+    @property
+    def finished(self):
+        return not self.loop and self.time >= self.reader.duration
+
+    def seek(self, frame):
+        self.time = float(self.reader.times[frame] - self._start_time)
+        self.frame = None
+
+    def advance(self, elapsed, parts):
+        if len(self.reader) == 0:
+            return
+        self.time += elapsed * self.speed
+        if self.loop and self.reader.duration > 0:
+            self.time %= self.reader.duration
+
+        frame = self.reader.frame_at(self._start_time + self.time)
+        if frame != self.frame:
+            self.reader.apply(frame, parts)
+            self.frame = frame
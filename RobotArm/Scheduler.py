@@ -0,0 +1,111 @@
+import time
+from collections import deque
+import numpy as np
+
+
+class FrameStatistics:
+    def __init__(self, window=1000):
+        self.frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.dropped_ticks = 0
+
+    def add(self, frame_time, missed=False):
+        self.frame_times.append(frame_time)
+        self.frames += 1
+        if missed:
+            self.missed_deadlines += 1
+
+    def percentile(self, q):
+        if not self.frame_times:
+            return 0.0
+        return float(np.percentile(np.fromiter(self.frame_times, np.dtype('float64')), q))
+
+    @property
+    def mean(self):
+        if not self.frame_times:
+            return 0.0
+        return float(np.mean(np.fromiter(self.frame_times, np.dtype('float64'))))
+
+    @property
+    def p95(self):
+        return self.percentile(95)
+
+    @property
+    def p99(self):
+        return self.percentile(99)
+
+    def summary(self):
+        return {'frames': self.frames,
+                'mean_ms': 1000 * self.mean,
+                'p95_ms': 1000 * self.p95,
+                'p99_ms': 1000 * self.p99,
+                'missed_deadlines': self.missed_deadlines,
+                'dropped_ticks': self.dropped_ticks}
+
+
+class FixedTimestepScheduler:
+    def __init__(self,
+                 tick_rate=30,
+                 frame_rate=None,
+                 max_ticks_per_frame=5,
+                 realtime=True,
+                 clock=time.perf_counter,
+                 sleep=time.sleep):
+
+        self.tick_interval = 1 / tick_rate
+        self.frame_interval = 1 / (frame_rate if frame_rate is not None else tick_rate)
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.realtime = realtime
+        self.clock = clock
+        self.sleep = sleep
+        self.statistics = FrameStatistics()
+
+        self._accumulator = 0.0
+        self._last_tick_time = None
+        self._frame_start = None
+        self._deadline = None
+
+    def ticks(self):
+        if not self.realtime:
+            return 1
+
+        now = self.clock()
+        if self._last_tick_time is None:
+            self._last_tick_time = now
+            return 1
+
+        self._accumulator += now - self._last_tick_time
+        self._last_tick_time = now
+
+        ticks = int(self._accumulator // self.tick_interval)
+        self._accumulator -= ticks * self.tick_interval
+        if ticks > self.max_ticks_per_frame:
+            # too far behind to catch up: drop the backlog instead of spiralling
+            self.statistics.dropped_ticks += ticks - self.max_ticks_per_frame
+            ticks = self.max_ticks_per_frame
+        return ticks
+
+    def begin_frame(self):
+        now = self.clock()
+        self._frame_start = now
+        if self._deadline is None:
+            self._deadline = now + self.frame_interval
+
+    def end_frame(self):
+        # the frame is recorded here, sleep included, so the last frame of a run is counted too
+        missed = False
+        if self.realtime:
+            now = self.clock()
+            remaining = self._deadline - now
+            if remaining > 0:
+                self.sleep(remaining)
+                self._deadline += self.frame_interval
+            else:
+                # the frame overran its slot: count it and re-anchor the schedule on now
+                missed = True
+                self._deadline = now + self.frame_interval
+
+        if self._frame_start is not None:
+            self.statistics.add(self.clock() - self._frame_start, missed)
+            self._frame_start = None
@@ -1,29 +1,58 @@
 import pygame
 from pygame.locals import *
 import numpy as np
+from solids.Backends import create_context
+from solids import Tracing
 from RobotArm.Parts import MasterPart, SlavePart
+from RobotArm.Scheduler import FixedTimestepScheduler
+from RobotArm.Recorder import TrajectoryRecorder, TrajectoryReader, TrajectoryPlayer
+from RobotArm.Capture import FrameCapture
+from RobotArm.CommandServer import CommandServer
 from solids.Solids import *
 import time
 import threading
 import os
 import sys
 import cv2
-from OpenGL.GL import *
-from OpenGL.GLU import *
 
 
 class PgScreen:
     def __init__(self,
                  screen_size=(900, 300),
                  clock_rate=30,
-                 pixel_meter=100):
+                 frame_rate=None,
+                 pixel_meter=100,
+                 backend=None,
+                 trace_path=None,
+                 trace_capacity=100000,
+                 record_path=None,
+                 replay_path=None,
+                 replay_speed=1.0,
+                 capture_path=None,
+                 capture_queue_size=8,
+                 capture_drop_policy=None,
+                 capture_pixel_buffers=2,
+                 command_port=None,
+                 command_path=None):
 
         self.screen_size = screen_size
         self.clock_rate = clock_rate
+        self.frame_rate = frame_rate if frame_rate is not None else clock_rate
         self.pixel_meter = pixel_meter
 
-        pygame.init()
-        self.screen = pygame.display.set_mode(screen_size, DOUBLEBUF | OPENGL)
+        # joint and origin speeds per second, 5 degrees and 0.1 per tick at the default 30 Hz
+        self.angular_speed_degree = 150
+        self.linear_speed = 3
+
+        self.trace_path = trace_path if trace_path is not None else os.environ.get('SOLIDS_TRACE')
+        if self.trace_path:
+            Tracing.enable_tracing(capacity=trace_capacity)
+
+        self.context = create_context(screen_size, backend)
+        self.headless = self.context.headless
+        # GL is only imported once create_context has chosen the platform for the backend
+        from OpenGL.GL import glMatrixMode, glEnable, GL_MODELVIEW, GL_DEPTH_TEST
+        from OpenGL.GLU import gluPerspective
         gluPerspective(50, (screen_size[0] / screen_size[1]), 0.1, 50.0)
         glMatrixMode(GL_MODELVIEW)
         glEnable(GL_DEPTH_TEST)
@@ -31,6 +60,12 @@ class PgScreen:
         self.main_state = 'run_state'
         self.close_app = False
         self.clock = pygame.time.Clock()
+        self.pressed = None
+        self.redraw = True
+        self.drawn_state = None
+        self.scheduler = FixedTimestepScheduler(tick_rate=self.clock_rate,
+                                                frame_rate=self.frame_rate,
+                                                realtime=not self.headless)
 
         # --------------------------------------------------------------------------------------------------------------
         self.part_list = []
@@ -40,11 +75,44 @@ class PgScreen:
                                          phi=0,
                                          length=1))
 
+        self.simulation_time = 0.0
+        self.recorder = None
+        if record_path is not None:
+            self.recorder = TrajectoryRecorder(record_path, len(self.part_list))
+
+        self.player = None
+        if replay_path is not None:
+            self.player = TrajectoryPlayer(TrajectoryReader(replay_path), speed=replay_speed)
+
+        self.capture = None
+        if capture_path is not None:
+            # without a frame-rate limit the loop outruns the encoder, so headless runs wait for it
+            if capture_drop_policy is None:
+                capture_drop_policy = "oldest" if self.scheduler.realtime else "block"
+            self.capture = FrameCapture(capture_path,
+                                        screen_size,
+                                        fps=self.frame_rate,
+                                        queue_size=capture_queue_size,
+                                        drop_policy=capture_drop_policy,
+                                        pixel_buffers=capture_pixel_buffers)
+
+        # parts are addressed as part0, part1, ... in part_list order
+        self.command_server = None
+        if command_port is not None or command_path is not None:
+            self.command_server = CommandServer({'part%d' % index: part for index, part in enumerate(self.part_list)},
+                                                port=command_port if command_port is not None else 0,
+                                                path=command_path).start()
+
     def check_key_events(self):
+        if self.headless:
+            return
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 cv2.destroyAllWindows()
                 self.close_app = True
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.VIDEORESIZE):
+                self.redraw = True
 
         if self.main_state == 'start_state':
             pressed = pygame.key.get_pressed()
@@ -52,43 +120,108 @@ class PgScreen:
                 self.main_state = 'run_state'
 
         elif self.main_state == 'run_state':
-            pressed = pygame.key.get_pressed()
-
-            if pressed[pygame.K_UP]:
-                self.part_list[0].phi_degree += 5
-            elif pressed[pygame.K_DOWN]:
-                self.part_list[0].phi_degree -= 5
-
-            if pressed[pygame.K_LEFT]:
-                self.part_list[0].theta_degree += 5
-            elif pressed[pygame.K_RIGHT]:
-                self.part_list[0].theta_degree -= 5
-
-            if pressed[pygame.K_w]:
-                self.part_list[0].origin += np.array([0.1, 0, 0])
-            if pressed[pygame.K_s]:
-                self.part_list[0].origin -= np.array([0.1, 0, 0])
-            if pressed[pygame.K_d]:
-                self.part_list[0].origin += np.array([0, 0, 0.1])
-            if pressed[pygame.K_a]:
-                self.part_list[0].origin -= np.array([0, 0, 0.1])
+            self.pressed = pygame.key.get_pressed()
 
         elif self.main_state == 'restart_state':
             os.execl(sys.executable, sys.executable, *sys.argv)
 
-    def main_loop(self):
-        while not self.close_app:
-            self.check_key_events()
-            if self.main_state == 'run_state':
-                pass
+    def simulation_step(self, dt):
+        if self.main_state != 'run_state' or self.pressed is None:
+            return
+
+        pressed = self.pressed
+        angle_step = self.angular_speed_degree * dt
+        linear_step = self.linear_speed * dt
+
+        if pressed[pygame.K_UP]:
+            self.part_list[0].phi_degree += angle_step
+        elif pressed[pygame.K_DOWN]:
+            self.part_list[0].phi_degree -= angle_step
+
+        if pressed[pygame.K_LEFT]:
+            self.part_list[0].theta_degree += angle_step
+        elif pressed[pygame.K_RIGHT]:
+            self.part_list[0].theta_degree -= angle_step
+
+        if pressed[pygame.K_w]:
+            self.part_list[0].origin += np.array([linear_step, 0, 0])
+        if pressed[pygame.K_s]:
+            self.part_list[0].origin -= np.array([linear_step, 0, 0])
+        if pressed[pygame.K_d]:
+            self.part_list[0].origin += np.array([0, 0, linear_step])
+        if pressed[pygame.K_a]:
+            self.part_list[0].origin -= np.array([0, 0, linear_step])
 
-            self.screen_update()
-            time.sleep(1 / self.clock_rate)
+    def main_loop(self, frames=None):
+        frame = 0
+        try:
+            while not self.close_app and (frames is None or frame < frames):
+                with Tracing.span("frame", frame=frame):
+                    self.scheduler.begin_frame()
+                    with Tracing.span("check_key_events", "input"):
+                        self.check_key_events()
 
-        pygame.quit()
-        quit()
+                    with Tracing.span("simulation", "update"):
+                        ticks = self.scheduler.ticks()
+                        if self.player is not None:
+                            self.player.advance(ticks * self.scheduler.tick_interval, self.part_list)
+                        else:
+                            for _ in range(ticks):
+                                self.simulation_step(self.scheduler.tick_interval)
+                        if self.command_server is not None:
+                            self.command_server.apply()
+                        self.simulation_time += ticks * self.scheduler.tick_interval
+
+                    if self.recorder is not None:
+                        with Tracing.span("record", "update"):
+                            self.recorder.record(self.part_list, self.simulation_time)
+
+                    with Tracing.span("screen_update", "render"):
+                        self.screen_update()
+                    if self.command_server is not None:
+                        self.command_server.frame_presented(frame)
+                    frame += 1
+
+                    with Tracing.span("sleep", "idle"):
+                        self.scheduler.end_frame()
+        finally:
+            # a writer or network error raised mid-loop still closes the files, threads and context
+            self.shutdown()
+
+        if not self.headless:
+            quit()
+
+    def shutdown(self):
+        closes = []
+        if self.trace_path and Tracing.tracer is not None:
+            closes.append(lambda: Tracing.tracer.export(self.trace_path))
+            closes.append(Tracing.disable_tracing)
+        for resource in (self.recorder, self.capture, self.command_server, self.context):
+            if resource is not None:
+                closes.append(resource.close)
+
+        error = None
+        for close in closes:
+            try:
+                close()
+            except Exception as exception:
+                error = error if error is not None else exception
+        if error is not None:
+            raise error
+
+    def needs_redraw(self):
+        return self.redraw or self.drawn_state != self.main_state or any(part.dirty for part in self.part_list)
 
     def screen_update(self):
+        # an idle scene keeps the last presented frame instead of re-rendering it
+        if not self.needs_redraw():
+            if self.capture is not None:
+                self.capture.repeat()
+            return
+        from OpenGL.GL import glClear, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT
+        self.redraw = False
+        self.drawn_state = self.main_state
+
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
         if self.main_state == 'start_state':
             pass
@@ -97,9 +230,28 @@ class PgScreen:
             for part in self.part_list:
                 part.draw(mode="spherical")
 
-        pygame.display.flip()
+        if self.capture is not None:
+            # read before presenting: the back buffer is undefined after a swap
+            with Tracing.span("capture", "render"):
+                self.capture.capture()
+
+        with Tracing.span("display.flip", "render"):
+            self.context.finish_frame()
+
+    def frame_statistics(self):
+        return self.scheduler.statistics.summary()
+
+    def command_statistics(self):
+        return self.command_server.statistics.summary() if self.command_server is not None else None
+
+    def capture_statistics(self):
+        return self.capture.statistics.summary() if self.capture is not None else None
+
+    def read_pixels(self):
+        return self.context.read_pixels()
 
 
 # ======================================================================================================================
-PgScreen(screen_size=(600, 500)).main_loop()
+if __name__ == '__main__':
+    PgScreen(screen_size=(600, 500)).main_loop()
 
@@ -0,0 +1,144 @@
+import numpy as np
+from solids.Solids import *
+from solids.orbit_cubes_moves_example import Orbit
+from solids.tank_composition_example import Tank
+from RobotArm.Parts import MasterPart
+
+ORBIT_AXES = ((0, 1, 1), (1, 1, 0), (1, 0, 1),
+              (0, -1, -1), (-1, -1, 0), (-1, 0, -1),
+              (0, -1, 1), (-1, 1, 0), (-1, 0, 1))
+
+
+def replica_offsets(multiplier, spacing=3.0):
+    # replicas are laid out on a square grid in the z = 0 plane around the original scene
+    side = int(np.ceil(np.sqrt(multiplier)))
+    index = np.arange(multiplier)
+    offsets = np.zeros((multiplier, 3))
+    offsets[:, 0] = (index % side - (side - 1) / 2) * spacing
+    offsets[:, 1] = (index // side - (side - 1) / 2) * spacing
+    return offsets
+
+
+class Scene:
+    name = None
+    mode = None
+    queue = None
+
+    def __init__(self, multiplier=1, render_mode=None):
+        self.multiplier = multiplier
+        self.render_mode = render_mode
+        self.frame = 0
+        self.build()
+        self.root = SolidsGroup(self.items, render_mode=render_mode)
+
+    def build(self):
+        self.items = []
+
+    def update(self):
+        self.frame += 1
+
+    def draw(self):
+        if self.queue is None:
+            self.root.draw(self.mode)
+        else:
+            self.queue.submit(self.root, self.mode)
+            self.queue.flush()
+
+
+class ShowSolidsScene(Scene):
+    name = "show_solids"
+
+    def build(self):
+        self.items = []
+        self.origins = []
+        for offset in replica_offsets(self.multiplier):
+            self.items += [Cube(color=(0, 1, 0)),
+                           Parallelepiped(color=(4, 5.5, 1), theta=np.pi/4),
+                           Parallelepiped(color=(4, 5.5, 1), alpha=np.pi/5, size=(0.1, 0.5, 0.4)),
+                           Pyramid(color=(1, 0, 0)),
+                           PyramidTrunk(color=(0.3, 0.5, 1), theta=np.pi/2),
+                           Hexagon(color=(0, 0.1, 0.7))]
+            self.origins += [np.array(origin) + offset for origin in ((1, 0, -5), (1, 1, -5), (-1, 1, -5),
+                                                                      (0, 0, -5), (-1, 0, -5), (-1, -1, -5))]
+        self.axes = ((1, 1, 0), (1, 1, 0), (1, 0.3, 0), (1, 1, 0), (1, 1, 1), (0, 0.3, 1))
+        self.steps = (-1, 1, -1, 1, -1.8, -1.8)
+
+    def update(self):
+        super().update()
+        for i, solid in enumerate(self.items):
+            solid.origin = self.origins[i]
+            solid.axis = self.axes[i % 6]
+            solid.theta_degree += self.steps[i % 6]
+
+
+class TankScene(Scene):
+    name = "tank"
+
+    def build(self):
+        self.items = [Tank(origin=(-2 + offset[0], offset[1], -5 + offset[2]), axis=(1, -1, 0))
+                      for offset in replica_offsets(self.multiplier)]
+
+    def update(self):
+        super().update()
+        step = np.asarray([0.1, 0.0, 0.0]) if self.frame % 80 < 40 else np.asarray([-0.1, 0.0, 0.0])
+        for tank in self.items:
+            tank.theta += np.pi/20
+            tank.origin += step
+
+
+class OrbitScene(Scene):
+    name = "orbit"
+
+    def build(self):
+        self.items = [Orbit(origin=(offset[0], offset[1], -5 + offset[2]),
+                            origin_offset=(1, 0, 0),
+                            axis=axis,
+                            theta=np.pi/2)
+                      for offset in replica_offsets(self.multiplier)
+                      for axis in ORBIT_AXES]
+
+    def update(self):
+        super().update()
+        for i, orbit in enumerate(self.items):
+            orbit.theta += np.pi/(20 + i % len(ORBIT_AXES))
+
+
+class RobotArmScene(Scene):
+    name = "robot_arm"
+    mode = "spherical"
+
+    def __init__(self, multiplier=1, render_mode=None):
+        self.multiplier = multiplier
+        self.render_mode = render_mode
+        self.frame = 0
+        self.build()
+
+        # MasterPart draws its solids under its scene nodes one by one, so they cannot be batched
+        if render_mode == "instanced":
+            render_mode = "buffered"
+        if render_mode is not None:
+            for part in self.items:
+                for solid in part.fixed_base_list + part.base_list + part.stalks_list:
+                    solid.render_mode = render_mode
+
+    def build(self):
+        self.items = [MasterPart(origin=(offset[0], offset[1] - 2, -5 + offset[2]), theta=0, phi=0, length=1)
+                      for offset in replica_offsets(self.multiplier)]
+
+    def draw(self):
+        if self.queue is None:
+            for part in self.items:
+                part.draw(self.mode)
+        else:
+            for part in self.items:
+                part.submit(self.queue, self.mode)
+            self.queue.flush()
+
+    def update(self):
+        super().update()
+        for part in self.items:
+            part.theta_degree += 5
+            part.phi_degree += 5 if self.frame % 36 < 18 else -5
+
+
+SCENES = {scene.name: scene for scene in (ShowSolidsScene, TankScene, OrbitScene, RobotArmScene)}
@@ -0,0 +1,138 @@
+import argparse
+import json
+import sys
+import time
+
+SCREEN_SIZE = (800, 600)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Frame-rate benchmarks over the bundled scenes")
+    parser.add_argument('--scenes', nargs='+', default=['show_solids', 'tank', 'orbit', 'robot_arm'])
+    parser.add_argument('--multipliers', nargs='+', type=int, default=[1, 10])
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--backend', default='mock', choices=['mock', 'egl', 'osmesa'],
+                        help="'mock' counts GL calls without a GL context, the others render offscreen")
+    parser.add_argument('--render-mode', default=None, choices=['immediate', 'buffered', 'instanced'])
+    parser.add_argument('--culling', action='store_true', help="cull scene groups against the camera frustum")
+    parser.add_argument('--render-queue', action='store_true',
+                        help="draw through a RenderQueue sorted by primitive and color")
+    parser.add_argument('--output', default=None, help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def setup_projection():
+    from OpenGL.GL import glMatrixMode, glLoadIdentity, glEnable, GL_PROJECTION, GL_MODELVIEW, GL_DEPTH_TEST
+    from OpenGL.GLU import gluPerspective
+
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    gluPerspective(50, (SCREEN_SIZE[0] / SCREEN_SIZE[1]), 0.1, 50.0)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+    glEnable(GL_DEPTH_TEST)
+
+
+def clear():
+    from OpenGL.GL import glClear, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+
+def run_scene(scene_class, multiplier, frames, warmup, render_mode, context, counter, culling=False,
+              render_queue=False):
+    start = time.perf_counter()
+    scene = scene_class(multiplier, render_mode=render_mode)
+    construction_time = time.perf_counter() - start
+
+    root = getattr(scene, 'root', None)
+    if culling and root is not None:
+        from solids.Culling import Frustum
+        root.culling = True
+        # the mock backend has no GL matrices to read back
+        root.culler.frustum = Frustum.perspective(50, (SCREEN_SIZE[0] / SCREEN_SIZE[1]), 0.1, 50.0)
+
+    if render_queue:
+        from solids.RenderQueue import RenderQueue
+        scene.queue = RenderQueue()
+
+    # install after construction so scene modules imported on the way are patched too
+    counter.install()
+    try:
+        for _ in range(warmup):
+            scene.update()
+            scene.draw()
+
+        counter.reset()
+        draw_cpu_time = 0.0
+        update_time = 0.0
+        start = time.perf_counter()
+        for _ in range(frames):
+            update_start = time.perf_counter()
+            scene.update()
+            update_time += time.perf_counter() - update_start
+
+            if context is not None:
+                clear()
+            draw_start = time.process_time()
+            scene.draw()
+            draw_cpu_time += time.process_time() - draw_start
+
+            if context is not None:
+                context.finish_frame()
+        elapsed = time.perf_counter() - start
+    finally:
+        counter.uninstall()
+
+    return {'scene': scene_class.name,
+            'multiplier': multiplier,
+            'render_mode': render_mode or 'immediate',
+            'culling': culling and root is not None,
+            'render_queue': render_queue,
+            'frames': frames,
+            'frames_per_second': frames / elapsed,
+            'frame_time_ms': 1000 * elapsed / frames,
+            'draw_cpu_time_ms': 1000 * draw_cpu_time / frames,
+            'update_time_ms': 1000 * update_time / frames,
+            'construction_time_ms': 1000 * construction_time,
+            'gl_calls_per_frame': counter.total / frames,
+            'gl_calls_by_function': {name: count / frames for name, count in counter.calls.most_common()}}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from solids.Backends import configure_platform, create_context
+    context = None
+    if args.backend != 'mock':
+        configure_platform(args.backend)
+        context = create_context(SCREEN_SIZE, args.backend)
+        setup_projection()
+
+    from solids.GLCounter import GLCallCounter
+    from benchmarks.Scenes import SCENES
+
+    results = []
+    for scene_name in args.scenes:
+        for multiplier in args.multipliers:
+            counter = GLCallCounter(passthrough=context is not None)
+            results.append(run_scene(SCENES[scene_name], multiplier, args.frames, args.warmup,
+                                     args.render_mode, context, counter, args.culling, args.render_queue))
+
+    if context is not None:
+        context.close()
+
+    report = {'backend': args.backend,
+              'screen_size': SCREEN_SIZE,
+              'results': results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import json
+import sys
+import time
+import numpy as np
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Inverse-kinematics throughput on one core")
+    parser.add_argument('--targets', nargs='+', type=int, default=[1000, 10000])
+    parser.add_argument('--lengths', nargs='+', type=float, default=[1.5, 1.0, 0.7],
+                        help="one SlavePart per length")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--cumulative', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def run_solver(chain, targets, repeats, cumulative, random):
+    from RobotArm.Kinematics import IKSolver
+
+    # reachable targets: end points of random configurations, solved again after a small drift
+    goals = chain.end_effector(random.uniform(0, 2*np.pi, (targets, chain.joint_count)), cumulative)
+    solver = IKSolver(chain, cumulative=cumulative)
+
+    start = time.perf_counter()
+    cold = solver.solve(goals)
+    cold_time = time.perf_counter() - start
+
+    warm_time = 0.0
+    for _ in range(repeats):
+        goals = goals + random.normal(0, 0.01, goals.shape)
+        start = time.perf_counter()
+        warm = solver.solve(goals)
+        warm_time += time.perf_counter() - start
+
+    return {'targets': targets,
+            'cold_targets_per_second': targets / cold_time,
+            'warm_targets_per_second': targets * repeats / warm_time,
+            'cold': cold.summary(),
+            'warm': warm.summary()}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from RobotArm.Parts import SlavePart
+    from RobotArm.Kinematics import Chain
+
+    random = np.random.default_rng(args.seed)
+    chain = Chain([SlavePart(origin=(0, 0, 0), length=length, theta=0, phi=0) for length in args.lengths])
+
+    report = {'lengths': args.lengths,
+              'cumulative': args.cumulative,
+              'results': [run_solver(chain, targets, args.repeats, args.cumulative, random)
+                          for targets in args.targets]}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
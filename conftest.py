@@ -0,0 +1 @@
+# puts the repository root on sys.path so tests import solids and RobotArm as the examples do
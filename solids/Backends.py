@@ -0,0 +1,184 @@
+import os
+import sys
+import ctypes
+import numpy as np
+
+BACKENDS = ("pygame", "egl", "osmesa")
+HEADLESS_BACKENDS = ("egl", "osmesa")
+
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+
+def selected_backend(backend=None):
+    if backend is None:
+        backend = os.environ.get('SOLIDS_BACKEND', 'pygame')
+    backend = backend.lower()
+    if backend not in BACKENDS:
+        raise ValueError("backend must be one of %s, got %r" % (BACKENDS, backend))
+    return backend
+
+
+def configure_platform(backend=None):
+    # PyOpenGL binds its platform on the first "import OpenGL.GL", so headless
+    # backends have to be selected before any module that draws is imported
+    backend = selected_backend(backend)
+    if backend in HEADLESS_BACKENDS:
+        if 'OpenGL.GL' not in sys.modules:
+            os.environ.setdefault('PYOPENGL_PLATFORM', backend)
+        elif os.environ.get('PYOPENGL_PLATFORM') != backend:
+            raise RuntimeError("OpenGL was already imported for another platform; set SOLIDS_BACKEND=%s "
+                               "(or PYOPENGL_PLATFORM=%s) before importing solids" % (backend, backend))
+    return backend
+
+
+def create_context(screen_size=(800, 600), backend=None, caption=None):
+    backend = configure_platform(backend)
+    if backend == "egl":
+        return EGLContext(screen_size)
+    if backend == "osmesa":
+        return OSMesaContext(screen_size)
+    return PygameContext(screen_size, caption=caption)
+
+
+class GLContext:
+    headless = True
+
+    def __init__(self, screen_size):
+        self.screen_size = tuple(screen_size)
+
+    def quit_requested(self):
+        return False
+
+    def finish_frame(self):
+        from OpenGL.GL import glFinish
+        glFinish()
+
+    def read_pixels(self):
+        from OpenGL.GL import glReadPixels, glPixelStorei, GL_PACK_ALIGNMENT, GL_RGB, GL_UNSIGNED_BYTE
+        width, height = self.screen_size
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        pixels = glReadPixels(0, 0, width, height, GL_RGB, GL_UNSIGNED_BYTE)
+        return np.frombuffer(pixels, np.dtype('uint8')).reshape(height, width, 3)[::-1]
+
+    def close(self):
+        pass
+
+
+class PygameContext(GLContext):
+    headless = False
+
+    def __init__(self, screen_size, caption=None):
+        import pygame
+        from pygame.locals import DOUBLEBUF, OPENGL
+
+        super().__init__(screen_size)
+        pygame.init()
+        if caption is not None:
+            pygame.display.set_caption(caption)
+        self.screen = pygame.display.set_mode(self.screen_size, DOUBLEBUF | OPENGL)
+
+    def quit_requested(self):
+        import pygame
+        return any(event.type == pygame.QUIT for event in pygame.event.get(pygame.QUIT))
+
+    def finish_frame(self):
+        import pygame
+        pygame.display.flip()
+
+    def close(self):
+        import pygame
+        pygame.quit()
+
+
+class FramebufferContext(GLContext):
+    def _create_framebuffer(self):
+        from OpenGL.GL import (glGenFramebuffers, glBindFramebuffer, glGenRenderbuffers, glBindRenderbuffer,
+                               glRenderbufferStorage, glFramebufferRenderbuffer, glCheckFramebufferStatus,
+                               glViewport, GL_FRAMEBUFFER, GL_RENDERBUFFER, GL_RGBA8, GL_DEPTH_COMPONENT24,
+                               GL_COLOR_ATTACHMENT0, GL_DEPTH_ATTACHMENT, GL_FRAMEBUFFER_COMPLETE)
+        width, height = self.screen_size
+
+        self.framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+
+        self.color_buffer = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color_buffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color_buffer)
+
+        self.depth_buffer = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth_buffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth_buffer)
+
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("incomplete offscreen framebuffer")
+        glViewport(0, 0, width, height)
+
+
+class EGLContext(FramebufferContext):
+    def __init__(self, screen_size):
+        from OpenGL import EGL
+
+        super().__init__(screen_size)
+        self.display = self._initialize_display()
+
+        config_attributes = (EGL.EGLint * 5)(EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                                             EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+                                             EGL.EGL_NONE)
+        config = EGL.EGLConfig()
+        config_count = EGL.EGLint()
+        EGL.eglChooseConfig(self.display, config_attributes, ctypes.pointer(config), 1,
+                            ctypes.pointer(config_count))
+        if config_count.value == 0:
+            raise RuntimeError("no EGL config with desktop OpenGL support")
+
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, None)
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, self.context)
+        self._create_framebuffer()
+
+    @staticmethod
+    def _initialize_display():
+        from OpenGL import EGL
+        from OpenGL.EGL.EXT.platform_base import eglGetPlatformDisplayEXT
+
+        displays = (lambda: eglGetPlatformDisplayEXT(EGL_PLATFORM_SURFACELESS_MESA, EGL.EGL_DEFAULT_DISPLAY, None),
+                    lambda: EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY))
+        for get_display in displays:
+            try:
+                display = get_display()
+                if EGL.eglInitialize(display, None, None):
+                    return display
+            except Exception:
+                continue
+        raise RuntimeError("could not initialize an EGL display")
+
+    def close(self):
+        from OpenGL import EGL
+        EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        EGL.eglDestroyContext(self.display, self.context)
+        EGL.eglTerminate(self.display)
+
+
+class OSMesaContext(FramebufferContext):
+    def __init__(self, screen_size):
+        from OpenGL import osmesa, arrays
+        from OpenGL.GL import GL_UNSIGNED_BYTE
+
+        super().__init__(screen_size)
+        width, height = self.screen_size
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        if not self.context:
+            raise RuntimeError("could not create an OSMesa context")
+        self.buffer = arrays.GLubyteArray.zeros((height, width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL_UNSIGNED_BYTE, width, height):
+            raise RuntimeError("could not make the OSMesa context current")
+        self._create_framebuffer()
+
+    def close(self):
+        from OpenGL import osmesa
+        osmesa.OSMesaDestroyContext(self.context)
+
+
+configure_platform()
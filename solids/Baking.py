@@ -0,0 +1,97 @@
+import numpy as np
+from solids.Geometry import Mesh
+from solids.Solids import Solids, SolidsGroup
+from solids.Transforms import solids_model_matrices, transform_points
+
+
+def static_solids(solids):
+    if isinstance(solids, SolidsGroup):
+        return solids.leaf_solids()
+
+    leaves = []
+    for solid in solids:
+        if isinstance(solid, SolidsGroup):
+            leaves.extend(solid.leaf_solids())
+        else:
+            leaves.append(solid)
+    return leaves
+
+
+def merge_solids(solids_list, mode=None, matrix=None):
+    for solid in solids_list:
+        if solid.mesh is None or solid.mesh.edges is None:
+            raise ValueError("only solids with a mesh can be baked, got %s" % type(solid).__name__)
+
+    matrices = solids_model_matrices(solids_list, mode)
+    if matrix is not None:
+        # vertices end up relative to the baked mesh's own transform
+        matrices = np.matmul(np.linalg.inv(matrix), matrices)
+
+    # quads and triangles cannot share one glDrawElements call, so mixed meshes are baked as triangles
+    triangles = any(solid.mesh.surfaces is not None and solid.mesh.surfaces.shape[1] == 3
+                    for solid in solids_list)
+
+    vertices = []
+    colors = []
+    edges = []
+    surfaces = []
+    vertex_count = 0
+    for solid, solid_matrix in zip(solids_list, matrices):
+        mesh = solid.mesh
+        vertices.append(transform_points(solid_matrix, mesh.vertices))
+        colors.append(np.tile(np.asarray(solid.color + solid.color_offset, np.dtype('float32')),
+                              (mesh.vertices.shape[0], 1)))
+        edges.append(mesh.edges + vertex_count)
+        if mesh.surfaces is not None:
+            solid_surfaces = mesh.surfaces
+            if triangles and solid_surfaces.shape[1] == 4:
+                solid_surfaces = np.vstack((solid_surfaces[:, [0, 1, 2]], solid_surfaces[:, [0, 2, 3]]))
+            surfaces.append(solid_surfaces + vertex_count)
+        vertex_count += mesh.vertices.shape[0]
+
+    return Mesh(vertices=np.vstack(vertices),
+                edges=np.vstack(edges),
+                surfaces=np.vstack(surfaces) if surfaces else None,
+                colors=np.vstack(colors))
+
+
+class BakedMesh(Solids):
+    def __init__(self,
+                 solids,
+                 mode=None,
+                 origin=(0, 0, 0),
+                 axis=(0, 1, 0),
+                 theta=None,
+                 theta_degree=None,
+                 phi=None,
+                 phi_degree=None,
+                 render_mode="buffered"):
+
+        super().__init__(origin=origin,
+                         axis=axis,
+                         axis_offset=(0, 0, 0),
+                         theta=theta,
+                         theta_degree=theta_degree,
+                         phi=phi,
+                         phi_degree=phi_degree,
+                         render_mode=render_mode)
+
+        self.baked_solids = static_solids(solids)
+        self.mode = mode
+        self.set_mesh(merge_solids(self.baked_solids, mode, self.model_matrix(mode)))
+
+    def _draw_buffered(self):
+        self.mesh.buffer.draw()
+
+    def _draw_surfaces(self):
+        from OpenGL.GL import glBegin, glColor3fv, glVertex3fv, glEnd, GL_QUADS, GL_TRIANGLES
+        glBegin(GL_QUADS if self.surface.shape[1] == 4 else GL_TRIANGLES)
+        for surface in self.surface:
+            for vertex in surface:
+                glColor3fv(self.mesh.colors[vertex])
+                glVertex3fv(self.origin_vertices[vertex])
+        glEnd()
+
+
+def bake(solids, mode=None, **transform):
+    return BakedMesh(solids, mode, **transform)
@@ -0,0 +1,269 @@
+import weakref
+import numpy as np
+
+# names of buffers whose MeshBuffer was garbage collected. GL objects can only be deleted
+# with the context current, which a collection anywhere cannot promise, so they wait here
+# for the next upload or draw
+_released_buffers = []
+
+
+def delete_released_buffers():
+    if _released_buffers:
+        from OpenGL.GL import glDeleteBuffers
+        names = _released_buffers[:]
+        del _released_buffers[:len(names)]
+        glDeleteBuffers(len(names), names)
+
+
+class MeshBuffer:
+    def __init__(self,
+                 vertices,
+                 edges=None,
+                 surfaces=None,
+                 colors=None):
+
+        from OpenGL.GL import GL_QUADS, GL_TRIANGLES
+        self.vertices = np.ascontiguousarray(vertices, np.dtype('float32'))
+        self.colors = None
+        if colors is not None:
+            self.colors = np.ascontiguousarray(colors, np.dtype('float32'))
+        self.edges = None
+        self.surfaces = None
+        self.surface_primitive = GL_QUADS
+
+        if edges is not None and np.size(edges):
+            self.edges = np.ascontiguousarray(np.ravel(edges), np.dtype('uint32'))
+
+        if surfaces is not None:
+            surfaces = np.asarray(surfaces, np.dtype('uint32'))
+            if surfaces.shape[1] == 3:
+                self.surface_primitive = GL_TRIANGLES
+            self.surfaces = np.ascontiguousarray(surfaces.ravel())
+
+        self.vertex_buffer = None
+        self.color_buffer = None
+        self.edge_buffer = None
+        self.surface_buffer = None
+        self._finalizer = None
+
+    @property
+    def uploaded(self):
+        return self.vertex_buffer is not None
+
+    def upload(self):
+        from OpenGL.GL import glGenBuffers, glBindBuffer, glBufferData, GL_ARRAY_BUFFER, GL_STATIC_DRAW
+        delete_released_buffers()
+        self.vertex_buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
+
+        if self.colors is not None:
+            self.color_buffer = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+            glBufferData(GL_ARRAY_BUFFER, self.colors.nbytes, self.colors, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        if self.edges is not None:
+            self.edge_buffer = self._upload_indices(self.edges)
+
+        if self.surfaces is not None:
+            self.surface_buffer = self._upload_indices(self.surfaces)
+
+        # a buffer is owned by whatever holds its mesh; once the last holder is gone its names are released
+        names = [int(buffer) for buffer in self._buffers() if buffer is not None]
+        self._finalizer = weakref.finalize(self, _released_buffers.extend, names)
+
+    def _buffers(self):
+        return self.vertex_buffer, self.color_buffer, self.edge_buffer, self.surface_buffer
+
+    def update_vertices(self, vertices):
+        from OpenGL.GL import glBindBuffer, glBufferSubData, GL_ARRAY_BUFFER
+        self.vertices = np.ascontiguousarray(vertices, np.dtype('float32'))
+        if self.uploaded:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+            glBufferSubData(GL_ARRAY_BUFFER, 0, self.vertices.nbytes, self.vertices)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        from OpenGL.GL import glDeleteBuffers
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+        for buffer in self._buffers():
+            if buffer is not None:
+                glDeleteBuffers(1, [buffer])
+        self.vertex_buffer = None
+        self.color_buffer = None
+        self.edge_buffer = None
+        self.surface_buffer = None
+
+    def draw(self, color=None, edge_color=(0, 0, 0)):
+        from OpenGL.GL import (glEnableClientState, glBindBuffer, glVertexPointer, glColor3fv, glDrawElements,
+                               glColorPointer, glDisableClientState, GL_VERTEX_ARRAY, GL_ARRAY_BUFFER, GL_FLOAT,
+                               GL_LINES, GL_UNSIGNED_INT, GL_COLOR_ARRAY, GL_ELEMENT_ARRAY_BUFFER)
+        if not self.uploaded:
+            self.upload()
+        else:
+            delete_released_buffers()
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+
+        if self.edge_buffer is not None:
+            glColor3fv(edge_color)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.edge_buffer)
+            glDrawElements(GL_LINES, self.edges.size, GL_UNSIGNED_INT, None)
+
+        if self.surface_buffer is not None:
+            if self.color_buffer is not None:
+                glEnableClientState(GL_COLOR_ARRAY)
+                glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+                glColorPointer(3, GL_FLOAT, 0, None)
+            elif color is not None:
+                glColor3fv(color)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.surface_buffer)
+            glDrawElements(self.surface_primitive, self.surfaces.size, GL_UNSIGNED_INT, None)
+            if self.color_buffer is not None:
+                glDisableClientState(GL_COLOR_ARRAY)
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    @staticmethod
+    def _upload_indices(indices):
+        from OpenGL.GL import glGenBuffers, glBindBuffer, glBufferData, GL_ELEMENT_ARRAY_BUFFER, GL_STATIC_DRAW
+        buffer = glGenBuffers(1)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        return buffer
+
+
+class InstanceBuffer:
+    def __init__(self,
+                 edges,
+                 surfaces,
+                 surface_primitive,
+                 instance_count,
+                 max_ranges=64):
+
+        '''
+            Buffer objects for the world-space copies of one mesh, one copy per
+            instance: a vertex and a color buffer that are rewritten as instances
+            move, and index buffers that never change. update() uploads only the
+            vertex ranges of the given instances, merged into one span when they
+            are split into more than max_ranges runs.
+        '''
+        self.edges = edges
+        self.surfaces = surfaces
+        self.surface_primitive = surface_primitive
+        self.instance_count = instance_count
+        self.max_ranges = max_ranges
+
+        self.vertex_buffer = None
+        self.color_buffer = None
+        self.edge_buffer = None
+        self.surface_buffer = None
+        self._finalizer = None
+
+    @property
+    def uploaded(self):
+        return self.vertex_buffer is not None
+
+    def _buffers(self):
+        return self.vertex_buffer, self.color_buffer, self.edge_buffer, self.surface_buffer
+
+    def upload(self, vertices, colors):
+        from OpenGL.GL import glGenBuffers, glBufferData, glBindBuffer, GL_DYNAMIC_DRAW, GL_ARRAY_BUFFER
+        if not self.uploaded:
+            delete_released_buffers()
+            self.vertex_buffer = glGenBuffers(1)
+            self.color_buffer = glGenBuffers(1)
+            if self.edges is not None:
+                self.edge_buffer = MeshBuffer._upload_indices(self.edges)
+            if self.surfaces is not None:
+                self.surface_buffer = MeshBuffer._upload_indices(self.surfaces)
+            names = [int(buffer) for buffer in self._buffers() if buffer is not None]
+            self._finalizer = weakref.finalize(self, _released_buffers.extend, names)
+
+        for buffer, data in ((self.vertex_buffer, vertices), (self.color_buffer, colors)):
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def update(self, vertices, colors, instances):
+        from OpenGL.GL import glBufferSubData, glBindBuffer, GL_ARRAY_BUFFER
+        # instances: sorted indices of the instances whose rows of vertices and colors changed
+        if not self.uploaded:
+            self.upload(vertices, colors)
+            return
+        breaks = np.flatnonzero(np.diff(instances) != 1) + 1
+        starts = instances[np.concatenate(([0], breaks))]
+        stops = instances[np.concatenate((breaks - 1, [-1]))] + 1
+        if starts.size > self.max_ranges:
+            starts, stops = starts[:1], stops[-1:]
+
+        instance_vertices = vertices.shape[0] // self.instance_count
+        for buffer, data in ((self.vertex_buffer, vertices), (self.color_buffer, colors)):
+            glBindBuffer(GL_ARRAY_BUFFER, buffer)
+            for start, stop in zip((starts * instance_vertices).tolist(), (stops * instance_vertices).tolist()):
+                glBufferSubData(GL_ARRAY_BUFFER, start * data.itemsize * 3, (stop - start) * data.itemsize * 3,
+                                data[start:stop])
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, visible=None, edge_color=(0, 0, 0)):
+        from OpenGL.GL import (glEnableClientState, glBindBuffer, glVertexPointer, glColor3fv, glColorPointer,
+                               glDisableClientState, GL_VERTEX_ARRAY, GL_ARRAY_BUFFER, GL_FLOAT, GL_LINES,
+                               GL_COLOR_ARRAY)
+        edges, surfaces = None, None
+        if visible is not None and not visible.all():
+            if not visible.any():
+                return
+            # hidden instances keep their vertices; their indices are left out, from client memory
+            if self.edges is not None:
+                edges = self.edges.reshape(self.instance_count, -1)[visible].ravel()
+            if self.surfaces is not None:
+                surfaces = self.surfaces.reshape(self.instance_count, -1)[visible].ravel()
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+
+        if self.edges is not None:
+            glColor3fv(edge_color)
+            self._draw_elements(GL_LINES, self.edge_buffer, self.edges, edges)
+
+        if self.surfaces is not None:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, self.color_buffer)
+            glColorPointer(3, GL_FLOAT, 0, None)
+            self._draw_elements(self.surface_primitive, self.surface_buffer, self.surfaces, surfaces)
+            glDisableClientState(GL_COLOR_ARRAY)
+
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    @staticmethod
+    def _draw_elements(primitive, buffer, indices, visible_indices):
+        from OpenGL.GL import glBindBuffer, glDrawElements, GL_ELEMENT_ARRAY_BUFFER, GL_UNSIGNED_INT
+        if visible_indices is None:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, buffer)
+            glDrawElements(primitive, indices.size, GL_UNSIGNED_INT, None)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        else:
+            glDrawElements(primitive, visible_indices.size, GL_UNSIGNED_INT, visible_indices)
+
+    def delete(self):
+        from OpenGL.GL import glDeleteBuffers
+        if self._finalizer is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+        for buffer in self._buffers():
+            if buffer is not None:
+                glDeleteBuffers(1, [buffer])
+        self.vertex_buffer = None
+        self.color_buffer = None
+        self.edge_buffer = None
+        self.surface_buffer = None
@@ -0,0 +1,150 @@
+import inspect
+import numpy as np
+from solids.Geometry import geometry_cache, mesh_key
+from solids.Solids import RENDER_MODES, SolidsGroup
+from solids.Transforms import model_matrices
+
+
+def per_solid(value, count, width, name):
+    array = np.array(value, np.dtype('float64'))
+    if array.ndim == 1 and width is not None:
+        array = np.broadcast_to(array, (count, width))
+    elif array.ndim == 0:
+        array = np.broadcast_to(array, (count,) if width is None else (count, width))
+    if array.shape[0] != count:
+        raise ValueError("%s must have %d rows, got %s" % (name, count, array.shape))
+    # one private copy per population, so every solid can hold a row view of it
+    return np.array(array)
+
+
+def _wrapped(angles, period):
+    # same single-step wrap as the Solids angle setters
+    return np.where(angles < 0, angles + period, np.where(angles > period, angles - period, angles))
+
+
+def class_defaults(solid_class):
+    parameters = inspect.signature(solid_class.__init__).parameters
+    return {name: parameter.default for name, parameter in parameters.items()
+            if parameter.default is not inspect.Parameter.empty}
+
+
+def class_mesh(solid_class, size=None, size_offset=None, **mesh_options):
+    # the cached mesh solid_class.__init__ would pick for these arguments
+    defaults = class_defaults(solid_class)
+    size = size if size is not None else defaults.get('size')
+    size_offset = size_offset if size_offset is not None else defaults.get('size_offset')
+    mesh_parameters = [mesh_options.get(name, defaults.get(name))
+                       for name in list(inspect.signature(solid_class.build_mesh).parameters)[2:]]
+    return geometry_cache.get(mesh_key(solid_class, size, size_offset, *mesh_parameters),
+                              lambda: solid_class.build_mesh(size, size_offset, *mesh_parameters))
+
+
+def build_solids(solid_class,
+                 origins,
+                 origin_offsets=(0, 0, 0),
+                 axes=(0, 1, 0),
+                 axis_offsets=None,
+                 thetas=None,
+                 theta_degrees=None,
+                 phis=None,
+                 phi_degrees=None,
+                 sizes=None,
+                 size_offset=None,
+                 colors=None,
+                 render_mode=None,
+                 mode=None,
+                 **mesh_options):
+
+    '''
+        Builds len(origins) solids of solid_class in one vectorized step. Every
+        argument is either one value for the whole population or one row per solid.
+        Meshes are looked up once per distinct size; size_offset and mesh_options
+        (alpha, origin_axis, ...) apply to the whole population. Model matrices for mode
+        are computed together and cached on the solids.
+    '''
+    origins = np.array(origins, np.dtype('float64'))
+    count = origins.shape[0]
+    defaults = class_defaults(solid_class)
+
+    origin_offsets = per_solid(origin_offsets, count, 3, 'origin_offsets')
+    axes = per_solid(axes, count, 3, 'axes')
+    axis_offsets = per_solid(axis_offsets if axis_offsets is not None else defaults.get('axis_offset', (0, 0, 0)),
+                              count, 3, 'axis_offsets')
+    colors = per_solid(colors if colors is not None else defaults.get('color', (1, 1, 1)), count, 3, 'colors')
+
+    if thetas is None and theta_degrees is not None:
+        thetas = np.radians(per_solid(theta_degrees, count, None, 'theta_degrees'))
+    thetas = per_solid(thetas if thetas is not None else 0, count, None, 'thetas')
+    if phis is None and phi_degrees is not None:
+        phis = np.radians(per_solid(phi_degrees, count, None, 'phi_degrees'))
+    phis = per_solid(phis if phis is not None else 0, count, None, 'phis')
+
+    # scalar-sized classes (Cube, Pyramid, ...) keep a float size, the others one row per solid
+    default_size = defaults.get('size')
+    scalar_size = np.ndim(default_size) == 0
+    sizes = per_solid(sizes if sizes is not None else default_size, count,
+                       None if scalar_size else np.size(default_size), 'sizes')
+    size_offset = size_offset if size_offset is not None else defaults.get('size_offset')
+
+    if render_mode is None:
+        render_mode = "immediate"
+    if render_mode not in RENDER_MODES:
+        raise ValueError("render_mode must be one of %s, got %r" % (RENDER_MODES, render_mode))
+
+    unique_sizes, size_index = np.unique(sizes, axis=0, return_inverse=True)
+    size_index = size_index.ravel()
+    meshes = [class_mesh(solid_class, size.tolist() if scalar_size else tuple(size.tolist()), size_offset,
+                         **mesh_options)
+              for size in unique_sizes]
+
+    matrices = model_matrices(origin=origins,
+                              origin_offset=origin_offsets,
+                              axis=axes,
+                              axis_offset=axis_offsets,
+                              theta=thetas,
+                              phi=phis,
+                              mode=mode)
+    matrices.setflags(write=False)
+
+    if scalar_size:
+        sizes = sizes.tolist()
+    color_offset = np.zeros(3)
+
+    solids = []
+    # zip walks the arrays row by row, much cheaper than indexing each one per solid
+    for (matrix, origin, origin_offset, axis, axis_offset, color, size, mesh_index,
+         theta, theta_degree, phi, phi_degree) in zip(matrices, origins, origin_offsets, axes, axis_offsets,
+                                                       colors, sizes, size_index.tolist(),
+                                                       _wrapped(thetas, 2*np.pi).tolist(),
+                                                       np.degrees(thetas).tolist(),
+                                                       _wrapped(phis, 2*np.pi).tolist(),
+                                                       np.degrees(phis).tolist()):
+        mesh = meshes[mesh_index]
+        solid = solid_class.__new__(solid_class)
+        # the state Solids.__init__ sets up, without going through the setters
+        solid._init_state(mesh=mesh,
+                          color=color,
+                          color_offset=color_offset,
+                          origin=origin,
+                          origin_offset=origin_offset,
+                          axis=axis,
+                          axis_offset=axis_offset,
+                          theta=theta,
+                          theta_degree=theta_degree,
+                          phi=phi,
+                          phi_degree=phi_degree,
+                          size=size,
+                          size_offset=size_offset,
+                          render_mode=render_mode,
+                          model_matrix=matrix,
+                          model_matrix_mode=mode)
+        solids.append(solid)
+    return solids
+
+
+def build_group(solid_class, origins, render_mode=None, culling=False, level_of_detail=False, **arrays):
+    # the group hands its render mode down to the new solids ("buffered" when instanced)
+    return SolidsGroup(build_solids(solid_class, origins, **arrays),
+                       render_mode=render_mode,
+                       culling=culling,
+                       level_of_detail=level_of_detail)
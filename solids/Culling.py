@@ -0,0 +1,133 @@
+import numpy as np
+
+
+def perspective_matrix(fovy, aspect, near, far):
+    f = 1 / np.tan(np.radians(fovy) / 2)
+    matrix = np.zeros((4, 4))
+    matrix[0, 0] = f / aspect
+    matrix[1, 1] = f
+    matrix[2, 2] = (far + near) / (near - far)
+    matrix[2, 3] = 2 * far * near / (near - far)
+    matrix[3, 2] = -1
+    return matrix
+
+
+class Frustum:
+    def __init__(self, clip_matrix):
+
+        '''
+            clip_matrix = projection . modelview. Each plane is a row (a, b, c, d) of it
+            combined with the w row; a point p is inside when a*x + b*y + c*z + d >= 0
+            for all six (left, right, bottom, top, near, far).
+        '''
+        clip_matrix = np.asarray(clip_matrix, np.dtype('float64'))
+        planes = np.array([clip_matrix[3] + clip_matrix[0],
+                           clip_matrix[3] - clip_matrix[0],
+                           clip_matrix[3] + clip_matrix[1],
+                           clip_matrix[3] - clip_matrix[1],
+                           clip_matrix[3] + clip_matrix[2],
+                           clip_matrix[3] - clip_matrix[2]])
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, np.newaxis]
+        self.normals = planes[:, :3]
+        self.distances = planes[:, 3]
+
+    @classmethod
+    def perspective(cls, fovy, aspect, near, far, modelview=None):
+        projection = perspective_matrix(fovy, aspect, near, far)
+        if modelview is not None:
+            projection = np.matmul(projection, modelview)
+        return cls(projection)
+
+    @classmethod
+    def from_gl(cls):
+        from OpenGL.GL import glGetFloatv, GL_PROJECTION_MATRIX, GL_MODELVIEW_MATRIX
+        # GL returns column-major matrices
+        projection = np.asarray(glGetFloatv(GL_PROJECTION_MATRIX), np.dtype('float64')).reshape(4, 4).T
+        modelview = np.asarray(glGetFloatv(GL_MODELVIEW_MATRIX), np.dtype('float64')).reshape(4, 4).T
+        return cls(np.matmul(projection, modelview))
+
+    def spheres_visible(self, centers, radii):
+        distances = np.matmul(centers, self.normals.T) + self.distances
+        return np.all(distances >= -np.asarray(radii)[:, np.newaxis], axis=1)
+
+    def boxes_visible(self, centers, extents):
+        distances = np.matmul(centers, self.normals.T) + self.distances
+        return np.all(distances >= -np.matmul(extents, np.abs(self.normals.T)), axis=1)
+
+
+class BoundsCache:
+    def __init__(self):
+        self.solids_list = []
+        self._matrices = []
+        self.sphere_centers = np.zeros((0, 3))
+        self.sphere_radii = np.zeros(0)
+        self.box_centers = np.zeros((0, 3))
+        self.box_extents = np.zeros((0, 3))
+
+    def _reset(self, solids_list):
+        count = len(solids_list)
+        self.solids_list = list(solids_list)
+        self._matrices = [None] * count
+
+        # mesh bounds in model space, fixed for as long as the solids list is
+        self._local_sphere_centers = np.zeros((count, 3))
+        self._local_box_centers = np.zeros((count, 3))
+        self._local_box_extents = np.zeros((count, 3))
+        # solids without a mesh have unknown bounds and are never culled
+        self.sphere_radii = np.full(count, np.inf)
+        for index, solid in enumerate(solids_list):
+            if solid.mesh is not None:
+                minimum, maximum = solid.mesh.bounding_box
+                self._local_sphere_centers[index], self.sphere_radii[index] = solid.mesh.bounding_sphere
+                self._local_box_centers[index] = (minimum + maximum) / 2
+                self._local_box_extents[index] = (maximum - minimum) / 2
+
+        self.sphere_centers = np.zeros((count, 3))
+        self.box_centers = np.zeros((count, 3))
+        self.box_extents = np.full((count, 3), np.inf)
+
+    def update(self, solids_list, mode=None):
+        if len(solids_list) != len(self.solids_list) \
+                or any(solid is not cached for solid, cached in zip(solids_list, self.solids_list)):
+            self._reset(solids_list)
+
+        # a solid's cached model matrix is replaced whenever it moves, so identity marks the stale rows
+        changed = []
+        for index, solid in enumerate(solids_list):
+            if solid.mesh is not None:
+                matrix = solid.model_matrix(mode)
+                if matrix is not self._matrices[index]:
+                    self._matrices[index] = matrix
+                    changed.append(index)
+
+        if changed:
+            matrices = np.stack([self._matrices[index] for index in changed])
+            rotations = matrices[:, :3, :3]
+            translations = matrices[:, :3, 3]
+            self.sphere_centers[changed] = np.einsum('nij,nj->ni', rotations,
+                                                     self._local_sphere_centers[changed]) + translations
+            self.box_centers[changed] = np.einsum('nij,nj->ni', rotations,
+                                                  self._local_box_centers[changed]) + translations
+            self.box_extents[changed] = np.einsum('nij,nj->ni', np.abs(rotations), self._local_box_extents[changed])
+        return len(changed)
+
+
+class Culler:
+    def __init__(self, frustum=None):
+        self.frustum = frustum
+        self.bounds = BoundsCache()
+        self.visible_count = 0
+        self.culled_count = 0
+
+    def visible(self, solids_list, mode=None):
+        self.bounds.update(solids_list, mode)
+        frustum = self.frustum if self.frustum is not None else Frustum.from_gl()
+
+        visible = frustum.spheres_visible(self.bounds.sphere_centers, self.bounds.sphere_radii)
+        candidates = np.flatnonzero(visible & np.isfinite(self.bounds.sphere_radii))
+        visible[candidates] = frustum.boxes_visible(self.bounds.box_centers[candidates],
+                                                    self.bounds.box_extents[candidates])
+
+        self.visible_count = int(np.count_nonzero(visible))
+        self.culled_count = len(solids_list) - self.visible_count
+        return visible
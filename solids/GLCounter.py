@@ -0,0 +1,72 @@
+import re
+import sys
+from collections import Counter
+
+COUNTED_PACKAGES = ("solids", "RobotArm", "benchmarks")
+GL_MODULES = ("OpenGL.GL", "OpenGL.GLU")
+GL_FUNCTION_NAME = re.compile(r'^glu?[A-Z]')
+
+# values handed back by the mock layer for calls whose result the renderer keeps
+MOCK_RESULTS = {'glGenBuffers': 1,
+                'glGenLists': 1,
+                'glGenFramebuffers': 1,
+                'glGenRenderbuffers': 1}
+
+
+class GLCallCounter:
+    def __init__(self, passthrough=True, packages=COUNTED_PACKAGES):
+        self.passthrough = passthrough
+        self.packages = packages
+        self.calls = Counter()
+        self.total = 0
+        self._patched = []
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.uninstall()
+
+    def reset(self):
+        self.calls.clear()
+        self.total = 0
+
+    def install(self):
+        # modules that import GL names where they draw look them up in OpenGL.GL and OpenGL.GLU
+        # at call time, so those are patched along with the counted packages
+        import OpenGL.GL
+        import OpenGL.GLU
+
+        wrappers = {}
+        for module_name, module in list(sys.modules.items()):
+            if module is None or (module_name.split('.')[0] not in self.packages
+                                  and module_name not in GL_MODULES):
+                continue
+            for name, function in list(vars(module).items()):
+                if not self._is_gl_function(name, function):
+                    continue
+                if name not in wrappers:
+                    wrappers[name] = self._wrap(name, function)
+                self._patched.append((module, name, function))
+                setattr(module, name, wrappers[name])
+
+    def uninstall(self):
+        for module, name, function in reversed(self._patched):
+            setattr(module, name, function)
+        self._patched = []
+
+    def _wrap(self, name, function):
+        def counted(*args, **kwargs):
+            self.calls[name] += 1
+            self.total += 1
+            if self.passthrough:
+                return function(*args, **kwargs)
+            return MOCK_RESULTS.get(name)
+
+        counted.__wrapped__ = function
+        return counted
+
+    @staticmethod
+    def _is_gl_function(name, function):
+        return GL_FUNCTION_NAME.match(name) is not None and callable(function) and not isinstance(function, type)
@@ -0,0 +1,206 @@
+from collections import OrderedDict
+import numpy as np
+from solids.Buffers import MeshBuffer
+
+# surface primitives, with the values of GL_TRIANGLES and GL_QUADS so they can be passed
+# to glDrawArrays/glDrawElements as they are, without importing OpenGL here
+TRIANGLES = 0x0004
+QUADS = 0x0007
+
+
+class Mesh:
+    def __init__(self,
+                 vertices,
+                 edges=None,
+                 surfaces=None,
+                 colors=None):
+
+        self.vertices = self._freeze_array(vertices, np.dtype('float64'))
+        self.edges = self._freeze_array(edges, np.dtype('int64'))
+        self.surfaces = self._freeze_array(surfaces, np.dtype('int64'))
+        self.colors = self._freeze_array(colors, np.dtype('float32'))
+        self._buffer = None
+        self._bounding_box = None
+        self._bounding_sphere = None
+
+    @property
+    def buffer(self):
+        if self._buffer is None:
+            self._buffer = MeshBuffer(self.vertices, self.edges, self.surfaces, self.colors)
+        return self._buffer
+
+    @property
+    def bounding_box(self):
+        if self._bounding_box is None:
+            self._bounding_box = (self.vertices.min(axis=0), self.vertices.max(axis=0))
+        return self._bounding_box
+
+    @property
+    def bounding_sphere(self):
+        if self._bounding_sphere is None:
+            minimum, maximum = self.bounding_box
+            center = (minimum + maximum) / 2
+            self._bounding_sphere = (center, float(np.linalg.norm(self.vertices - center, axis=1).max()))
+        return self._bounding_sphere
+
+    @staticmethod
+    def _freeze_array(value, dtype):
+        if value is None:
+            return None
+        array = np.array(value, dtype)
+        array.setflags(write=False)
+        return array
+
+
+def surface_primitive(surfaces):
+    return TRIANGLES if surfaces is not None and np.shape(surfaces)[1] == 3 else QUADS
+
+
+class GeometryCache:
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._meshes = OrderedDict()
+
+    def __len__(self):
+        return len(self._meshes)
+
+    def __contains__(self, key):
+        return key in self._meshes
+
+    def get(self, key, build):
+        mesh = self._meshes.get(key)
+        if mesh is not None:
+            self.hits += 1
+            self._meshes.move_to_end(key)
+            return mesh
+
+        self.misses += 1
+        mesh = Mesh(*build())
+        self._meshes[key] = mesh
+
+        # least recently used meshes are dropped first; solids that still hold one keep it alive,
+        # and its GPU buffers are released once the last of them is gone (see solids.Buffers)
+        while len(self._meshes) > self.max_entries:
+            self._meshes.popitem(last=False)
+
+        return mesh
+
+    def clear(self):
+        self._meshes.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def prism_topology(sides):
+    if sides < 3:
+        raise ValueError("a prism needs at least 3 sides, got %r" % (sides,))
+    topology = _prism_topologies.get(sides)
+    if topology is not None:
+        return topology
+
+    bottom = np.arange(sides)
+    following = np.roll(bottom, -1)
+    top = bottom + sides
+
+    edges = np.vstack((np.column_stack((bottom, following)),
+                       np.column_stack((top, following + sides)),
+                       np.column_stack((bottom, top))))
+
+    # caps are fanned into quads from vertex 0; an odd side count ends on a degenerate quad
+    fan = np.arange(1, sides - 1, 2)
+    caps = np.column_stack((np.zeros_like(fan), fan, fan + 1, np.minimum(fan + 2, sides - 1)))
+    surfaces = np.vstack((np.column_stack((bottom, following, following + sides, top)),
+                          caps,
+                          caps + sides))
+
+    edges.setflags(write=False)
+    surfaces.setflags(write=False)
+    _prism_topologies[sides] = (edges, surfaces)
+    return edges, surfaces
+
+
+def axis_basis(axis):
+    axis = np.asarray(axis, np.dtype('float64'))
+    axis = axis / np.linalg.norm(axis)
+    # u is the first coordinate axis that is not parallel to the prism axis, made orthogonal to it
+    for candidate in np.eye(3):
+        u = candidate - np.dot(candidate, axis) * axis
+        if np.linalg.norm(u) > 1e-6:
+            break
+    u = u / np.linalg.norm(u)
+    return axis, u, np.cross(axis, u)
+
+
+def prism_vertices(sides,
+                   radius,
+                   length,
+                   axis=(0, 1, 0),
+                   top_radius=None,
+                   angle_offset=0.0,
+                   center=(0, 0, 0),
+                   anchor="center"):
+
+    '''
+        Vertices of n-sided prisms (or frusta when top_radius differs from radius).
+        Vertex k of the bottom ring sits at angle angle_offset + 2*pi*k/sides from u,
+        where (u, v) spans the plane normal to axis (see axis_basis); vertex
+        k + sides is the same corner on the top ring. anchor "center" spans
+        -length/2..+length/2 along axis around center, "base" spans 0..length.
+        radius, length, top_radius, angle_offset and center broadcast over a leading
+        (M,) dimension, giving (M, 2 * sides, 3).
+    '''
+    axis, u, v = axis_basis(axis)
+    radius = np.asarray(radius, np.dtype('float64'))
+    length = np.asarray(length, np.dtype('float64'))
+    top_radius = radius if top_radius is None else np.asarray(top_radius, np.dtype('float64'))
+    angle_offset = np.asarray(angle_offset, np.dtype('float64'))
+    center = np.asarray(center, np.dtype('float64'))
+
+    angles = angle_offset[..., np.newaxis] + 2 * np.pi * np.arange(sides) / sides
+    ring = np.cos(angles)[..., np.newaxis] * u + np.sin(angles)[..., np.newaxis] * v
+
+    if anchor == "center":
+        start = -length / 2
+    elif anchor == "base":
+        start = np.zeros_like(length)
+    else:
+        raise ValueError("anchor must be \"center\" or \"base\", got %r" % (anchor,))
+    end = start + length
+
+    bottom = radius[..., np.newaxis, np.newaxis] * ring + start[..., np.newaxis, np.newaxis] * axis
+    top = top_radius[..., np.newaxis, np.newaxis] * ring + end[..., np.newaxis, np.newaxis] * axis
+    return np.concatenate((bottom, top), axis=-2) + center[..., np.newaxis, :]
+
+
+def prism_geometry(sides, radius, length, **options):
+    edges, surfaces = prism_topology(sides)
+    return prism_vertices(sides, radius, length, **options), edges, surfaces
+
+
+def prism_mesh(sides,
+               radius,
+               length,
+               axis=(0, 1, 0),
+               top_radius=None,
+               angle_offset=0.0,
+               center=(0, 0, 0),
+               anchor="center"):
+
+    top_radius = radius if top_radius is None else top_radius
+    key = mesh_key(prism_mesh, sides, radius, length, axis, top_radius, angle_offset, center) + (anchor,)
+    return geometry_cache.get(key, lambda: prism_geometry(sides, radius, length,
+                                                          axis=axis,
+                                                          top_radius=top_radius,
+                                                          angle_offset=angle_offset,
+                                                          center=center,
+                                                          anchor=anchor))
+
+
+def mesh_key(solid_class, *parameters):
+    return (solid_class.__name__,) + tuple(tuple(np.ravel(parameter).tolist()) for parameter in parameters)
+
+
+geometry_cache = GeometryCache()
+_prism_topologies = {}
@@ -0,0 +1,132 @@
+import numpy as np
+from solids.Geometry import surface_primitive
+from solids.Solids import Solids, SolidsGroup, update_model_matrices
+from solids.SolidsArray import SolidsArray
+from solids.Transforms import transform_points
+
+
+class GeometryQueue:
+    def __init__(self):
+
+        '''
+            Collects solids and their world transforms, grouped by mesh, and turns them
+            into world-space geometry without touching GL, so it also serves machines
+            with no GL library (solids.Rasterizer). RenderQueue draws what it collects.
+        '''
+        self.submitted = 0
+        self._meshes = {}
+        self._arrays = []
+        self._deferred = []
+
+    def __len__(self):
+        return sum(len(solids) for _, solids, _ in self._meshes.values()) + len(self._arrays) + len(self._deferred)
+
+    def clear(self):
+        self._meshes = {}
+        self._arrays = []
+        self._deferred = []
+
+    def submit(self, solid, mode=None, matrix=None):
+        '''
+            Queues solid for the next geometry() or flush(). matrix is the parent
+            transform the solid would otherwise be drawn under (a SceneNode's world
+            matrix, say), relative to the modelview at flush time. Groups are expanded
+            into their leaves, with their level of detail and culling applied first.
+            Solids drawn by Solids._draw and the visible elements of SolidsArrays are
+            merged into the sorted passes; anything else with its own _draw is kept
+            as is and drawn after them.
+        '''
+        if isinstance(solid, SolidsGroup) and type(solid)._draw is SolidsGroup._draw:
+            leaves = solid.leaf_solids()
+            if solid.level_of_detail:
+                solid.lod_selector.update(leaves, mode)
+            update_model_matrices(leaves, mode)
+            visible = solid.culler.visible(leaves, mode) if solid.culling and matrix is None else None
+            for index, leaf in enumerate(leaves):
+                if visible is None or visible[index]:
+                    self._submit_solid(leaf, mode, matrix)
+        else:
+            self._submit_solid(solid, mode, matrix)
+
+    def _submit_solid(self, solid, mode, matrix):
+        self.submitted += 1
+        if isinstance(solid, SolidsArray) and type(solid)._draw is SolidsArray._draw:
+            self._arrays.append((solid, mode, matrix))
+            return
+        if solid.mesh is None or type(solid)._draw is not Solids._draw:
+            self._deferred.append((solid, mode, matrix))
+            return
+        if solid.mesh.edges is None:
+            # Solids._draw draws nothing without edges either
+            return
+
+        world = solid.model_matrix(mode)
+        if matrix is not None:
+            world = np.matmul(matrix, world)
+        entry = self._meshes.get(id(solid.mesh))
+        if entry is None:
+            entry = self._meshes[id(solid.mesh)] = (solid.mesh, [], [])
+        entry[1].append(solid)
+        entry[2].append(world)
+
+    @property
+    def deferred(self):
+        return list(self._deferred)
+
+    def geometry(self):
+        '''
+            World-space geometry of the queued mesh solids and arrays: an (E, 3) array
+            of edge vertex pairs, and a list of (primitive, color, vertices,
+            vertex_colors) surface runs sorted by primitive and color. color is None
+            for meshes with per-vertex colors and for arrays, whose colors are then
+            in vertex_colors.
+        '''
+        edges = []
+        runs = {}
+        for mesh, solids_list, matrices in self._meshes.values():
+            # every solid sharing a mesh is moved into place in one vectorized step
+            world = transform_points(np.stack(matrices), mesh.vertices)
+            if mesh.edges.size:
+                edges.append(world[:, mesh.edges.ravel()].reshape(-1, 3))
+            if mesh.surfaces is None:
+                continue
+
+            primitive = surface_primitive(mesh.surfaces)
+            surface_vertices = world[:, mesh.surfaces.ravel()]
+            if mesh.colors is not None:
+                colors = np.tile(mesh.colors[mesh.surfaces.ravel()], (len(solids_list), 1))
+                runs.setdefault((primitive, None), []).append((surface_vertices.reshape(-1, 3), colors))
+            else:
+                for solid, vertices in zip(solids_list, surface_vertices):
+                    color = tuple((solid.color + solid.color_offset).tolist())
+                    runs.setdefault((primitive, color), []).append((vertices, None))
+
+        for array, mode, matrix in self._arrays:
+            visible = np.flatnonzero(array.visible)
+            mesh = array.element_mesh
+            if not visible.size:
+                continue
+            # the elements are placed inside the array's own transform, as SolidsArray._draw does
+            parent = array.model_matrix(mode) if matrix is None else np.matmul(matrix, array.model_matrix(mode))
+            world = transform_points(np.matmul(parent, array.element_matrices(mode)[visible]), mesh.vertices)
+            if mesh.edges is not None and mesh.edges.size:
+                edges.append(world[:, mesh.edges.ravel()].reshape(-1, 3))
+            if mesh.surfaces is None:
+                continue
+
+            # element colors replace any mesh colors, and go in as vertex colors so that an array
+            # of many colors still ends up in one run
+            colors = np.repeat((array.colors + array.color_offsets)[visible], mesh.surfaces.size, axis=0)
+            runs.setdefault((surface_primitive(mesh.surfaces), None), []).append(
+                (world[:, mesh.surfaces.ravel()].reshape(-1, 3), colors))
+
+        # one state change per primitive and color; per-vertex colored meshes close each primitive
+        keys = sorted(runs, key=lambda key: (key[0], key[1] is None, key[1] or ()))
+        surfaces = []
+        for primitive, color in keys:
+            run = runs[(primitive, color)]
+            surfaces.append((primitive,
+                             color,
+                             np.vstack([vertices for vertices, _ in run]),
+                             np.vstack([colors for _, colors in run]) if color is None else None))
+        return np.vstack(edges) if edges else np.zeros((0, 3)), surfaces
@@ -0,0 +1,103 @@
+import numpy as np
+from solids.Buffers import InstanceBuffer
+from solids.Geometry import surface_primitive
+
+
+class InstanceBatch:
+    def __init__(self, mesh, solids_list):
+        self.mesh = mesh
+        self.solids_list = list(solids_list)
+
+        self.base_vertices = homogeneous_vertices(mesh)
+        self.edges, self.surfaces, self.surface_primitive = instance_indices(mesh, len(self.solids_list))
+        self.buffer = InstanceBuffer(self.edges, self.surfaces, self.surface_primitive, len(self.solids_list))
+
+        self._vertices = None
+        self._vertex_colors = None
+        self._mode = None
+
+    def __len__(self):
+        return len(self.solids_list)
+
+    def instance_arrays(self, mode=None, instances=None):
+        # SolidsGroup refreshes the solids' cached matrices in one vectorized pass before drawing
+        solids_list = self.solids_list if instances is None else [self.solids_list[index] for index in instances]
+        matrices = np.stack([solid.model_matrix(mode) for solid in solids_list])
+        colors = np.array([solid.color + solid.color_offset for solid in solids_list], np.dtype('float32'))
+        return matrices, colors
+
+    def update(self, mode=None, instances=None):
+        matrices, colors = self.instance_arrays(mode, instances)
+        vertices, vertex_colors = expand_instances(self.base_vertices, matrices, colors)
+        if instances is None:
+            self._vertices, self._vertex_colors = vertices, vertex_colors
+            self._mode = mode
+            self.buffer.upload(self._vertices, self._vertex_colors)
+            return
+
+        # only the moved instances are re-expanded and re-uploaded
+        shape = (len(self), self.base_vertices.shape[0], 3)
+        self._vertices.reshape(shape)[instances] = vertices.reshape(-1, shape[1], 3)
+        self._vertex_colors.reshape(shape)[instances] = vertex_colors.reshape(-1, shape[1], 3)
+        self.buffer.update(self._vertices, self._vertex_colors, instances)
+
+    def draw(self, mode=None, visible=None):
+        # untouched batches reuse the buffers filled on an earlier frame
+        if self._vertices is None or self._mode != mode:
+            self.update(mode)
+            for solid in self.solids_list:
+                solid.dirty = False
+        else:
+            dirty = np.fromiter((solid.dirty for solid in self.solids_list), np.dtype('bool'), len(self))
+            if dirty.any():
+                instances = np.flatnonzero(dirty)
+                self.update(mode, instances)
+                for index in instances.tolist():
+                    self.solids_list[index].dirty = False
+
+        self.buffer.draw(visible)
+
+
+def homogeneous_vertices(mesh):
+    return np.hstack((mesh.vertices, np.ones((mesh.vertices.shape[0], 1))))
+
+
+def instance_indices(mesh, instance_count):
+    vertex_count = mesh.vertices.shape[0]
+    instance_offsets = (np.arange(instance_count) * vertex_count)[:, np.newaxis]
+
+    edges = None
+    surfaces = None
+    if mesh.edges is not None and mesh.edges.size:
+        edges = np.ascontiguousarray((mesh.edges.reshape(1, -1) + instance_offsets).ravel(), np.dtype('uint32'))
+
+    if mesh.surfaces is not None:
+        surfaces = np.ascontiguousarray((mesh.surfaces.reshape(1, -1) + instance_offsets).ravel(),
+                                        np.dtype('uint32'))
+    return edges, surfaces, surface_primitive(mesh.surfaces)
+
+
+def expand_instances(base_vertices, matrices, colors):
+    # one world-space copy of the mesh per instance, ready for a single glDrawElements call
+    vertices = np.einsum('nij,vj->nvi', matrices[:, :3, :], base_vertices)
+    vertex_colors = np.repeat(np.asarray(colors, np.dtype('float32')), base_vertices.shape[0], axis=0)
+    return (np.ascontiguousarray(vertices.reshape(-1, 3), np.dtype('float32')),
+            np.ascontiguousarray(vertex_colors))
+
+
+def build_instance_batches(solids_list, min_instances=2):
+    meshes = {}
+    for solid in solids_list:
+        if solid.mesh is not None:
+            meshes.setdefault(id(solid.mesh), []).append(solid)
+
+    batches = []
+    batched = set()
+    for same_mesh_solids in meshes.values():
+        if len(same_mesh_solids) >= min_instances:
+            batches.append(InstanceBatch(same_mesh_solids[0].mesh, same_mesh_solids))
+            batched.update(id(solid) for solid in same_mesh_solids)
+
+    singles = [solid for solid in solids_list if id(solid) not in batched]
+    return batches, singles
+
@@ -0,0 +1,155 @@
+import weakref
+import numpy as np
+from solids.Geometry import Mesh, prism_topology
+from solids.Culling import BoundsCache
+
+LEVELS = ("full", "fewer_sides", "no_edges", "box")
+NO_EDGES = np.zeros((0, 2), np.dtype('int64'))
+
+_level_meshes = weakref.WeakKeyDictionary()
+
+
+def box_mesh(mesh):
+    minimum, maximum = mesh.bounding_box
+    vertices = np.array([[minimum[0], minimum[1], maximum[2]],
+                         [minimum[0], maximum[1], maximum[2]],
+                         [maximum[0], maximum[1], maximum[2]],
+                         [maximum[0], minimum[1], maximum[2]],
+                         [maximum[0], minimum[1], minimum[2]],
+                         [minimum[0], minimum[1], minimum[2]],
+                         [minimum[0], maximum[1], minimum[2]],
+                         [maximum[0], maximum[1], minimum[2]]])
+
+    surfaces = ((0, 1, 2, 3),
+                (3, 2, 7, 4),
+                (4, 7, 6, 5),
+                (5, 6, 1, 0),
+                (1, 6, 7, 2),
+                (4, 5, 0, 3))
+
+    return Mesh(vertices, NO_EDGES, surfaces)
+
+
+def prism_sides(mesh):
+    # the side count of a mesh laid out by solids.Geometry.prism_geometry, None for any other mesh
+    sides = mesh.vertices.shape[0] // 2
+    if sides < 3 or mesh.vertices.shape[0] != 2 * sides or mesh.surfaces is None:
+        return None
+    edges, surfaces = prism_topology(sides)
+    if not (np.array_equal(mesh.edges, edges) and np.array_equal(mesh.surfaces, surfaces)):
+        return None
+    return sides
+
+
+def reduced_prism_mesh(mesh, sides):
+    # keeps evenly spread corners of both rings, so the prism keeps its radius, axis and length
+    full_sides = prism_sides(mesh)
+    if full_sides is None or full_sides <= sides:
+        return mesh
+    corners = np.arange(sides) * full_sides // sides
+    kept = np.concatenate((corners, corners + full_sides))
+    edges, surfaces = prism_topology(sides)
+    return Mesh(mesh.vertices[kept], edges, surfaces, mesh.colors[kept] if mesh.colors is not None else None)
+
+
+def level_meshes(mesh, reduced_sides=3):
+    # built once per base mesh, so solids sharing a mesh also share its simplified versions;
+    # the cache holds no reference to the base mesh, which would keep it from being collected
+    simplified = _level_meshes.setdefault(mesh, {}).get(reduced_sides)
+    if simplified is None:
+        reduced = reduced_prism_mesh(mesh, reduced_sides)
+        simplified = (reduced if reduced is not mesh else None,
+                      Mesh(reduced.vertices, NO_EDGES, reduced.surfaces, reduced.colors),
+                      box_mesh(mesh))
+        _level_meshes[mesh][reduced_sides] = simplified
+    reduced, no_edges, box = simplified
+    return mesh, reduced if reduced is not None else mesh, no_edges, box
+
+
+def lod_solid_classes():
+    from solids.Solids import Hexagon, HexagonAxis, HexagonStalk
+    return Hexagon, HexagonAxis, HexagonStalk
+
+
+class LevelOfDetail:
+    def __init__(self,
+                 thresholds=(60, 40, 12),
+                 hysteresis=0.15,
+                 reduced_sides=3,
+                 solid_classes=None,
+                 projection_scale=None,
+                 modelview=None):
+
+        '''
+            thresholds: projected bounding-sphere radius in pixels below which a solid
+            drops to the next level of LEVELS. A solid only coarsens once it is
+            hysteresis below a threshold and only refines once it is hysteresis above
+            it, so sizes hovering around a threshold do not flicker. "fewer_sides"
+            and "no_edges" draw the prism with reduced_sides sides.
+            projection_scale (pixels per unit at distance 1) and modelview are read
+            from GL when None.
+        '''
+        self.thresholds = np.asarray(thresholds, np.dtype('float64'))
+        self.hysteresis = hysteresis
+        self.reduced_sides = reduced_sides
+        self.solid_classes = solid_classes if solid_classes is not None else lod_solid_classes()
+        self.projection_scale = projection_scale
+        self.modelview = modelview
+
+        self.bounds = BoundsCache()
+        self.solids_list = []
+        self.base_meshes = []
+        self.levels = np.zeros(0, np.dtype('int64'))
+        self.switches = 0
+
+    @staticmethod
+    def perspective_scale(fovy, viewport_height):
+        return viewport_height / 2 / np.tan(np.radians(fovy) / 2)
+
+    def _reset(self, solids_list):
+        self.solids_list = list(solids_list)
+        self.base_meshes = [solid.mesh for solid in solids_list]
+        self.levels = np.zeros(len(solids_list), np.dtype('int64'))
+        self._selectable = np.array([isinstance(solid, self.solid_classes) and solid.mesh is not None
+                                     for solid in solids_list], np.dtype('bool'))
+
+    def pixel_radii(self, solids_list, mode=None):
+        self.bounds.update(solids_list, mode)
+
+        projection_scale = self.projection_scale
+        modelview = self.modelview
+        if projection_scale is None or modelview is None:
+            from OpenGL.GL import glGetFloatv, glGetIntegerv, GL_PROJECTION_MATRIX, GL_VIEWPORT, GL_MODELVIEW_MATRIX
+        if projection_scale is None:
+            # GL returns column-major matrices; [1][1] is cot(fovy / 2) for gluPerspective
+            projection_scale = glGetFloatv(GL_PROJECTION_MATRIX)[1][1] * glGetIntegerv(GL_VIEWPORT)[3] / 2
+        if modelview is None:
+            modelview = np.asarray(glGetFloatv(GL_MODELVIEW_MATRIX), np.dtype('float64')).reshape(4, 4).T
+
+        depths = -(np.matmul(self.bounds.sphere_centers, modelview[2, :3]) + modelview[2, 3])
+        return self.bounds.sphere_radii * projection_scale / np.maximum(depths, 1e-6)
+
+    def update(self, solids_list, mode=None):
+        if len(solids_list) != len(self.solids_list) \
+                or any(solid is not cached for solid, cached in zip(solids_list, self.solids_list)):
+            # hand the previous solids back their full meshes before tracking a new list
+            self.restore()
+            self._reset(solids_list)
+
+        radii = self.pixel_radii(solids_list, mode)[:, np.newaxis]
+        coarsest = np.count_nonzero(radii < self.thresholds * (1 - self.hysteresis), axis=1)
+        finest = np.count_nonzero(radii < self.thresholds * (1 + self.hysteresis), axis=1)
+        levels = np.where(self._selectable, np.clip(self.levels, coarsest, finest), 0)
+
+        changed = np.flatnonzero(levels != self.levels)
+        for index in changed:
+            self.solids_list[index].set_mesh(level_meshes(self.base_meshes[index], self.reduced_sides)[levels[index]])
+        self.levels = levels
+        self.switches += changed.size
+        return changed.size
+
+    def restore(self):
+        for solid, mesh, level in zip(self.solids_list, self.base_meshes, self.levels):
+            if level != 0:
+                solid.set_mesh(mesh)
+        self.levels = np.zeros(len(self.solids_list), np.dtype('int64'))
@@ -0,0 +1,238 @@
+import os
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+RENDER_BACKENDS = ("egl", "osmesa", "raster")
+
+
+class Animation:
+    mode = None
+
+    def __init__(self):
+        self.build()
+
+    def build(self):
+        self.items = []
+
+    def pose(self, frame):
+        # subclasses set the scene for a frame index absolutely, never from the previous frame
+        pass
+
+    def scene(self):
+        return self.items
+
+    def draw(self):
+        for item in self.scene():
+            item.draw(self.mode)
+
+
+class TankAnimation(Animation):
+    def build(self):
+        # solids are imported here so worker processes pick their GL platform first
+        from solids.tank_composition_example import Tank
+        self.start_origin = np.array([-2.0, 0.0, -5.0])
+        self.tank = Tank(origin=self.start_origin, axis=(1, -1, 0))
+        self.start_theta = self.tank.theta
+        self.items = [self.tank]
+
+    def pose(self, frame):
+        # the example draws first and then adds pi/20 and +-0.1 on x; both branches of its
+        # counter run at 40, so a round trip is 79 frames: 0 up to 39, 39 again, down to 1
+        phase = frame % 79
+        steps = phase if phase < 40 else 79 - phase
+        self.tank.theta = (self.start_theta + frame * np.pi/20) % (2*np.pi)
+        self.tank.origin = self.start_origin + (0.1 * steps, 0, 0)
+
+
+class OrbitAnimation(Animation):
+    axes = ((0, 1, 1), (1, 1, 0), (1, 0, 1),
+            (0, -1, -1), (-1, -1, 0), (-1, 0, -1),
+            (0, -1, 1), (-1, 1, 0), (-1, 0, 1))
+
+    def build(self):
+        from solids.orbit_cubes_moves_example import Orbit
+        self.items = [Orbit(origin=(0, 0, -5), origin_offset=(1, 0, 0), axis=axis, theta=np.pi/2)
+                      for axis in self.axes]
+
+    def pose(self, frame):
+        # the example steps every orbit before drawing, so frame 0 already shows one step
+        for i, orbit in enumerate(self.items):
+            orbit.theta = (np.pi/2 + (frame + 1) * np.pi/(20+i)) % (2*np.pi)
+
+
+ANIMATIONS = {'tank': TankAnimation, 'orbit': OrbitAnimation}
+
+
+class FrameRenderer:
+    def __init__(self,
+                 animation_class,
+                 screen_size=(800, 600),
+                 backend="egl",
+                 fovy=50,
+                 near=0.1,
+                 far=50.0,
+                 animation_options=None):
+
+        '''
+            Renders frames of an Animation off screen: "egl" and "osmesa" draw with
+            GL into a framebuffer, "raster" uses the NumPy software rasterizer.
+            Frames are uint8 RGB with row 0 at the top.
+        '''
+        if backend not in RENDER_BACKENDS:
+            raise ValueError("backend must be one of %s, got %r" % (RENDER_BACKENDS, backend))
+        self.screen_size = tuple(screen_size)
+        self.backend = backend
+        self.context = None
+        self.rasterizer = None
+
+        if backend == "raster":
+            from solids.Rasterizer import Rasterizer
+            self.rasterizer = Rasterizer(self.screen_size, fovy=fovy, near=near, far=far)
+        else:
+            from solids.Backends import create_context
+            self.context = create_context(self.screen_size, backend)
+            self._setup_projection(fovy, near, far)
+
+        self.animation = animation_class(**(animation_options or {}))
+
+    def _setup_projection(self, fovy, near, far):
+        from OpenGL.GL import glMatrixMode, glLoadIdentity, glEnable, GL_PROJECTION, GL_MODELVIEW, GL_DEPTH_TEST
+        from OpenGL.GLU import gluPerspective
+
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(fovy, self.screen_size[0] / self.screen_size[1], near, far)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        glEnable(GL_DEPTH_TEST)
+
+    def render_frame(self, frame):
+        self.animation.pose(frame)
+        if self.rasterizer is not None:
+            image, _ = self.rasterizer.render(self.animation.scene(), mode=self.animation.mode)
+            return image
+
+        from OpenGL.GL import glClear, GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.animation.draw()
+        self.context.finish_frame()
+        return self.context.read_pixels()
+
+    def render(self, start, stop):
+        width, height = self.screen_size
+        frames = np.empty((stop - start, height, width, 3), np.dtype('uint8'))
+        for index, frame in enumerate(range(start, stop)):
+            frames[index] = self.render_frame(frame)
+        return frames
+
+    def close(self):
+        if self.context is not None:
+            self.context.close()
+            self.context = None
+
+
+_worker_renderer = None
+
+
+def _start_worker(animation_class, screen_size, backend, animation_options):
+    global _worker_renderer
+    _worker_renderer = FrameRenderer(animation_class, screen_size, backend, animation_options=animation_options)
+
+
+def _render_chunk(start, stop):
+    # BGR, the channel order cv2.VideoWriter expects
+    return start, _worker_renderer.render(start, stop)[..., ::-1]
+
+
+def render_video(path,
+                 animation_class,
+                 frame_count,
+                 fps=30,
+                 screen_size=(800, 600),
+                 backend="egl",
+                 workers=None,
+                 chunk_frames=16,
+                 max_pending=None,
+                 fourcc="mp4v",
+                 animation_options=None):
+
+    '''
+        Renders frames [0, frame_count) of animation_class on a pool of headless
+        renderers and writes them in order to a cv2.VideoWriter. Each worker
+        builds its own context and animation once; frame ranges of chunk_frames
+        are handed out in order, and at most max_pending chunks (2 per worker by
+        default) are rendered or waiting to be written at any time, which bounds
+        memory to max_pending * chunk_frames frames.
+    '''
+    import cv2
+
+    workers = workers if workers is not None else os.cpu_count()
+    max_pending = max_pending if max_pending is not None else 2 * workers
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, tuple(screen_size))
+    if not writer.isOpened():
+        raise RuntimeError("cv2.VideoWriter could not open %r with fourcc %r" % (path, fourcc))
+
+    chunks = iter(range(0, frame_count, chunk_frames))
+    pending = deque()
+    written = 0
+    # spawned workers start without the parent's GL state and choose their own platform
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_start_worker,
+                             initargs=(animation_class, tuple(screen_size), backend, animation_options)) as pool:
+        try:
+            for start in chunks:
+                pending.append(pool.submit(_render_chunk, start, min(start + chunk_frames, frame_count)))
+                if len(pending) == max_pending:
+                    break
+
+            while pending:
+                # futures are collected in submission order, so frames reach the writer in order
+                _, frames = pending.popleft().result()
+                for frame in frames:
+                    writer.write(np.ascontiguousarray(frame))
+                written += frames.shape[0]
+
+                start = next(chunks, None)
+                if start is not None:
+                    pending.append(pool.submit(_render_chunk, start, min(start + chunk_frames, frame_count)))
+        finally:
+            for future in pending:
+                future.cancel()
+            writer.release()
+
+    return written
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render an example animation to a video file off screen")
+    parser.add_argument('animation', choices=sorted(ANIMATIONS))
+    parser.add_argument('output')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--size', nargs=2, type=int, default=[800, 600])
+    parser.add_argument('--backend', default='egl', choices=RENDER_BACKENDS)
+    parser.add_argument('--workers', type=int, default=None, help="defaults to the number of cores")
+    parser.add_argument('--chunk-frames', type=int, default=16)
+    parser.add_argument('--fourcc', default='mp4v')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return render_video(args.output,
+                        ANIMATIONS[args.animation],
+                        args.frames,
+                        fps=args.fps,
+                        screen_size=args.size,
+                        backend=args.backend,
+                        workers=args.workers,
+                        chunk_frames=args.chunk_frames,
+                        fourcc=args.fourcc)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+import numpy as np
+from solids.Baking import static_solids
+from solids.Culling import perspective_matrix
+from solids.Geometry import QUADS
+from solids.GeometryQueue import GeometryQueue
+from solids.Solids import Solids
+
+
+class SceneGeometry:
+    def __init__(self, triangles, triangle_colors, lines):
+        self.triangles = triangles
+        self.triangle_colors = triangle_colors
+        self.lines = lines
+
+    def __len__(self):
+        return self.triangles.shape[0]
+
+
+def scene_geometry(scene, mode=None):
+    '''
+        World-space triangles (T, 3, 3) with one color each and edge lines (L, 2, 3)
+        of a scene: a Solids, a SolidsGroup, or a list of those and of objects with
+        a submit(queue, mode) method like MasterPart. Quads are split along their
+        0-2 diagonal.
+    '''
+    queue = GeometryQueue()
+    for item in (scene if isinstance(scene, (list, tuple)) else [scene]):
+        if isinstance(item, Solids):
+            for solid in static_solids([item]):
+                queue.submit(solid, mode)
+        else:
+            item.submit(queue, mode)
+    if queue.deferred:
+        raise ValueError("only solids drawn from a mesh can be rasterized, got %s"
+                         % type(queue.deferred[0][0]).__name__)
+
+    edges, surfaces = queue.geometry()
+    triangles = []
+    triangle_colors = []
+    for primitive, color, vertices, vertex_colors in surfaces:
+        corners = 4 if primitive == QUADS else 3
+        polygons = vertices.reshape(-1, corners, 3)
+        # faces are flat shaded, so the first vertex's color stands for the whole face
+        colors = np.broadcast_to(np.asarray(color if color is not None else vertex_colors[::corners]),
+                                 (polygons.shape[0], 3))
+        if corners == 4:
+            polygons = np.concatenate((polygons[:, [0, 1, 2]], polygons[:, [0, 2, 3]]))
+            colors = np.concatenate((colors, colors))
+        triangles.append(polygons)
+        triangle_colors.append(colors)
+
+    return SceneGeometry(np.concatenate(triangles) if triangles else np.zeros((0, 3, 3)),
+                         np.concatenate(triangle_colors) if triangle_colors else np.zeros((0, 3)),
+                         edges.reshape(-1, 2, 3))
+
+
+def unorm8(colors):
+    # the float to 8-bit conversion GL applies to colors
+    return np.round(np.clip(colors, 0, 1) * 255).astype(np.dtype('uint8'))
+
+
+class Rasterizer:
+    def __init__(self,
+                 size=(160, 120),
+                 fovy=50,
+                 near=0.1,
+                 far=50.0,
+                 background=(0, 0, 0),
+                 edges=True,
+                 edge_color=(0, 0, 0),
+                 edge_depth_bias=1e-6):
+
+        '''
+            A CPU stand-in for the examples' GL setup: gluPerspective(fovy, width /
+            height, near, far) with the depth test on, flat-colored faces and, when
+            edges is True, one-pixel edge lines that win over coplanar faces.
+            Images come back as uint8 RGB and float32 window depth (1.0 where
+            nothing was drawn), with row 0 at the top.
+        '''
+        self.size = size
+        self.projection = perspective_matrix(fovy, size[0] / size[1], near, far)
+        self.background = unorm8(np.asarray(background, np.dtype('float64')))
+        self.edges = edges
+        self.edge_color = unorm8(np.asarray(edge_color, np.dtype('float64')))
+        self.edge_depth_bias = edge_depth_bias
+
+    def render(self, scene, modelview=None, mode=None):
+        modelview = np.eye(4) if modelview is None else np.asarray(modelview, np.dtype('float64'))
+        images, depths = self.render_views(scene, modelview[np.newaxis], mode)
+        return images[0], depths[0]
+
+    def render_views(self, scene, modelviews, mode=None):
+        geometry = scene if isinstance(scene, SceneGeometry) else scene_geometry(scene, mode)
+        return self.rasterize(geometry, modelviews)
+
+    def _window(self, points, modelviews):
+        # (V, N, 3) window coordinates of (N, 3) world points, and which of them are in front of the camera
+        clip_matrices = np.matmul(self.projection, modelviews)
+        clip = np.einsum('vij,nj->vni', clip_matrices[:, :, :3], points) + clip_matrices[:, np.newaxis, :, 3]
+        w = clip[..., 3]
+        in_front = clip[..., 2] >= -w
+        ndc = clip[..., :3] / np.where(in_front, w, 1)[..., np.newaxis]
+        window = np.empty(ndc.shape)
+        window[..., 0] = (ndc[..., 0] + 1) / 2 * self.size[0]
+        window[..., 1] = (ndc[..., 1] + 1) / 2 * self.size[1]
+        window[..., 2] = (ndc[..., 2] + 1) / 2
+        return window, in_front
+
+    def _triangle_fragments(self, geometry, modelviews):
+        width, height = self.size
+        views = modelviews.shape[0]
+        window, in_front = self._window(geometry.triangles.reshape(-1, 3), modelviews)
+        window = window.reshape(views, -1, 3, 3)
+        in_front = in_front.reshape(views, -1, 3).all(axis=2)
+
+        x, y, z = window[..., 0], window[..., 1], window[..., 2]
+        area = (x[..., 1] - x[..., 0]) * (y[..., 2] - y[..., 0]) - (x[..., 2] - x[..., 0]) * (y[..., 1] - y[..., 0])
+
+        # pixel centers (i + 0.5, j + 0.5) inside each triangle's bounding box, clipped to the image
+        x_start = np.maximum(np.ceil(x.min(axis=2) - 0.5), 0).astype(np.dtype('int64'))
+        x_stop = np.minimum(np.floor(x.max(axis=2) - 0.5), width - 1).astype(np.dtype('int64'))
+        y_start = np.maximum(np.ceil(y.min(axis=2) - 0.5), 0).astype(np.dtype('int64'))
+        y_stop = np.minimum(np.floor(y.max(axis=2) - 0.5), height - 1).astype(np.dtype('int64'))
+        box_width = np.maximum(x_stop - x_start + 1, 0)
+        box_height = np.maximum(y_stop - y_start + 1, 0)
+        # triangles that are degenerate or cross the near plane are dropped, not clipped
+        counts = np.where(in_front & (area != 0), box_width * box_height, 0)
+
+        view_index, triangle_index = np.nonzero(counts)
+        counts = counts[view_index, triangle_index]
+        if counts.size == 0:
+            return np.zeros(0, np.dtype('int64')), np.zeros(0), np.zeros((0, 3), np.dtype('uint8'))
+
+        # every (triangle, candidate pixel) pair at once; local is the pixel's position inside its box
+        owner = np.repeat(np.arange(counts.size), counts)
+        local = np.arange(owner.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        views_of = view_index[owner]
+        triangles_of = triangle_index[owner]
+        columns = x_start[views_of, triangles_of] + local % box_width[views_of, triangles_of]
+        rows = y_start[views_of, triangles_of] + local // box_width[views_of, triangles_of]
+
+        px = columns + 0.5
+        py = rows + 0.5
+        tx = x[views_of, triangles_of]
+        ty = y[views_of, triangles_of]
+        weights = np.empty((owner.size, 3))
+        for corner in range(3):
+            a = (corner + 1) % 3
+            b = (corner + 2) % 3
+            weights[:, corner] = (tx[:, b] - tx[:, a]) * (py - ty[:, a]) - (ty[:, b] - ty[:, a]) * (px - tx[:, a])
+        weights /= area[views_of, triangles_of][:, np.newaxis]
+
+        inside = (weights >= 0).all(axis=1)
+        depth = (weights * z[views_of, triangles_of]).sum(axis=1)
+        inside &= (depth >= 0) & (depth <= 1)
+
+        keys = (views_of * height + rows) * width + columns
+        colors = unorm8(geometry.triangle_colors)[triangles_of]
+        return keys[inside], depth[inside], colors[inside]
+
+    def _line_fragments(self, geometry, modelviews):
+        width, height = self.size
+        views = modelviews.shape[0]
+        window, in_front = self._window(geometry.lines.reshape(-1, 3), modelviews)
+        window = window.reshape(views, -1, 2, 3)
+        in_front = in_front.reshape(views, -1, 2).all(axis=2)
+
+        start = window[..., 0, :]
+        delta = window[..., 1, :] - start
+        # like GL's diamond-exit rule: one pixel per pixel center crossed along the major axis
+        major = (np.abs(delta[..., 1]) > np.abs(delta[..., 0])).astype(np.dtype('int64'))
+        major_start = np.take_along_axis(start, major[..., np.newaxis], axis=2)[..., 0]
+        major_delta = np.take_along_axis(delta, major[..., np.newaxis], axis=2)[..., 0]
+        low = np.minimum(major_start, major_start + major_delta)
+        first = np.ceil(low - 0.5).astype(np.dtype('int64'))
+        counts = np.ceil(low + np.abs(major_delta) - 0.5).astype(np.dtype('int64')) - first
+        counts = np.where(in_front & (major_delta != 0), np.maximum(counts, 0), 0)
+
+        view_index, line_index = np.nonzero(counts)
+        counts = counts[view_index, line_index]
+        if counts.size == 0:
+            return np.zeros(0, np.dtype('int64')), np.zeros(0)
+
+        owner = np.repeat(np.arange(counts.size), counts)
+        step = np.arange(owner.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        views_of = view_index[owner]
+        lines_of = line_index[owner]
+        centers = first[views_of, lines_of] + step + 0.5
+        t = (centers - major_start[views_of, lines_of]) / major_delta[views_of, lines_of]
+        points = start[views_of, lines_of] + t[:, np.newaxis] * delta[views_of, lines_of]
+
+        y_major = major[views_of, lines_of] == 1
+        columns = np.where(y_major, np.floor(points[:, 0]), np.floor(centers)).astype(np.dtype('int64'))
+        rows = np.where(y_major, np.floor(centers), np.floor(points[:, 1])).astype(np.dtype('int64'))
+        depth = points[:, 2] - self.edge_depth_bias
+        inside = (columns >= 0) & (columns < width) & (rows >= 0) & (rows < height) & (depth >= 0) & (depth <= 1)
+
+        keys = (views_of * height + rows) * width + columns
+        return keys[inside], depth[inside]
+
+    def rasterize(self, geometry, modelviews):
+        width, height = self.size
+        modelviews = np.asarray(modelviews, np.dtype('float64')).reshape(-1, 4, 4)
+        views = modelviews.shape[0]
+
+        keys, depth, colors = self._triangle_fragments(geometry, modelviews)
+        if self.edges and geometry.lines.shape[0]:
+            line_keys, line_depth = self._line_fragments(geometry, modelviews)
+            keys = np.concatenate((keys, line_keys))
+            depth = np.concatenate((depth, line_depth))
+            colors = np.concatenate((colors, np.broadcast_to(self.edge_color, (line_keys.size, 3))))
+
+        # z-buffer: the nearest fragment of every pixel, for all views in one sort
+        order = np.lexsort((depth, keys))
+        sorted_keys = keys[order]
+        nearest = order[np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))] if order.size else order
+
+        images = np.empty((views * height * width, 3), np.dtype('uint8'))
+        images[:] = self.background
+        depths = np.ones(views * height * width, np.dtype('float32'))
+        images[keys[nearest]] = colors[nearest]
+        depths[keys[nearest]] = depth[nearest]
+
+        # GL counts rows from the bottom, images from the top
+        return (images.reshape(views, height, width, 3)[:, ::-1],
+                depths.reshape(views, height, width)[:, ::-1])
@@ -0,0 +1,114 @@
+import numpy as np
+from solids.GeometryQueue import GeometryQueue
+from solids.Transforms import gl_matrix
+from solids import Tracing
+
+EDGE_COLOR = (0.0, 0.0, 0.0)
+
+
+class GLStateCache:
+    def __init__(self):
+        self.issued = 0
+        self.skipped = 0
+        self.reset()
+
+    def reset(self):
+        # None means unknown: the next call always reaches GL
+        self._color = None
+        self._matrix_mode = None
+
+    def invalidate_color(self):
+        self._color = None
+
+    def color(self, value):
+        value = tuple(float(component) for component in value)
+        if value == self._color:
+            self.skipped += 1
+            return
+        from OpenGL.GL import glColor3fv
+        glColor3fv(value)
+        self._color = value
+        self.issued += 1
+
+    def matrix_mode(self, mode):
+        if mode == self._matrix_mode:
+            self.skipped += 1
+            return
+        from OpenGL.GL import glMatrixMode
+        glMatrixMode(mode)
+        self._matrix_mode = mode
+        self.issued += 1
+
+
+class RenderQueue(GeometryQueue):
+    def __init__(self, state=None):
+        super().__init__()
+        self.state = state if state is not None else GLStateCache()
+        self.draw_calls = 0
+
+    def flush(self):
+        if Tracing.tracer is None:
+            self._flush()
+        else:
+            with Tracing.tracer.span("RenderQueue.flush", "draw", solids=len(self)):
+                self._flush()
+
+    def _flush(self):
+        from OpenGL.GL import (glEnableClientState, glVertexPointer, glDrawArrays, glColorPointer, glDisableClientState,
+                               glPushMatrix, glMultMatrixf, glPopMatrix, GL_VERTEX_ARRAY, GL_FLOAT, GL_LINES,
+                               GL_COLOR_ARRAY, GL_MODELVIEW)
+        self.state.reset()
+        self.draw_calls = 0
+        edges, surfaces = self.geometry()
+
+        if edges.shape[0] or surfaces:
+            vertices = np.ascontiguousarray(np.vstack([edges] + [run[2] for run in surfaces]), np.dtype('float32'))
+            vertex_colors = None
+            if any(color is None for _, color, _, _ in surfaces):
+                vertex_colors = np.zeros_like(vertices)
+
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glVertexPointer(3, GL_FLOAT, 0, vertices)
+            if edges.shape[0]:
+                self.state.color(EDGE_COLOR)
+                glDrawArrays(GL_LINES, 0, edges.shape[0])
+                self.draw_calls += 1
+
+            first = edges.shape[0]
+            for primitive, color, run_vertices, run_colors in surfaces:
+                count = run_vertices.shape[0]
+                if color is None:
+                    vertex_colors[first:first + count] = run_colors
+                    glEnableClientState(GL_COLOR_ARRAY)
+                    glColorPointer(3, GL_FLOAT, 0, vertex_colors)
+                    glDrawArrays(primitive, first, count)
+                    glDisableClientState(GL_COLOR_ARRAY)
+                    # the current color is undefined after drawing with a color array
+                    self.state.invalidate_color()
+                else:
+                    self.state.color(color)
+                    glDrawArrays(primitive, first, count)
+                self.draw_calls += 1
+                first += count
+            glDisableClientState(GL_VERTEX_ARRAY)
+
+        for _, solids_list, _ in self._meshes.values():
+            for solid in solids_list:
+                solid.dirty = False
+        for array, _, _ in self._arrays:
+            array.dirty = False
+
+        if self._deferred:
+            self.state.matrix_mode(GL_MODELVIEW)
+            for solid, mode, matrix in self._deferred:
+                if matrix is None:
+                    solid.draw(mode)
+                else:
+                    glPushMatrix()
+                    glMultMatrixf(gl_matrix(matrix))
+                    solid.draw(mode)
+                    glPopMatrix()
+                self.draw_calls += 1
+            self.state.invalidate_color()
+
+        self.clear()
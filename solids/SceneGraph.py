@@ -0,0 +1,196 @@
+import numpy as np
+from solids.Transforms import gl_matrix, model_matrices
+
+
+class SceneNode:
+    def __init__(self,
+                 solids_list=None,
+                 parent=None,
+                 origin=(0, 0, 0),
+                 axis=(0, 1, 0),
+                 theta=None,
+                 theta_degree=None,
+                 phi=None,
+                 phi_degree=None,
+                 mode=None):
+
+        self.solids_list = list(solids_list) if solids_list is not None else []
+        self.level_of_detail = None
+        self.children = []
+        self._parent = None
+
+        self._origin = np.asarray(origin, np.dtype('float64'))
+        self._axis = np.asarray(axis, np.dtype('float64'))
+        self._theta = 0
+        self._phi = 0
+        self._mode = mode
+
+        self._local_matrix = None
+        self._world_matrix = None
+        self._gl_world_matrix = None
+        # a stale node always has a stale subtree, so invalidation can stop at the first stale node
+        self._world_stale = True
+        self.world_updates = 0
+
+        if theta is not None and theta_degree is None:
+            self.theta = theta
+        elif theta is None and theta_degree is not None:
+            self.theta_degree = theta_degree
+
+        if phi is not None and phi_degree is None:
+            self.phi = phi
+        elif phi is None and phi_degree is not None:
+            self.phi_degree = phi_degree
+
+        if parent is not None:
+            parent.add_child(self)
+
+    def add_child(self, node):
+        if node._parent is not None:
+            node._parent.remove_child(node)
+        node._parent = self
+        self.children.append(node)
+        node._invalidate_world()
+        return node
+
+    def remove_child(self, node):
+        self.children.remove(node)
+        node._parent = None
+        node._invalidate_world()
+
+    @property
+    def parent(self):
+        return self._parent
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def _invalidate_local(self):
+        self._local_matrix = None
+        self._invalidate_world()
+
+    def _invalidate_world(self):
+        if self._world_stale:
+            return
+        self._world_stale = True
+        for child in self.children:
+            child._invalidate_world()
+
+    def local_matrix(self):
+        if self._local_matrix is None:
+            self._local_matrix = model_matrices(origin=self._origin,
+                                                axis=self._axis,
+                                                theta=self._theta,
+                                                phi=self._phi,
+                                                mode=self._mode)
+        return self._local_matrix
+
+    def world_matrix(self):
+        if self._world_stale:
+            if self._parent is None:
+                self._world_matrix = self.local_matrix()
+            else:
+                self._world_matrix = np.matmul(self._parent.world_matrix(), self.local_matrix())
+            self._gl_world_matrix = None
+            self._world_stale = False
+            self.world_updates += 1
+        return self._world_matrix
+
+    def gl_world_matrix(self):
+        matrix = self.world_matrix()
+        if self._gl_world_matrix is None:
+            self._gl_world_matrix = gl_matrix(matrix)
+        return self._gl_world_matrix
+
+    @property
+    def world_origin(self):
+        return self.world_matrix()[:3, 3]
+
+    def draw(self, mode=None):
+        from OpenGL.GL import glPushMatrix, glMultMatrixf, glPopMatrix
+        for node in self.walk():
+            if node.solids_list:
+                glPushMatrix()
+                glMultMatrixf(node.gl_world_matrix())
+                if node.level_of_detail is not None:
+                    node.level_of_detail.update(node.solids_list, mode)
+                for solid in node.solids_list:
+                    solid.draw(mode)
+                glPopMatrix()
+
+    def submit(self, queue, mode=None):
+        for node in self.walk():
+            if node.solids_list:
+                if node.level_of_detail is not None:
+                    # level of detail reads the modelview, which has to include the node for that
+                    from OpenGL.GL import glPushMatrix, glMultMatrixf, glPopMatrix
+                    glPushMatrix()
+                    glMultMatrixf(node.gl_world_matrix())
+                    node.level_of_detail.update(node.solids_list, mode)
+                    glPopMatrix()
+                for solid in node.solids_list:
+                    queue.submit(solid, mode, node.world_matrix())
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, value):
+        if value != self._mode:
+            self._mode = value
+            self._invalidate_local()
+
+    @property
+    def origin(self):
+        return self._origin
+
+    @origin.setter
+    def origin(self, value):
+        self._origin = np.asarray(value, np.dtype('float64'))
+        self._invalidate_local()
+
+    @property
+    def axis(self):
+        return self._axis
+
+    @axis.setter
+    def axis(self, value):
+        self._axis = np.asarray(value, np.dtype('float64'))
+        self._invalidate_local()
+
+    @property
+    def theta(self):
+        return self._theta
+
+    @theta.setter
+    def theta(self, value):
+        self._theta = value
+        self._invalidate_local()
+
+    @property
+    def theta_degree(self):
+        return 180 * (self._theta / np.pi)
+
+    @theta_degree.setter
+    def theta_degree(self, value):
+        self.theta = np.pi * (value / 180)
+
+    @property
+    def phi(self):
+        return self._phi
+
+    @phi.setter
+    def phi(self, value):
+        self._phi = value
+        self._invalidate_local()
+
+    @property
+    def phi_degree(self):
+        return 180 * (self._phi / np.pi)
+
+    @phi_degree.setter
+    def phi_degree(self, value):
+        self.phi = np.pi * (value / 180)
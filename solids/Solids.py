@@ -1,5 +1,13 @@
 import numpy as np
-from OpenGL.GL import *
+from solids.Geometry import Mesh, geometry_cache, mesh_key, prism_geometry
+from solids.Instancing import build_instance_batches
+from solids.Culling import Culler
+from solids.LevelOfDetail import LevelOfDetail
+from solids.Transforms import gl_matrix, model_matrices, solids_model_matrices
+from solids import Tracing
+
+RENDER_MODES = ("immediate", "buffered")
+GROUP_RENDER_MODES = RENDER_MODES + ("instanced",)
 
 
 class Solids:
@@ -22,37 +30,23 @@ class Solids:
                  phi_degree=None,
                  phi_degree_offset=None,
                  size=None,
-                 size_offset=None):
+                 size_offset=None,
+                 render_mode=None,
+                 mesh=None):
 
-        self._origin = np.asarray(origin, np.dtype('float64'))
-        self._origin_offset = np.asarray(origin_offset, np.dtype('float64'))
-        self._axis = np.asarray(axis, np.dtype('float64'))
-        self._axis_offset = np.asarray(axis_offset, np.dtype('float64'))
+        if mesh is None and vertices is not None:
+            mesh = Mesh(vertices, edges, surfaces)
 
-        self.origin_vertices = vertices
-        self.vertices = vertices
-        if vertices is not None:
-            for i, vertex in enumerate(self.origin_vertices):
-                self.vertices[i][:] = [vertex[0] + self._origin_offset[0],
-                                       vertex[1] + self._origin_offset[1],
-                                       vertex[2] + self._origin_offset[2]]
-
-        self.edges = edges
-        self.surface = surfaces
-
-        self.color = np.asarray(color)
-        self.color_offset = np.asarray(color_offset)
-        self.size = size
-        self.size_offset = size_offset
-
-        self._theta = 0
-        self._theta_offset = 0
-        self._theta_degree = 0
-        self._theta_degree_offset = 0
-        self._phi = 0
-        self._phi_offset = 0
-        self._phi_degree = 0
-        self._phi_degree_offset = 0
+        self._init_state(mesh=mesh,
+                         color=color,
+                         color_offset=color_offset,
+                         origin=origin,
+                         origin_offset=origin_offset,
+                         axis=axis,
+                         axis_offset=axis_offset,
+                         size=size,
+                         size_offset=size_offset)
+        self.render_mode = render_mode
 
         if theta is not None and theta_degree is None:
             self.theta = theta
@@ -74,40 +68,165 @@ class Solids:
         elif phi is None and phi_degree is not None:
             self.phi_degree_offset = phi_degree_offset
 
+    def _init_state(self,
+                    mesh=None,
+                    color=None,
+                    color_offset=(0, 0, 0),
+                    origin=(0, 0, 0),
+                    origin_offset=(0, 0, 0),
+                    axis=(0, 1, 0),
+                    axis_offset=(0, 1, 0),
+                    theta=0,
+                    theta_degree=0,
+                    phi=0,
+                    phi_degree=0,
+                    size=None,
+                    size_offset=None,
+                    render_mode="immediate",
+                    model_matrix=None,
+                    model_matrix_mode=None):
+
+        '''
+            Every attribute a solid carries, set directly without the setters. __init__
+            and solids.Bulk.build_solids both start here; angles are taken as already
+            wrapped, and model_matrix may seed the cache for model_matrix_mode.
+        '''
+        self._model_matrix = model_matrix
+        self._model_matrix_mode = model_matrix_mode
+        self._gl_model_matrix = None
+        self._version = 0
+        self.dirty = True
+
+        self._origin = np.asarray(origin, np.dtype('float64'))
+        self._origin_offset = np.asarray(origin_offset, np.dtype('float64'))
+        self._axis = np.asarray(axis, np.dtype('float64'))
+        self._axis_offset = np.asarray(axis_offset, np.dtype('float64'))
+
+        self.mesh = mesh
+        self.origin_vertices = mesh.vertices if mesh is not None else None
+        self.edges = mesh.edges if mesh is not None else None
+        self.surface = mesh.surfaces if mesh is not None else None
+
+        self._color = np.asarray(color)
+        self._color_offset = np.asarray(color_offset)
+        self.size = size
+        self.size_offset = size_offset
+
+        self._theta = theta
+        self._theta_offset = 0
+        self._theta_degree = theta_degree
+        self._theta_degree_offset = 0
+        self._phi = phi
+        self._phi_offset = 0
+        self._phi_degree = phi_degree
+        self._phi_degree_offset = 0
+
+        self._render_mode = render_mode
+
     def draw(self, mode=None):
-        glPushMatrix()
+        if Tracing.tracer is None:
+            self._draw(mode)
+        else:
+            with Tracing.tracer.span(type(self).__name__ + ".draw", "draw", solid=type(self).__name__):
+                self._draw(mode)
+        self.dirty = False
 
-        self._translate()
-        self._rotate(mode)
+    def _draw(self, mode=None):
+        from OpenGL.GL import glPushMatrix, glMultMatrixf, glPopMatrix
+        glPushMatrix()
 
-        if self.vertices is not None and self.edges is not None:
-            self._draw_edges()
-            if self.surface is not None:
-                self._draw_surfaces()
+        if self._render_mode == "buffered":
+            glMultMatrixf(self.gl_model_matrix(mode))
+            if self.origin_vertices is not None and self.edges is not None:
+                self._draw_buffered()
+        else:
+            self._translate()
+            self._rotate(mode)
+            if self.origin_vertices is not None and self.edges is not None:
+                self._translate_offset()
+                if len(self.edges):
+                    self._draw_edges()
+                if self.surface is not None:
+                    self._draw_surfaces()
         glPopMatrix()
 
+    def _invalidate(self):
+        self._model_matrix = None
+        self._version += 1
+        self.dirty = True
+
+    @property
+    def state_version(self):
+        # grows with every change through a setter, unlike dirty, which drawing clears
+        return self._version
+
+    def set_mesh(self, mesh):
+        self.mesh = mesh
+        self.origin_vertices = mesh.vertices
+        self.edges = mesh.edges
+        self.surface = mesh.surfaces
+        self.dirty = True
+
+    def model_matrix(self, mode=None):
+        if self._model_matrix is None or self._model_matrix_mode != mode:
+            self._model_matrix = self._compute_model_matrix(mode)
+            self._model_matrix.setflags(write=False)
+            self._model_matrix_mode = mode
+            self._gl_model_matrix = None
+        return self._model_matrix
+
+    def gl_model_matrix(self, mode=None):
+        matrix = self.model_matrix(mode)
+        if self._gl_model_matrix is None:
+            self._gl_model_matrix = gl_matrix(matrix)
+        return self._gl_model_matrix
+
+    def _compute_model_matrix(self, mode=None):
+        return model_matrices(origin=self._origin,
+                              origin_offset=self._origin_offset,
+                              axis=self._axis,
+                              axis_offset=self._axis_offset,
+                              theta=np.pi * (self._theta_degree / 180),
+                              theta_offset=np.pi * (self._theta_degree_offset / 180),
+                              phi=np.pi * (self._phi_degree / 180),
+                              phi_offset=np.pi * (self._phi_degree_offset / 180),
+                              mode=mode)
+
     def _draw_edges(self):
+        from OpenGL.GL import glColor3fv, glBegin, glVertex3fv, glEnd, GL_LINES
+        # the color is constant per pass, so it is set once instead of before every vertex
+        if self.color is not None:
+            glColor3fv((0, 0, 0))
         glBegin(GL_LINES)
         for edge in self.edges:
             for vertex in edge:
-                if self.color is not None:
-                    glColor3fv((0, 0, 0))
-                glVertex3fv(self.vertices[vertex])
+                glVertex3fv(self.origin_vertices[vertex])
         glEnd()
 
     def _draw_surfaces(self):
+        from OpenGL.GL import glColor3fv, glBegin, glVertex3fv, glEnd, GL_QUADS
+        if self.color is not None:
+            glColor3fv(self.color + self.color_offset)
         glBegin(GL_QUADS)
         for surface in self.surface:
             for vertex in surface:
-                if self.color is not None:
-                    glColor3fv(self.color + self.color_offset)
-                glVertex3fv(self.vertices[vertex])
+                glVertex3fv(self.origin_vertices[vertex])
         glEnd()
 
+    def _draw_buffered(self):
+        self.mesh.buffer.draw(self.color + self.color_offset)
+
     def _translate(self):
+        from OpenGL.GL import glTranslatef
         glTranslatef(self._origin[0], self._origin[1], self._origin[2])
 
+    def _translate_offset(self):
+        from OpenGL.GL import glTranslatef
+        if self._origin_offset.any():
+            glTranslatef(self._origin_offset[0], self._origin_offset[1], self._origin_offset[2])
+
     def _rotate(self, mode=None):
+        from OpenGL.GL import glRotatef
         if mode == "spherical":
             glRotatef(self._theta_degree + self._theta_degree_offset, 0, 1, 0)
             glRotatef(self._phi_degree + self._phi_degree_offset, 0, 0, 1)
@@ -117,6 +236,18 @@ class Solids:
                       self._axis[1] + self._axis_offset[1],
                       self._axis[2] + self._axis_offset[2])
 
+    @property
+    def render_mode(self):
+        return self._render_mode
+
+    @render_mode.setter
+    def render_mode(self, value):
+        if value is None:
+            value = "immediate"
+        if value not in RENDER_MODES:
+            raise ValueError("render_mode must be one of %s, got %r" % (RENDER_MODES, value))
+        self._render_mode = value
+
     @property
     def color(self):
         return self._color
@@ -124,6 +255,7 @@ class Solids:
     @color.setter
     def color(self, value):
         self._color = np.asarray(value)
+        self._invalidate()
 
     @property
     def color_offset(self):
@@ -132,6 +264,7 @@ class Solids:
     @color_offset.setter
     def color_offset(self, value):
         self._color_offset = np.asarray(value)
+        self._invalidate()
 
     @property
     def origin(self):
@@ -140,6 +273,26 @@ class Solids:
     @origin.setter
     def origin(self, value):
         self._origin = np.asarray(np.asarray(value, np.dtype('float64')))
+        self._invalidate()
+
+    @property
+    def vertices(self):
+        if self.origin_vertices is None:
+            return None
+        # a fresh array every read, so it is read-only: writing to it would be silently lost
+        vertices = self.origin_vertices + self._origin_offset
+        vertices.setflags(write=False)
+        return vertices
+
+    @vertices.setter
+    def vertices(self, value):
+        # the mesh may be shared with other solids, so new vertices get a mesh of their own
+        mesh = self.mesh
+        self.set_mesh(Mesh(np.asarray(value, np.dtype('float64')) - self._origin_offset,
+                           mesh.edges if mesh is not None else None,
+                           mesh.surfaces if mesh is not None else None,
+                           mesh.colors if mesh is not None else None))
+        self._invalidate()
 
     @property
     def origin_offset(self):
@@ -148,10 +301,7 @@ class Solids:
     @origin_offset.setter
     def origin_offset(self, value):
         self._origin_offset = np.asarray(value, np.dtype('float64'))
-        for i, vertex in enumerate(self.origin_vertices):
-            self.vertices[i][:] = [vertex[0]+self._origin_offset[0],
-                                   vertex[1]+self._origin_offset[1],
-                                   vertex[2]+self._origin_offset[2]]
+        self._invalidate()
 
     @property
     def axis(self):
@@ -160,6 +310,7 @@ class Solids:
     @axis.setter
     def axis(self, value):
         self._axis = np.asarray(value, np.dtype('float64'))
+        self._invalidate()
 
     @property
     def axis_offset(self):
@@ -168,6 +319,7 @@ class Solids:
     @axis_offset.setter
     def axis_offset(self, value):
         self._axis_offset = np.asarray(value, np.dtype('float64'))
+        self._invalidate()
 
     @property
     def theta(self):
@@ -181,6 +333,7 @@ class Solids:
         elif self._theta > 2*np.pi:
             self._theta -= 2*np.pi
         self._theta_degree = 180 * (value / np.pi)
+        self._invalidate()
 
     @property
     def theta_offset(self):
@@ -194,6 +347,7 @@ class Solids:
         elif self._theta_offset > 2*np.pi:
             self._theta_offset -= 2*np.pi
         self._theta_degree_offset = 180 * (value / np.pi)
+        self._invalidate()
 
     @property
     def theta_degree(self):
@@ -207,6 +361,7 @@ class Solids:
         elif self._theta_degree > 360:
             self._theta_degree -= 360
         self._theta = np.pi * (value / 180)
+        self._invalidate()
 
     @property
     def theta_degree_offset(self):
@@ -220,6 +375,7 @@ class Solids:
         elif self._theta_degree_offset > 360:
             self._theta_degree_offset -= 360
         self._theta_offset = np.pi * (value / 180)
+        self._invalidate()
 
     @property
     def phi(self):
@@ -233,6 +389,7 @@ class Solids:
         elif self._phi > 2 * np.pi:
             self._phi -= 2 * np.pi
         self._phi_degree = 180 * (value / np.pi)
+        self._invalidate()
 
     @property
     def phi_offset(self):
@@ -246,6 +403,7 @@ class Solids:
         elif self._phi_offset > 2 * np.pi:
             self._phi_offset -= 2 * np.pi
         self._phi_degree_offset = 180 * (value / np.pi)
+        self._invalidate()
 
     @property
     def phi_degree(self):
@@ -259,6 +417,7 @@ class Solids:
         elif self._phi_degree > 360:
             self._phi_degree -= 360
         self._phi = np.pi * (value / 180)
+        self._invalidate()
 
     @property
     def phi_degree_offset(self):
@@ -272,6 +431,7 @@ class Solids:
         elif self._phi_degree_offset > 360:
             self._phi_degree_offset -= 360
         self._phi_offset = np.pi * (value / 180)
+        self._invalidate()
 
 
 class Pyramid(Solids):
@@ -291,8 +451,33 @@ class Pyramid(Solids):
                  phi_degree=None,
                  phi_degree_offset=None,
                  size=(0.5, 0.3, 0.5),
-                 size_offset=(0, 0, 0)):  # size = (x, y, z)
+                 size_offset=(0, 0, 0),  # size = (x, y, z)
+                 render_mode=None):
+
+        mesh = geometry_cache.get(mesh_key(Pyramid, size, size_offset),
+                                  lambda: Pyramid.build_mesh(size, size_offset))
 
+        super().__init__(mesh=mesh,
+                         color=color,
+                         color_offset=color_offset,
+                         origin=origin,
+                         origin_offset=origin_offset,
+                         axis=axis,
+                         axis_offset=axis_offset,
+                         theta=theta,
+                         theta_offset=theta_offset,
+                         theta_degree=theta_degree,
+                         theta_degree_offset=theta_degree_offset,
+                         phi=phi,
+                         phi_offset=phi_offset,
+                         phi_degree=phi_degree,
+                         phi_degree_offset=phi_degree_offset,
+                         size=size,
+                         size_offset=size_offset,
+                         render_mode=render_mode)
+
+    @staticmethod
+    def build_mesh(size, size_offset):
         vertices = np.array([[-size[0]/2+size_offset[0], -size[1]/2+size_offset[1], +size[2]/2+size_offset[2]],  # 0
                              [-size[0]/2+size_offset[0], -size[1]/2+size_offset[1], -size[2]/2+size_offset[2]],  # 1
                              [+size[0]/2+size_offset[0], -size[1]/2+size_offset[1], -size[2]/2+size_offset[2]],  # 2
@@ -334,25 +519,7 @@ class Pyramid(Solids):
                     (2, 1, 4, 5),
                     (0, 1, 2, 3))
 
-        super().__init__(vertices=vertices,
-                         edges=edges,
-                         surfaces=surfaces,
-                         color=color,
-                         color_offset=color_offset,
-                         origin=origin,
-                         origin_offset=origin_offset,
-                         axis=axis,
-                         axis_offset=axis_offset,
-                         theta=theta,
-                         theta_offset=theta_offset,
-                         theta_degree=theta_degree,
-                         theta_degree_offset=theta_degree_offset,
-                         phi=phi,
-                         phi_offset=phi_offset,
-                         phi_degree=phi_degree,
-                         phi_degree_offset=phi_degree_offset,
-                         size=size,
-                         size_offset=size_offset)
+        return vertices, edges, surfaces
 
 
 class Cube(Solids):
@@ -372,8 +539,33 @@ class Cube(Solids):
                  phi_degree=None,
                  phi_degree_offset=None,
                  size=0.6,
-                 size_offset=0):
+                 size_offset=0,
+                 render_mode=None):
 
+        mesh = geometry_cache.get(mesh_key(Cube, size, size_offset),
+                                  lambda: Cube.build_mesh(size, size_offset))
+
+        super().__init__(mesh=mesh,
+                         color=color,
+                         color_offset=color_offset,
+                         origin=origin,
+                         origin_offset=origin_offset,
+                         axis=axis,
+                         axis_offset=axis_offset,
+                         theta=theta,
+                         theta_offset=theta_offset,
+                         theta_degree=theta_degree,
+                         theta_degree_offset=theta_degree_offset,
+                         phi=phi,
+                         phi_offset=phi_offset,
+                         phi_degree=phi_degree,
+                         phi_degree_offset=phi_degree_offset,
+                         size=size,
+                         size_offset=size_offset,
+                         render_mode=render_mode)
+
+    @staticmethod
+    def build_mesh(size, size_offset):
         vertices = np.array([[-size/2+size_offset, -size/2+size_offset, +size/2+size_offset],
                              [-size/2+size_offset, +size/2+size_offset, +size/2+size_offset],
                              [+size/2+size_offset, +size/2+size_offset, +size/2+size_offset],
@@ -417,25 +609,7 @@ class Cube(Solids):
                     (1, 5, 6, 2),
                     (4, 0, 3, 7))
 
-        super().__init__(vertices=vertices,
-                         edges=edges,
-                         surfaces=surfaces,
-                         color=color,
-                         color_offset=color_offset,
-                         origin=origin,
-                         origin_offset=origin_offset,
-                         axis=axis,
-                         axis_offset=axis_offset,
-                         theta=theta,
-                         theta_offset=theta_offset,
-                         theta_degree=theta_degree,
-                         theta_degree_offset=theta_degree_offset,
-                         phi=phi,
-                         phi_offset=phi_offset,
-                         phi_degree=phi_degree,
-                         phi_degree_offset=phi_degree_offset,
-                         size=size,
-                         size_offset=size_offset)
+        return vertices, edges, surfaces
 
 
 class Parallelepiped(Solids):
@@ -456,8 +630,33 @@ class Parallelepiped(Solids):
                  phi_degree_offset=None,
                  alpha=np.pi/2,
                  size=(0.5, 0.7, 0.2),
-                 size_offset=(0, 0, 0)):  # size = (x, y, z)
+                 size_offset=(0, 0, 0),  # size = (x, y, z)
+                 render_mode=None):
+
+        mesh = geometry_cache.get(mesh_key(Parallelepiped, size, size_offset, alpha),
+                                  lambda: Parallelepiped.build_mesh(size, size_offset, alpha))
+
+        super().__init__(mesh=mesh,
+                         color=color,
+                         color_offset=color_offset,
+                         origin=origin,
+                         origin_offset=origin_offset,
+                         axis=axis,
+                         axis_offset=axis_offset,
+                         theta=theta,
+                         theta_offset=theta_offset,
+                         theta_degree=theta_degree,
+                         theta_degree_offset=theta_degree_offset,
+                         phi=phi,
+                         phi_offset=phi_offset,
+                         phi_degree=phi_degree,
+                         phi_degree_offset=phi_degree_offset,
+                         size=size,
+                         size_offset=size_offset,
+                         render_mode=render_mode)
 
+    @staticmethod
+    def build_mesh(size, size_offset, alpha):
         vertices = np.array([[-size[0]/2+size_offset[0], -size[1]/2+size_offset[1], +size[2]/2+size_offset[2]],   # 0
                              [-size[0]/2+size_offset[0], +size[1]/2+size_offset[1], +size[2]/2+size_offset[2]],   # 1
                              [+size[0]/2+size_offset[0], +size[1]/2+size_offset[1], +size[2]/2+size_offset[2]],   # 2
@@ -512,25 +711,7 @@ class Parallelepiped(Solids):
                     (1, 5, 6, 2),
                     (4, 0, 3, 7))
 
-        super().__init__(vertices=vertices,
-                         edges=edges,
-                         surfaces=surfaces,
-                         color=color,
-                         color_offset=color_offset,
-                         origin=origin,
-                         origin_offset=origin_offset,
-                         axis=axis,
-                         axis_offset=axis_offset,
-                         theta=theta,
-                         theta_offset=theta_offset,
-                         theta_degree=theta_degree,
-                         theta_degree_offset=theta_degree_offset,
-                         phi=phi,
-                         phi_offset=phi_offset,
-                         phi_degree=phi_degree,
-                         phi_degree_offset=phi_degree_offset,
-                         size=size,
-                         size_offset=size_offset)
+        return vertices, edges, surfaces
 
 
 class Trapezoid(Solids):
@@ -550,8 +731,33 @@ class Trapezoid(Solids):
                  phi_degree=None,
                  phi_degree_offset=None,
                  size=(0.5, 0.5, 0.2, 0.3, 0.2, 0.3),
-                 size_offset=(0, 0, 0)):  # size = (x1_b, x2_b, x1_t, x2_t, y, z)
+                 size_offset=(0, 0, 0),  # size = (x1_b, x2_b, x1_t, x2_t, y, z)
+                 render_mode=None):
+
+        mesh = geometry_cache.get(mesh_key(Trapezoid, size, size_offset),
+                                  lambda: Trapezoid.build_mesh(size, size_offset))
+
+        super().__init__(mesh=mesh,
+                         color=color,
+                         color_offset=color_offset,
+                         origin=origin,
+                         origin_offset=origin_offset,
+                         axis=axis,
+                         axis_offset=axis_offset,
+                         theta=theta,
+                         theta_offset=theta_offset,
+                         theta_degree=theta_degree,
+                         theta_degree_offset=theta_degree_offset,
+                         phi=phi,
+                         phi_offset=phi_offset,
+                         phi_degree=phi_degree,
+                         phi_degree_offset=phi_degree_offset,
+                         size=size,
+                         size_offset=size_offset,
+                         render_mode=render_mode)
 
+    @staticmethod
+    def build_mesh(size, size_offset):
         vertices = np.array([[-size[0]/2+size_offset[0], -size[4]/2+size_offset[1], +size[5]/2+size_offset[2]],   # 0
                              [-size[2]/2+size_offset[0], +size[4]/2+size_offset[1], +size[5]/2+size_offset[2]],   # 1
                              [+size[3]/2+size_offset[0], +size[4]/2+size_offset[1], +size[5]/2+size_offset[2]],   # 2
@@ -600,25 +806,7 @@ class Trapezoid(Solids):
                     (1, 5, 6, 2),
                     (4, 0, 3, 7))
 
-        super().__init__(vertices=vertices,
-                         edges=edges,
-                         surfaces=surfaces,
-                         color=color,
-                         color_offset=color_offset,
-                         origin=origin,
-                         origin_offset=origin_offset,
-                         axis=axis,
-                         axis_offset=axis_offset,
-                         theta=theta,
-                         theta_offset=theta_offset,
-                         theta_degree=theta_degree,
-                         theta_degree_offset=theta_degree_offset,
-                         phi=phi,
-                         phi_offset=phi_offset,
-                         phi_degree=phi_degree,
-                         phi_degree_offset=phi_degree_offset,
-                         size=size,
-                         size_offset=size_offset)
+        return vertices, edges, surfaces
 
 
 class PyramidTrunk(Solids):
@@ -638,8 +826,33 @@ class PyramidTrunk(Solids):
                  phi_degree=None,
                  phi_degree_offset=None,
                  size=(0.5, 0.3, 0.5, 0.3, 0.2),
-                 size_offset=(0, 0, 0)):  # size = (x, y, z, x, y)
+                 size_offset=(0, 0, 0),  # size = (x, y, z, x, y)
+                 render_mode=None):
 
+        mesh = geometry_cache.get(mesh_key(PyramidTrunk, size, size_offset),
+                                  lambda: PyramidTrunk.build_mesh(size, size_offset))
+
+        super().__init__(mesh=mesh,
+                         color=color,
+                         color_offset=color_offset,
+                         origin=origin,
+                         origin_offset=origin_offset,
+                         axis=axis,
+                         axis_offset=axis_offset,
+                         theta=theta,
+                         theta_offset=theta_offset,
+                         theta_degree=theta_degree,
+                         theta_degree_offset=theta_degree_offset,
+                         phi=phi,
+                         phi_offset=phi_offset,
+                         phi_degree=phi_degree,
+                         phi_degree_offset=phi_degree_offset,
+                         size=size,
+                         size_offset=size_offset,
+                         render_mode=render_mode)
+
+    @staticmethod
+    def build_mesh(size, size_offset):
         vertices = np.array([[-size[0]/2+size_offset[0], -size[1]/2+size_offset[1], +size[2]/2+size_offset[2]],   # 0
                              [-size[3]/2+size_offset[0], +size[1]/2+size_offset[1], +size[4]/2+size_offset[2]],   # 1
                              [+size[3]/2+size_offset[0], +size[1]/2+size_offset[1], +size[4]/2+size_offset[2]],   # 2
@@ -687,25 +900,7 @@ class PyramidTrunk(Solids):
                     (1, 5, 6, 2),
                     (4, 0, 3, 7))
 
-        super().__init__(vertices=vertices,
-                         edges=edges,
-                         surfaces=surfaces,
-                         color=color,
-                         color_offset=color_offset,
-                         origin=origin,
-                         origin_offset=origin_offset,
-                         axis=axis,
-                         axis_offset=axis_offset,
-                         theta=theta,
-                         theta_offset=theta_offset,
-                         theta_degree=theta_degree,
-                         theta_degree_offset=theta_degree_offset,
-                         phi=phi,
-                         phi_offset=phi_offset,
-                         phi_degree=phi_degree,
-                         phi_degree_offset=phi_degree_offset,
-                         size=size,
-                         size_offset=size_offset)
+        return vertices, edges, surfaces
 
 
 class Hexagon(Solids):
@@ -726,159 +921,13 @@ class Hexagon(Solids):
                  phi_degree=None,
                  phi_degree_offset=None,
                  size=(0.5, 0.2),
-                 size_offset=(0, 0)):
+                 size_offset=(0, 0),
+                 render_mode=None):
 
-        higher_hexagon = size[0]*np.sin(np.pi / 3)
-        side_hexagon = size[0]*np.cos(np.pi/3)
+        mesh = geometry_cache.get(mesh_key(Hexagon, size, size_offset, origin_axis),
+                                  lambda: Hexagon.build_mesh(size, size_offset, origin_axis))
 
-        '''
-             side_hexagon                           side_hexagon
-        ____|_______|_____                         |_______|_
-        |  / \      \  |                            \     |
-        | /   \     |\ |  higher_hexagon/2           \    |
-        |/_____\____|_\|__                       size \   | higher_hexagon
-        |\    size  | /|                               \  |
-        | \       \ |/ |                                \ |
-        |__\_______\/__|                                 \|__
-        '''
-        if origin_axis == (1, 0, 0):
-            vertices = np.array([[+size[1]/2+size_offset[0],
-                                  -side_hexagon/2+size_offset[1],
-                                  +higher_hexagon/2+size_offset[0]],   # 0
-                                 [-size[1]/2+size_offset[0],
-                                  -side_hexagon/2+size_offset[1],
-                                  +higher_hexagon/2+size_offset[0]],   # 1
-                                 [-size[1]/2+size_offset[0],
-                                  +side_hexagon/2+size_offset[1],
-                                  +higher_hexagon/2+size_offset[0]],   # 2
-                                 [+size[1]/2+size_offset[0],
-                                  +side_hexagon/2+size_offset[1],
-                                  +higher_hexagon/2+size_offset[0]],   # 3
-                                 [+size[1]/2+size_offset[0],
-                                  -side_hexagon/2+size_offset[1],
-                                  -higher_hexagon/2+size_offset[0]],   # 4
-                                 [-size[1]/2+size_offset[0],
-                                  -side_hexagon/2+size_offset[1],
-                                  -higher_hexagon/2+size_offset[0]],   # 5
-                                 [-size[1]/2+size_offset[0],
-                                  +side_hexagon/2+size_offset[1],
-                                  -higher_hexagon/2+size_offset[0]],   # 6
-                                 [+size[1]/2+size_offset[0],
-                                  +side_hexagon/2+size_offset[1],
-                                  -higher_hexagon/2+size_offset[0]],   # 7
-                                 [+size[1]/2+size_offset[0], -size[0]/2+size_offset[1], size_offset[0]],    # 8
-                                 [-size[1]/2+size_offset[0], -size[0]/2+size_offset[1], size_offset[0]],    # 9
-                                 [-size[1]/2+size_offset[0], +size[0]/2+size_offset[1], size_offset[0]],    # 10
-                                 [+size[1]/2+size_offset[0], +size[0]/2+size_offset[1], size_offset[0]]])   # 11
-        elif origin_axis == (0, 1, 0):
-            vertices = np.array([[-side_hexagon/2+size_offset[0],
-                                  -size[1]/2+size_offset[1],
-                                  +higher_hexagon/2+size_offset[0]],   # 0
-                                 [-side_hexagon/2+size_offset[0],
-                                  +size[1]/2+size_offset[1],
-                                  +higher_hexagon/2+size_offset[0]],   # 1
-                                 [+side_hexagon/2+size_offset[0],
-                                  +size[1]/2+size_offset[1],
-                                  +higher_hexagon/2+size_offset[0]],   # 2
-                                 [+side_hexagon/2+size_offset[0],
-                                  -size[1]/2+size_offset[1],
-                                  +higher_hexagon/2+size_offset[0]],   # 3
-                                 [-side_hexagon/2+size_offset[0],
-                                  -size[1]/2+size_offset[1],
-                                  -higher_hexagon/2+size_offset[0]],   # 4
-                                 [-side_hexagon/2+size_offset[0],
-                                  +size[1]/2+size_offset[1],
-                                  -higher_hexagon/2+size_offset[0]],   # 5
-                                 [+side_hexagon/2+size_offset[0],
-                                  +size[1]/2+size_offset[1],
-                                  -higher_hexagon/2+size_offset[0]],   # 6
-                                 [+side_hexagon/2+size_offset[0],
-                                  -size[1]/2+size_offset[1],
-                                  -higher_hexagon/2+size_offset[0]],   # 7
-                                 [-size[0]/2+size_offset[0], -size[1]/2+size_offset[1], size_offset[0]],    # 8
-                                 [-size[0]/2+size_offset[0], +size[1]/2+size_offset[1], size_offset[0]],    # 9
-                                 [+size[0]/2+size_offset[0], +size[1]/2+size_offset[1], size_offset[0]],    # 10
-                                 [+size[0]/2+size_offset[0], -size[1]/2+size_offset[1], size_offset[0]]])   # 11
-        elif origin_axis == (0, 0, 1):
-            vertices = np.array([[-side_hexagon/2+size_offset[0],
-                                  -higher_hexagon/2+size_offset[1],
-                                  -size[1]/2+size_offset[0]],   # 0
-                                 [-side_hexagon/2+size_offset[0],
-                                  -higher_hexagon/2+size_offset[1],
-                                  +size[1]/2+size_offset[0]],   # 1
-                                 [+side_hexagon/2+size_offset[0],
-                                  -higher_hexagon/2+size_offset[1],
-                                  +size[1]/2+size_offset[0]],   # 2
-                                 [+side_hexagon/2+size_offset[0],
-                                  -higher_hexagon/2+size_offset[1],
-                                  -size[1]/2+size_offset[0]],   # 3
-                                 [-side_hexagon/2+size_offset[0],
-                                  +higher_hexagon/2+size_offset[1],
-                                  -size[1]/2+size_offset[0]],   # 4
-                                 [-side_hexagon/2+size_offset[0],
-                                  +higher_hexagon/2+size_offset[1],
-                                  +size[1]/2+size_offset[0]],   # 5
-                                 [+side_hexagon/2+size_offset[0],
-                                  +higher_hexagon/2+size_offset[1],
-                                  +size[1]/2+size_offset[0]],   # 6
-                                 [+side_hexagon/2+size_offset[0],
-                                  +higher_hexagon/2+size_offset[1],
-                                  -size[1]/2+size_offset[0]],   # 7
-                                 [-size[0]/2+size_offset[0], size_offset[1], -size[1]/2+size_offset[0]],    # 8
-                                 [-size[0]/2+size_offset[0], size_offset[1], +size[1]/2+size_offset[0]],    # 9
-                                 [+size[0]/2+size_offset[0], size_offset[1], +size[1]/2+size_offset[0]],    # 10
-                                 [+size[0]/2+size_offset[0], size_offset[1], -size[1]/2+size_offset[0]]])   # 11
-        '''
-                      y                              origin_axis
-                      |                                  / \ 
-               5 _____|_________6                   5_____|_____6                                              
-               /|     |         /|                  /|    |    |\                                               
-              /       |        / |                 /      |      \                               
-             /  |__   |      _/  |               9/  |4__ |  __|7 \ 10 
-           9/| 4/          10/  7/               |\  /         \  /|       
-           / |8             /   /                | \             / |  
-          /________________/   /__x              |8 \___________/  | __x           
-         1|               2|11/                   \  1         |2 / 11               
-          |                | /                     \ |         | /   
-         0|_______________3|/                       \|____ ____|/   
-                  /                                  0   /     3  
-                 /                                      /     
-                z                                      z                                                                               
-        '''
-
-        edges = np.array([[0, 1],
-                          [0, 3],
-                          [0, 8],
-                          [1, 2],
-                          [1, 9],
-                          [2, 3],
-                          [2, 10],
-                          [3, 11],
-                          [10, 11],
-                          [10, 6],
-                          [11, 7],
-                          [6, 7],
-                          [6, 5],
-                          [7, 4],
-                          [4, 5],
-                          [4, 8],
-                          [8, 9],
-                          [5, 9]])
-
-        surfaces = ((0, 1, 2, 3),
-                    (3, 2, 10, 11),
-                    (10, 11, 7, 6),
-                    (6, 7, 4, 5),
-                    (4, 5, 9, 8),
-                    (0, 1, 9, 8),
-                    (1, 2, 10, 6),
-                    (1, 6, 5, 9),
-                    (0, 3, 11, 7),
-                    (0, 7, 4, 8))
-
-        super().__init__(vertices=vertices,
-                         edges=edges,
-                         surfaces=surfaces,
+        super().__init__(mesh=mesh,
                          color=color,
                          color_offset=color_offset,
                          origin=origin,
@@ -894,7 +943,15 @@ class Hexagon(Solids):
                          phi_degree=phi_degree,
                          phi_degree_offset=phi_degree_offset,
                          size=size,
-                         size_offset=size_offset)
+                         size_offset=size_offset,
+                         render_mode=render_mode)
+
+    @staticmethod
+    def build_mesh(size, size_offset, origin_axis):
+        # size = (width across corners, thickness along origin_axis)
+        return prism_geometry(6, size[0]/2, size[1],
+                              axis=origin_axis,
+                              center=(size_offset[0], size_offset[1], size_offset[0]))
 
 
 class HexagonAxis(Solids):
@@ -914,84 +971,13 @@ class HexagonAxis(Solids):
                  phi_degree=None,
                  phi_degree_offset=None,
                  size=(1, 1.5),
-                 size_offset=(0, 0)):
+                 size_offset=(0, 0),
+                 render_mode=None):
 
-        higher_hexagon = size[0]*np.sin(np.pi / 3)
-        side_hexagon = size[0]*np.cos(np.pi/3)
+        mesh = geometry_cache.get(mesh_key(HexagonAxis, size, size_offset),
+                                  lambda: HexagonAxis.build_mesh(size, size_offset))
 
-        '''
-                               origin 
-            5___6_______________ | _________4____7
-           /     \               |         /     \
-          /       \             \|/               \
-       9 /         \ 10__________o________________ \
-         \         /                    8\       11/
-          \       /                               /
-           \____ /________________________ \____ /
-            1   2                           0   3
-        '''
-        vertices = np.array([[-size[1]/2+size_offset[0],
-                              +higher_hexagon/2+size_offset[1],
-                              -side_hexagon/2+size_offset[0]],    # 0
-                             [+size[1]/2+size_offset[0],
-                              +higher_hexagon/2+size_offset[1],
-                              -side_hexagon/2+size_offset[0]],   # 1
-                             [+size[1]/2+size_offset[0],
-                              +higher_hexagon/2+size_offset[1],
-                              +side_hexagon/2+size_offset[0]],    # 2
-                             [-size[1]/2+size_offset[0],
-                              +higher_hexagon/2+size_offset[1],
-                              +side_hexagon/2+size_offset[0]],    # 3
-                             [-size[1]/2+size_offset[0],
-                              -higher_hexagon/2+size_offset[1],
-                              -side_hexagon/2+size_offset[0]],  # 4
-                             [+size[1]/2+size_offset[0],
-                              -higher_hexagon/2+size_offset[1],
-                              -side_hexagon/2+size_offset[0]],   # 5
-                             [+size[1]/2+size_offset[0],
-                              -higher_hexagon/2+size_offset[1],
-                              +side_hexagon/2+size_offset[0]],    # 6
-                             [-size[1]/2+size_offset[0],
-                              -higher_hexagon/2+size_offset[1],
-                              +side_hexagon/2+size_offset[0]],   # 7
-                             [-size[1]/2+size_offset[0], +size_offset[1], -size[0]/2+size_offset[0]],           # 8
-                             [+size[1]/2+size_offset[0], +size_offset[1], -size[0]/2+size_offset[0]],           # 9
-                             [+size[1]/2+size_offset[0], +size_offset[1], +size[0]/2+size_offset[0]],             # 10
-                             [-size[1]/2+size_offset[0], +size_offset[1], +size[0]/2+size_offset[0]]])           # 11
-
-        edges = np.array([[0, 1],
-                          [0, 3],
-                          [0, 8],
-                          [1, 2],
-                          [1, 9],
-                          [2, 3],
-                          [2, 10],
-                          [3, 11],
-                          [10, 11],
-                          [10, 6],
-                          [11, 7],
-                          [6, 7],
-                          [6, 5],
-                          [7, 4],
-                          [4, 5],
-                          [4, 8],
-                          [8, 9],
-                          [5, 9]])
-
-        surfaces = ((0, 1, 2, 3),
-                    (3, 2, 10, 11),
-                    (10, 11, 7, 6),
-                    (6, 7, 4, 5),
-                    (4, 5, 9, 9),
-                    (0, 1, 9, 8),
-                    (1, 2, 10, 6),
-                    (1, 6, 5, 9),
-                    (0, 3, 11, 7),
-                    (0, 7, 4, 8))
-
-        super().__init__(vertices=vertices,
-                         edges=edges,
-                         surfaces=surfaces,
+        super().__init__(mesh=mesh,
                          color=color,
                          color_offset=color_offset,
                          origin=origin,
@@ -1007,7 +993,16 @@ class HexagonAxis(Solids):
                          phi_degree=phi_degree,
                          phi_degree_offset=phi_degree_offset,
                          size=size,
-                         size_offset=size_offset)
+                         size_offset=size_offset,
+                         render_mode=render_mode)
+
+    @staticmethod
+    def build_mesh(size, size_offset):
+        # a hexagonal bar centered on the origin along x, size = (width across corners, length)
+        return prism_geometry(6, size[0]/2, size[1],
+                              axis=(1, 0, 0),
+                              angle_offset=np.pi/2,
+                              center=(size_offset[0], size_offset[1], size_offset[0]))
 
 
 class HexagonStalk(Solids):
@@ -1027,68 +1022,13 @@ class HexagonStalk(Solids):
                  phi_degree=None,
                  phi_degree_offset=None,
                  size=(1, 1.5),
-                 size_offset=(0, 0)):  # size = (size, x)
+                 size_offset=(0, 0),  # size = (size, x)
+                 render_mode=None):
 
-        higher_hexagon = size[0]*np.sin(np.pi / 3)
-        side_hexagon = size[0]*np.cos(np.pi/3)
-
-        '''
-               |------------- size[1] -------------|
-            7__|_4____________________________6____5
-           /   |  \                          /      \
-          /    |   \                                 \
-       11/    \|/   \ 8______________________________ \
-         \  origin  /                    10\         9/
-          \        /                                 /
-           \______/__________________________\______/
-            3    0                            2     1
-        '''
-        vertices = np.array([[size_offset[0], +higher_hexagon/2+size_offset[1], -side_hexagon/2+size_offset[0]],    # 0
-                             [+size[1]+size_offset[0], +higher_hexagon/2+size_offset[1], -side_hexagon/2+size_offset[0]],    # 1
-                             [+size[1]+size_offset[0], +higher_hexagon/2+size_offset[1], +side_hexagon/2+size_offset[0]],    # 2
-                             [size_offset[0], +higher_hexagon/2+size_offset[1], +side_hexagon/2+size_offset[0]],    # 3
-                             [size_offset[0], -higher_hexagon/2+size_offset[1], -side_hexagon/2+size_offset[0]],  # 4
-                             [size[1]+size_offset[0], -higher_hexagon/2+size_offset[1], -side_hexagon/2+size_offset[0]],   # 5
-                             [size[1]+size_offset[0], -higher_hexagon/2+size_offset[1], +side_hexagon/2+size_offset[0]],    # 6
-                             [size_offset[0], -higher_hexagon/2+size_offset[1], +side_hexagon/2+size_offset[0]],   # 7
-                             [size_offset[0], +size_offset[1], -size[0]/2+size_offset[0]],           # 8
-                             [size[1]+size_offset[0], +size_offset[1], -size[0]/2+size_offset[0]],           # 9
-                             [size[1]+size_offset[0], +size_offset[1], +size[0]/2+size_offset[0]],             # 10
-                             [size_offset[0], +size_offset[1], +size[0]/2+size_offset[0]]])           # 11
-
-        edges = np.array([[0, 1],
-                          [0, 3],
-                          [0, 8],
-                          [1, 2],
-                          [1, 9],
-                          [2, 3],
-                          [2, 10],
-                          [3, 11],
-                          [10, 11],
-                          [10, 6],
-                          [11, 7],
-                          [6, 7],
-                          [6, 5],
-                          [7, 4],
-                          [4, 5],
-                          [4, 8],
-                          [8, 9],
-                          [5, 9]])
+        mesh = geometry_cache.get(mesh_key(HexagonStalk, size, size_offset),
+                                  lambda: HexagonStalk.build_mesh(size, size_offset))
 
-        surfaces = ((0, 1, 2, 3),
-                    (3, 2, 10, 11),
-                    (10, 11, 7, 6),
-                    (6, 7, 4, 5),
-                    (4, 5, 9, 9),
-                    (0, 1, 9, 8),
-                    (1, 2, 10, 6),
-                    (1, 6, 5, 9),
-                    (0, 3, 11, 7),
-                    (0, 7, 4, 8))
-
-        super().__init__(vertices=vertices,
-                         edges=edges,
-                         surfaces=surfaces,
+        super().__init__(mesh=mesh,
                          color=color,
                          color_offset=color_offset,
                          origin=origin,
@@ -1104,7 +1044,31 @@ class HexagonStalk(Solids):
                          phi_degree=phi_degree,
                          phi_degree_offset=phi_degree_offset,
                          size=size,
-                         size_offset=size_offset)
+                         size_offset=size_offset,
+                         render_mode=render_mode)
+
+    @staticmethod
+    def build_mesh(size, size_offset):
+        # like HexagonAxis, but the bar starts at the origin and runs size[1] along +x
+        return prism_geometry(6, size[0]/2, size[1],
+                              axis=(1, 0, 0),
+                              angle_offset=np.pi/2,
+                              center=(size_offset[0], size_offset[1], size_offset[0]),
+                              anchor="base")
+
+
+def update_model_matrices(solids_list, mode=None):
+    # fills every stale model matrix cache in one vectorized pass instead of one solid at a time
+    stale = [solid for solid in solids_list
+             if solid.mesh is not None and (solid._model_matrix is None or solid._model_matrix_mode != mode)]
+    if stale:
+        matrices = solids_model_matrices(stale, mode)
+        matrices.setflags(write=False)
+        for solid, matrix in zip(stale, matrices):
+            solid._model_matrix = matrix
+            solid._model_matrix_mode = mode
+            solid._gl_model_matrix = None
+    return len(stale)
 
 
 class SolidsGroup(Solids):
@@ -1121,9 +1085,24 @@ class SolidsGroup(Solids):
                  phi=None,
                  phi_offset=None,
                  phi_degree=None,
-                 phi_degree_offset=None,):
+                 phi_degree_offset=None,
+                 render_mode=None,
+                 culling=False,
+                 level_of_detail=False):
 
         self.solids_list = solids_list
+        self.culling = culling
+        self.culler = Culler()
+        self.level_of_detail = level_of_detail
+        self.lod_selector = LevelOfDetail()
+        self._instance_batches = None
+        self._batched_solids = None
+        self._batched_meshes = None
+        self._single_solids = None
+        self._batch_indices = None
+        self._single_indices = None
+        # attribute -> (value, children's state_version right after it was propagated)
+        self._propagated = {}
         self._origin = np.asarray(origin, np.dtype('float64'))
         self._origin_offset = np.asarray(origin_offset, np.dtype('float64'))
         self._axis = np.asarray(axis, np.dtype('float64'))
@@ -1143,11 +1122,101 @@ class SolidsGroup(Solids):
                          phi=phi,
                          phi_offset=phi_offset,
                          phi_degree=phi_degree,
-                         phi_degree_offset=phi_degree_offset)
+                         phi_degree_offset=phi_degree_offset,
+                         render_mode=render_mode)
+
+    def _draw(self, mode=None):
+        if self.level_of_detail:
+            # solids that switch level point at another mesh, which regroups the instanced batches
+            self.lod_selector.update(self.leaf_solids(), mode)
+
+        if self._render_mode == "instanced":
+            self._draw_instanced(mode)
+        elif self.culling:
+            leaves = self.leaf_solids()
+            update_model_matrices(leaves, mode)
+            for solid, visible in zip(leaves, self.culler.visible(leaves, mode)):
+                if visible:
+                    solid.draw(mode)
+        else:
+            for solid in self.solids_list:
+                solid.draw(mode)
+
+    def _draw_instanced(self, mode=None):
+        leaves = self.leaf_solids()
+        # a leaf given a new mesh (set_mesh, the vertices setter) belongs in another batch
+        meshes = tuple(id(solid.mesh) for solid in leaves)
+        if self._batched_solids != leaves or self._batched_meshes != meshes:
+            self._instance_batches, self._single_solids = build_instance_batches(leaves)
+            self._batched_solids = leaves
+            self._batched_meshes = meshes
+            leaf_index = {id(solid): index for index, solid in enumerate(leaves)}
+            self._batch_indices = [np.array([leaf_index[id(solid)] for solid in batch.solids_list], np.dtype('int64'))
+                                   for batch in self._instance_batches]
+            self._single_indices = [leaf_index[id(solid)] for solid in self._single_solids]
+
+        update_model_matrices(leaves, mode)
+        if not self.culling:
+            for batch in self._instance_batches:
+                batch.draw(mode)
+            for solid in self._single_solids:
+                solid.draw(mode)
+            return
+
+        visible = self.culler.visible(leaves, mode)
+        for batch, indices in zip(self._instance_batches, self._batch_indices):
+            batch.draw(mode, visible[indices])
+        for solid, index in zip(self._single_solids, self._single_indices):
+            if visible[index]:
+                solid.draw(mode)
 
-    def draw(self, mode=None):
+    @property
+    def dirty(self):
+        return any(solid.dirty for solid in self.solids_list)
+
+    @property
+    def state_version(self):
+        return sum(solid.state_version for solid in self.solids_list)
+
+    def _already_propagated(self, name, value):
+        # a repeated assignment is skipped only if no child was changed since it was propagated
+        previous = self._propagated.get(name)
+        return previous is not None and previous[1] == self.state_version and np.array_equal(previous[0], value)
+
+    def _mark_propagated(self, name, value):
+        self._propagated[name] = (np.array(value), self.state_version)
+
+    @dirty.setter
+    def dirty(self, value):
+        if value:
+            for solid in self.solids_list:
+                solid.dirty = True
+
+    def leaf_solids(self):
+        leaves = []
         for solid in self.solids_list:
-            solid.draw(mode)
+            if isinstance(solid, SolidsGroup) and type(solid).draw is Solids.draw \
+                    and type(solid)._draw is SolidsGroup._draw:
+                leaves.extend(solid.leaf_solids())
+            else:
+                leaves.append(solid)
+        return leaves
+
+    @property
+    def render_mode(self):
+        return self._render_mode
+
+    @render_mode.setter
+    def render_mode(self, value):
+        if value is not None and value not in GROUP_RENDER_MODES:
+            raise ValueError("render_mode must be one of %s, got %r" % (GROUP_RENDER_MODES, value))
+        self._render_mode = value
+        if value is not None:
+            for solid in self.solids_list:
+                if value == "instanced" and not isinstance(solid, SolidsGroup):
+                    solid.render_mode = "buffered"
+                else:
+                    solid.render_mode = value
 
     @property
     def origin(self):
@@ -1155,9 +1224,13 @@ class SolidsGroup(Solids):
 
     @origin.setter
     def origin(self, value):
-        self._origin = np.asarray(value, np.dtype('float64'))
+        value = np.asarray(value, np.dtype('float64'))
+        if self._already_propagated('origin', value):
+            return
+        self._origin = value
         for solid in self.solids_list:
             solid.origin = self._origin
+        self._mark_propagated('origin', value)
 
     @property
     def axis(self):
@@ -1165,9 +1238,13 @@ class SolidsGroup(Solids):
 
     @axis.setter
     def axis(self, value):
-        self._axis = np.asarray(value, np.dtype('float64'))
+        value = np.asarray(value, np.dtype('float64'))
+        if self._already_propagated('axis', value):
+            return
+        self._axis = value
         for solid in self.solids_list:
             solid.axis = np.asarray(self._axis)
+        self._mark_propagated('axis', value)
 
     @property
     def theta(self):
@@ -1175,6 +1252,8 @@ class SolidsGroup(Solids):
 
     @theta.setter
     def theta(self, value):
+        if self._already_propagated('theta', value):
+            return
         self._theta = value
         if self._theta > 2*np.pi:
             self._theta += 2*np.pi
@@ -1185,6 +1264,7 @@ class SolidsGroup(Solids):
 
         for solid in self.solids_list:
             solid.theta = self._theta
+        self._mark_propagated('theta', value)
 
     @property
     def theta_degree(self):
@@ -1192,6 +1272,8 @@ class SolidsGroup(Solids):
 
     @theta_degree.setter
     def theta_degree(self, value):
+        if self._already_propagated('theta_degree', value):
+            return
         self._theta_degree = value
         if self._theta_degree < 0:
             self._theta_degree += 360
@@ -1202,3 +1284,4 @@ class SolidsGroup(Solids):
 
         for solid in self.solids_list:
             solid.theta_degree = self._theta_degree
+        self._mark_propagated('theta_degree', value)
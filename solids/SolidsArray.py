@@ -0,0 +1,288 @@
+import numpy as np
+from solids.Bulk import class_defaults, class_mesh, per_solid
+from solids.Buffers import InstanceBuffer
+from solids.Instancing import expand_instances, homogeneous_vertices, instance_indices
+from solids.Solids import Solids
+from solids.Transforms import model_matrices, solids_arrays
+
+
+class SolidsArray(Solids):
+    def __init__(self,
+                 origins,
+                 solid_class=None,
+                 mesh=None,
+                 origin_offsets=(0, 0, 0),
+                 axes=(0, 1, 0),
+                 axis_offsets=None,
+                 thetas=None,
+                 theta_degrees=None,
+                 theta_offsets=0,
+                 phis=None,
+                 phi_degrees=None,
+                 phi_offsets=0,
+                 colors=None,
+                 color_offsets=(0, 0, 0),
+                 size=None,
+                 size_offset=None,
+                 origin=(0, 0, 0),
+                 axis=(0, 1, 0),
+                 theta=None,
+                 theta_degree=None,
+                 phi=None,
+                 phi_degree=None,
+                 render_mode=None,
+                 **mesh_options):
+
+        '''
+            N copies of one mesh whose transforms and colors live in contiguous
+            arrays: origins, axes, colors, ... are (N, 3), thetas, phis and their
+            offsets are (N,) in radians. The mesh comes from solid_class (with size,
+            size_offset and mesh_options as its constructor takes them) or is given
+            directly. origin, axis, theta and phi move the array as a whole.
+            Setters and the rotate/translate/... methods update every element, or
+            the elements selected by mask, in one vectorized operation; after
+            editing the arrays in place, call invalidate().
+        '''
+        super().__init__(origin=origin,
+                         axis=axis,
+                         axis_offset=(0, 0, 0),
+                         theta=theta,
+                         theta_degree=theta_degree,
+                         phi=phi,
+                         phi_degree=phi_degree,
+                         render_mode=render_mode)
+
+        if mesh is None:
+            if solid_class is None:
+                raise ValueError("SolidsArray needs a solid_class or a mesh")
+            mesh = class_mesh(solid_class, size, size_offset, **mesh_options)
+        if colors is None:
+            colors = class_defaults(solid_class).get('color', (1, 1, 1)) if solid_class is not None else (1, 1, 1)
+        if axis_offsets is None:
+            axis_offsets = class_defaults(solid_class).get('axis_offset', (0, 0, 0)) \
+                if solid_class is not None else (0, 0, 0)
+
+        self.solid_class = solid_class
+        self.element_mesh = mesh
+        self._origins = np.array(origins, np.dtype('float64'))
+        count = self._origins.shape[0]
+
+        if thetas is None and theta_degrees is not None:
+            thetas = np.radians(per_solid(theta_degrees, count, None, 'theta_degrees'))
+        if phis is None and phi_degrees is not None:
+            phis = np.radians(per_solid(phi_degrees, count, None, 'phi_degrees'))
+
+        self._origin_offsets = per_solid(origin_offsets, count, 3, 'origin_offsets')
+        self._axes = per_solid(axes, count, 3, 'axes')
+        self._axis_offsets = per_solid(axis_offsets, count, 3, 'axis_offsets')
+        self._thetas = per_solid(thetas if thetas is not None else 0, count, None, 'thetas')
+        self._theta_offsets = per_solid(theta_offsets, count, None, 'theta_offsets')
+        self._phis = per_solid(phis if phis is not None else 0, count, None, 'phis')
+        self._phi_offsets = per_solid(phi_offsets, count, None, 'phi_offsets')
+        self._colors = per_solid(colors, count, 3, 'colors')
+        self._color_offsets = per_solid(color_offsets, count, 3, 'color_offsets')
+        self.visible = np.ones(count, np.dtype('bool'))
+
+        self.base_vertices = homogeneous_vertices(mesh)
+        self.element_edges, self.element_surfaces, self.surface_primitive = instance_indices(mesh, count)
+        self.buffer = InstanceBuffer(self.element_edges, self.element_surfaces, self.surface_primitive, count)
+        self._element_matrices = None
+        self._element_mode = None
+        self._vertices = None
+        self._vertex_colors = None
+        self._vertices_mode = None
+
+    @classmethod
+    def from_solids(cls, solids_list, **kwargs):
+        meshes = {id(solid.mesh) for solid in solids_list}
+        if len(meshes) != 1 or solids_list[0].mesh is None:
+            raise ValueError("a SolidsArray holds solids sharing one mesh, got %d meshes" % len(meshes))
+        arrays = solids_arrays(solids_list)
+        return cls(origins=arrays['origin'],
+                   solid_class=type(solids_list[0]),
+                   mesh=solids_list[0].mesh,
+                   origin_offsets=arrays['origin_offset'],
+                   axes=arrays['axis'],
+                   axis_offsets=arrays['axis_offset'],
+                   thetas=arrays['theta'],
+                   theta_offsets=arrays['theta_offset'],
+                   phis=arrays['phi'],
+                   phi_offsets=arrays['phi_offset'],
+                   colors=[solid.color for solid in solids_list],
+                   color_offsets=[solid.color_offset for solid in solids_list],
+                   **kwargs)
+
+    def __len__(self):
+        return self._origins.shape[0]
+
+    def invalidate(self):
+        self._element_matrices = None
+        self._vertices = None
+        self.dirty = True
+
+    def element_matrices(self, mode=None):
+        if self._element_matrices is None or self._element_mode != mode:
+            self._element_matrices = model_matrices(origin=self._origins,
+                                                    origin_offset=self._origin_offsets,
+                                                    axis=self._axes,
+                                                    axis_offset=self._axis_offsets,
+                                                    theta=self._thetas,
+                                                    theta_offset=self._theta_offsets,
+                                                    phi=self._phis,
+                                                    phi_offset=self._phi_offsets,
+                                                    mode=mode)
+            self._element_mode = mode
+        return self._element_matrices
+
+    def _draw(self, mode=None):
+        from OpenGL.GL import glPushMatrix, glMultMatrixf, glPopMatrix
+        if self._vertices is None or self._vertices_mode != mode:
+            self._vertices, self._vertex_colors = expand_instances(self.base_vertices,
+                                                                   self.element_matrices(mode),
+                                                                   self._colors + self._color_offsets)
+            self._vertices_mode = mode
+            self.buffer.upload(self._vertices, self._vertex_colors)
+
+        glPushMatrix()
+        glMultMatrixf(self.gl_model_matrix(mode))
+        self.buffer.draw(self.visible)
+        glPopMatrix()
+
+    def _select(self, mask):
+        return slice(None) if mask is None else np.asarray(mask)
+
+    def rotate(self, delta, mask=None):
+        selected = self._select(mask)
+        self._thetas[selected] = np.mod(self._thetas[selected] + delta, 2*np.pi)
+        self.invalidate()
+
+    def rotate_degree(self, delta, mask=None):
+        self.rotate(np.radians(delta), mask)
+
+    def tilt(self, delta, mask=None):
+        selected = self._select(mask)
+        self._phis[selected] = np.mod(self._phis[selected] + delta, 2*np.pi)
+        self.invalidate()
+
+    def tilt_degree(self, delta, mask=None):
+        self.tilt(np.radians(delta), mask)
+
+    def translate(self, delta, mask=None):
+        self._origins[self._select(mask)] += np.asarray(delta, np.dtype('float64'))
+        self.invalidate()
+
+    def recolor(self, colors, mask=None):
+        self._colors[self._select(mask)] = np.asarray(colors, np.dtype('float64'))
+        self.invalidate()
+
+    def show(self, mask=None):
+        self.visible[self._select(mask)] = True
+
+    def hide(self, mask=None):
+        self.visible[self._select(mask)] = False
+
+    @property
+    def origins(self):
+        return self._origins
+
+    @origins.setter
+    def origins(self, value):
+        self._origins[:] = value
+        self.invalidate()
+
+    @property
+    def origin_offsets(self):
+        return self._origin_offsets
+
+    @origin_offsets.setter
+    def origin_offsets(self, value):
+        self._origin_offsets[:] = value
+        self.invalidate()
+
+    @property
+    def axes(self):
+        return self._axes
+
+    @axes.setter
+    def axes(self, value):
+        self._axes[:] = value
+        self.invalidate()
+
+    @property
+    def axis_offsets(self):
+        return self._axis_offsets
+
+    @axis_offsets.setter
+    def axis_offsets(self, value):
+        self._axis_offsets[:] = value
+        self.invalidate()
+
+    @property
+    def thetas(self):
+        return self._thetas
+
+    @thetas.setter
+    def thetas(self, value):
+        self._thetas[:] = value
+        self.invalidate()
+
+    @property
+    def theta_degrees(self):
+        return np.degrees(self._thetas)
+
+    @theta_degrees.setter
+    def theta_degrees(self, value):
+        self.thetas = np.radians(value)
+
+    @property
+    def theta_offsets(self):
+        return self._theta_offsets
+
+    @theta_offsets.setter
+    def theta_offsets(self, value):
+        self._theta_offsets[:] = value
+        self.invalidate()
+
+    @property
+    def phis(self):
+        return self._phis
+
+    @phis.setter
+    def phis(self, value):
+        self._phis[:] = value
+        self.invalidate()
+
+    @property
+    def phi_degrees(self):
+        return np.degrees(self._phis)
+
+    @phi_degrees.setter
+    def phi_degrees(self, value):
+        self.phis = np.radians(value)
+
+    @property
+    def phi_offsets(self):
+        return self._phi_offsets
+
+    @phi_offsets.setter
+    def phi_offsets(self, value):
+        self._phi_offsets[:] = value
+        self.invalidate()
+
+    @property
+    def colors(self):
+        return self._colors
+
+    @colors.setter
+    def colors(self, value):
+        self._colors[:] = value
+        self.invalidate()
+
+    @property
+    def color_offsets(self):
+        return self._color_offsets
+
+    @color_offsets.setter
+    def color_offsets(self, value):
+        self._color_offsets[:] = value
+        self.invalidate()
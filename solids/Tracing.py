@@ -0,0 +1,97 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+
+class Tracer:
+    def __init__(self, capacity=100000, gl_counter=None):
+        self.capacity = capacity
+        self.gl_counter = gl_counter
+        self.events = deque(maxlen=capacity)
+        self.dropped = 0
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    def __len__(self):
+        return len(self.events)
+
+    def clear(self):
+        self.events.clear()
+        self.dropped = 0
+
+    @contextmanager
+    def span(self, name, category="frame", **args):
+        gl_calls = self.gl_counter.total if self.gl_counter is not None else None
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter()
+            if gl_calls is not None:
+                args['gl_calls'] = self.gl_counter.total - gl_calls
+            self.add_event(name, category, start, end, args)
+
+    def add_event(self, name, category, start, end, args=None):
+        if len(self.events) == self.capacity:
+            self.dropped += 1
+        self.events.append((name, category, start, end, threading.get_ident(), args))
+
+    def instant(self, name, category="frame", **args):
+        now = time.perf_counter()
+        self.add_event(name, category, now, None, args)
+
+    def chrome_trace(self):
+        trace_events = []
+        for name, category, start, end, thread_id, args in list(self.events):
+            event = {'name': name,
+                     'cat': category,
+                     'ts': (start - self._origin) * 1e6,
+                     'pid': self._pid,
+                     'tid': thread_id,
+                     'args': args or {}}
+            if end is None:
+                event['ph'] = 'i'
+                event['s'] = 't'
+            else:
+                event['ph'] = 'X'
+                event['dur'] = (end - start) * 1e6
+            trace_events.append(event)
+
+        return {'traceEvents': trace_events,
+                'displayTimeUnit': 'ms',
+                'otherData': {'dropped_events': self.dropped}}
+
+    def export(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
+
+
+tracer = None
+_null_span = nullcontext()
+
+
+def enable_tracing(capacity=100000, count_gl_calls=True):
+    global tracer
+    gl_counter = None
+    if count_gl_calls:
+        from solids.GLCounter import GLCallCounter
+        gl_counter = GLCallCounter(passthrough=True)
+        gl_counter.install()
+    tracer = Tracer(capacity=capacity, gl_counter=gl_counter)
+    return tracer
+
+
+def disable_tracing():
+    global tracer
+    if tracer is not None and tracer.gl_counter is not None:
+        tracer.gl_counter.uninstall()
+    tracer = None
+
+
+def span(name, category="frame", **args):
+    if tracer is None:
+        return _null_span
+    return tracer.span(name, category, **args)
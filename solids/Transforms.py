@@ -0,0 +1,131 @@
+import numpy as np
+
+
+def translation_matrices(offsets):
+    offsets = np.asarray(offsets, np.dtype('float64'))
+    matrices = np.zeros(offsets.shape[:-1] + (4, 4))
+    matrices[..., 0, 0] = 1
+    matrices[..., 1, 1] = 1
+    matrices[..., 2, 2] = 1
+    matrices[..., 3, 3] = 1
+    matrices[..., :3, 3] = offsets
+    return matrices
+
+
+def rotation_matrices(axes, angles):
+    angles = np.asarray(angles, np.dtype('float64'))
+    axes = np.asarray(axes, np.dtype('float64'))
+    shape = np.broadcast_shapes(angles.shape, axes.shape[:-1])
+    angles = np.broadcast_to(angles, shape)
+    axes = np.broadcast_to(axes, shape + (3,))
+    norms = np.linalg.norm(axes, axis=-1)
+
+    # glRotatef leaves the matrix untouched for a null axis
+    null_axis = norms == 0
+    angles = np.where(null_axis, 0, angles)
+    axes = axes / np.where(null_axis, 1, norms)[..., np.newaxis]
+
+    x, y, z = axes[..., 0], axes[..., 1], axes[..., 2]
+    c = np.cos(angles)
+    s = np.sin(angles)
+    t = 1 - c
+
+    rotations = np.empty(shape + (3, 3))
+    rotations[..., 0, 0] = t*x*x + c
+    rotations[..., 0, 1] = t*x*y - s*z
+    rotations[..., 0, 2] = t*x*z + s*y
+    rotations[..., 1, 0] = t*x*y + s*z
+    rotations[..., 1, 1] = t*y*y + c
+    rotations[..., 1, 2] = t*y*z - s*x
+    rotations[..., 2, 0] = t*x*z - s*y
+    rotations[..., 2, 1] = t*y*z + s*x
+    rotations[..., 2, 2] = t*z*z + c
+    return rotations
+
+
+def rotations(axis, axis_offset, theta, theta_offset, phi, phi_offset, mode=None):
+    theta = np.asarray(theta, np.dtype('float64')) + theta_offset
+
+    if mode == "spherical":
+        phi = np.asarray(phi, np.dtype('float64')) + phi_offset
+        return np.matmul(rotation_matrices((0, 1, 0), theta), rotation_matrices((0, 0, 1), phi))
+
+    return rotation_matrices(np.asarray(axis, np.dtype('float64')) + axis_offset, theta)
+
+
+def model_matrices(origin,
+                   origin_offset=(0, 0, 0),
+                   axis=(0, 1, 0),
+                   axis_offset=(0, 0, 0),
+                   theta=0,
+                   theta_offset=0,
+                   phi=0,
+                   phi_offset=0,
+                   mode=None):
+
+    '''
+        Same transform as Solids.draw: T(origin) . R . T(origin_offset), where R is
+        Ry(theta) . Rz(phi) in "spherical" mode and a rotation of theta about
+        axis + axis_offset otherwise. Angles are in radians, every argument
+        broadcasts over a leading (N,) dimension and the result is (N, 4, 4).
+    '''
+    origin = np.asarray(origin, np.dtype('float64'))
+    origin_offset = np.asarray(origin_offset, np.dtype('float64'))
+    rotation = rotations(axis, axis_offset, theta, theta_offset, phi, phi_offset, mode)
+
+    shape = np.broadcast_shapes(rotation.shape[:-2], origin.shape[:-1], origin_offset.shape[:-1])
+    matrices = np.zeros(shape + (4, 4))
+    matrices[..., :3, :3] = rotation
+    matrices[..., :3, 3] = origin + np.einsum('...ij,...j->...i', rotation, origin_offset)
+    matrices[..., 3, 3] = 1
+    return matrices
+
+
+def solids_arrays(solids_list):
+    return {'origin': np.array([solid.origin for solid in solids_list], np.dtype('float64')),
+            'origin_offset': np.array([solid.origin_offset for solid in solids_list], np.dtype('float64')),
+            'axis': np.array([solid.axis for solid in solids_list], np.dtype('float64')),
+            'axis_offset': np.array([solid.axis_offset for solid in solids_list], np.dtype('float64')),
+            'theta': np.array([solid.theta_degree for solid in solids_list], np.dtype('float64')) * np.pi / 180,
+            'theta_offset': np.array([solid.theta_degree_offset for solid in solids_list],
+                                     np.dtype('float64')) * np.pi / 180,
+            'phi': np.array([solid.phi_degree for solid in solids_list], np.dtype('float64')) * np.pi / 180,
+            'phi_offset': np.array([solid.phi_degree_offset for solid in solids_list],
+                                   np.dtype('float64')) * np.pi / 180}
+
+
+def solids_model_matrices(solids_list, mode=None):
+    if len(solids_list) == 0:
+        return np.zeros((0, 4, 4))
+    return model_matrices(mode=mode, **solids_arrays(solids_list))
+
+
+def transform_points(matrices, points):
+    points = np.asarray(points, np.dtype('float64'))
+    return np.einsum('...ij,...vj->...vi', matrices[..., :3, :3], points) + matrices[..., np.newaxis, :3, 3]
+
+
+def gl_matrix(matrix):
+    return np.ascontiguousarray(np.transpose(matrix), np.dtype('float32'))
+
+
+def look_at(eye, target=(0, 0, 0), up=(0, 1, 0)):
+    # gluLookAt as (N, 4, 4) modelview matrices; eye, target and up broadcast over a leading (N,)
+    eye = np.asarray(eye, np.dtype('float64'))
+    target = np.asarray(target, np.dtype('float64'))
+    up = np.asarray(up, np.dtype('float64'))
+
+    forward = target - eye
+    forward = forward / np.linalg.norm(forward, axis=-1, keepdims=True)
+    side = np.cross(forward, up)
+    side = side / np.linalg.norm(side, axis=-1, keepdims=True)
+    up = np.cross(side, forward)
+
+    shape = np.broadcast_shapes(eye.shape, target.shape, up.shape)[:-1]
+    matrices = np.zeros(shape + (4, 4))
+    matrices[..., 0, :3] = side
+    matrices[..., 1, :3] = up
+    matrices[..., 2, :3] = -forward
+    matrices[..., :3, 3] = -np.einsum('...ij,...j->...i', matrices[..., :3, :3], eye)
+    matrices[..., 3, 3] = 1
+    return matrices
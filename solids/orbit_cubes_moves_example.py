@@ -1,11 +1,7 @@
-import pygame
-from pygame.locals import *
-
+import time
+from solids.Backends import create_context
 from solids.Solids import *
 
-from OpenGL.GL import *
-from OpenGL.GLU import *
-
 
 class Orbit(SolidsGroup):
     def __init__(self,
@@ -63,10 +59,13 @@ class Orbit(SolidsGroup):
                          theta=theta)
 
 
-def main():
-    pygame.init()
+def main(backend=None, frames=None, frame_callback=None):
     display = (800, 600)
-    pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+    context = create_context(display, backend)
+    # GL is only imported once create_context has chosen the platform for the backend
+    from OpenGL.GL import glMatrixMode, glEnable, glClear, GL_MODELVIEW, GL_DEPTH_TEST, GL_COLOR_BUFFER_BIT, \
+        GL_DEPTH_BUFFER_BIT
+    from OpenGL.GLU import gluPerspective
 
     gluPerspective(50, (display[0]/display[1]), 0.1, 50.0)
     glMatrixMode(GL_MODELVIEW)
@@ -119,20 +118,26 @@ def main():
                             axis=(-1, 0, 1),
                             theta=np.pi/2))
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
+    frame = 0
+    while frames is None or frame < frames:
+        if context.quit_requested():
+            break
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
         for i, orbit in enumerate(orbit_list):
             orbit.theta += np.pi/(20+i)
             orbit.draw()
 
-        pygame.display.flip()
+        if frame_callback is not None:
+            frame_callback(frame, context)
+        context.finish_frame()
+        frame += 1
+
+        if not context.headless:
+            time.sleep(0.033)
 
-        pygame.time.wait(33)
+    context.close()
 
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
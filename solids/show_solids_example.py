@@ -1,16 +1,15 @@
-import pygame
-from pygame.locals import *
-
+import time
+from solids.Backends import create_context
 from solids.Solids import *
 
-from OpenGL.GL import *
-from OpenGL.GLU import *
-
 
-def main():
-    pygame.init()
+def main(backend=None, frames=None, frame_callback=None):
     display = (800, 600)
-    pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+    context = create_context(display, backend)
+    # GL is only imported once create_context has chosen the platform for the backend
+    from OpenGL.GL import glMatrixMode, glEnable, glClear, GL_MODELVIEW, GL_DEPTH_TEST, GL_COLOR_BUFFER_BIT, \
+        GL_DEPTH_BUFFER_BIT
+    from OpenGL.GLU import gluPerspective
 
     gluPerspective(50, (display[0]/display[1]), 0.1, 50.0)
     glMatrixMode(GL_MODELVIEW)
@@ -32,11 +31,10 @@ def main():
 
     hexagon_1 = Hexagon(color=(0, 0.1, 0.7))
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
+    frame = 0
+    while frames is None or frame < frames:
+        if context.quit_requested():
+            break
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
         cube_1.origin = [1, 0, -5]
@@ -69,9 +67,16 @@ def main():
         hexagon_1.theta -= 0.01*np.pi
         hexagon_1.draw()
 
-        pygame.display.flip()
+        if frame_callback is not None:
+            frame_callback(frame, context)
+        context.finish_frame()
+        frame += 1
+
+        if not context.headless:
+            time.sleep(0.033)
 
-        pygame.time.wait(33)
+    context.close()
 
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
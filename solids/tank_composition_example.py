@@ -1,11 +1,7 @@
-import pygame
-from pygame.locals import *
-
+import time
+from solids.Backends import create_context
 from solids.Solids import *
 
-from OpenGL.GL import *
-from OpenGL.GLU import *
-
 
 class Tank(SolidsGroup):
     def __init__(self,
@@ -157,10 +153,13 @@ class Tank(SolidsGroup):
                          theta=theta)
 
 
-def main():
-    pygame.init()
+def main(backend=None, frames=None, frame_callback=None):
     display = (800, 600)
-    pygame.display.set_mode(display, DOUBLEBUF | OPENGL)
+    context = create_context(display, backend)
+    # GL is only imported once create_context has chosen the platform for the backend
+    from OpenGL.GL import glMatrixMode, glEnable, glClear, GL_MODELVIEW, GL_DEPTH_TEST, GL_COLOR_BUFFER_BIT, \
+        GL_DEPTH_BUFFER_BIT
+    from OpenGL.GLU import gluPerspective
 
     gluPerspective(50, (display[0]/display[1]), 0.1, 50.0)
     glMatrixMode(GL_MODELVIEW)
@@ -170,11 +169,10 @@ def main():
                   axis=(1, -1, 0))
     i = 0
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
+    frame = 0
+    while frames is None or frame < frames:
+        if context.quit_requested():
+            break
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
         tank_1.draw()
@@ -189,9 +187,16 @@ def main():
         if i >= 80:
             i = 0
 
-        pygame.display.flip()
+        if frame_callback is not None:
+            frame_callback(frame, context)
+        context.finish_frame()
+        frame += 1
+
+        if not context.headless:
+            time.sleep(0.033)
 
-        pygame.time.wait(33)
+    context.close()
 
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# a module that imported OpenGL.GL at the top would bind PyOpenGL's platform before create_context picks it
+IMPORT_EXAMPLES = textwrap.dedent('''
+    import sys
+    import RobotArm.example_openGL
+    import RobotArm.Capture
+    import solids.show_solids_example
+    import solids.tank_composition_example
+    import solids.orbit_cubes_moves_example
+    import solids.OfflineRender
+
+    assert 'OpenGL.GL' not in sys.modules, 'OpenGL.GL imported before a context was created'
+''')
+
+
+def test_examples_leave_the_platform_unbound():
+    result = subprocess.run([sys.executable, '-c', IMPORT_EXAMPLES], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
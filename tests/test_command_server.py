@@ -0,0 +1,76 @@
+import threading
+import pytest
+from RobotArm.CommandServer import CommandServer, CommandClient
+
+
+class RecordingPart:
+    def __init__(self):
+        self.__dict__['calls'] = []
+
+    def __setattr__(self, name, value):
+        self.calls.append((name, value))
+
+
+@pytest.fixture
+def server():
+    server = CommandServer({'part0': RecordingPart(), 'part1': RecordingPart()}, port=0).start()
+    yield server
+    server.close()
+
+
+def closes_in_time(server, timeout=5.0):
+    thread = threading.Thread(target=server.close, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def test_setpoints_are_merged_per_part_and_acknowledged(server):
+    with CommandClient(server.address) as client:
+        first = client.send([{'part': 'part0', 'theta_degree': 10, 'origin': (1, 2, 3)}])
+        second = client.send([{'part': 'part0', 'theta': 0.5}, {'part': 'part1', 'phi_degree': 20}])
+        client.send([{'part': 'part0', 'theta': 3.0}, {'part': 'nope', 'theta': 1.0}])
+        # replies come in order, so once the rejection is back the earlier batches are queued
+        assert 'unknown part' in client.receive()['error']
+
+        assert server.apply() == 2
+        part0, part1 = server.parts['part0'], server.parts['part1']
+        # theta replaced the earlier theta_degree, and the rejected theta=3.0 never landed
+        assert [name for name, _ in part0.calls] == ['origin', 'theta']
+        assert part0.calls[1] == ('theta', 0.5)
+        assert list(part0.calls[0][1]) == [1.0, 2.0, 3.0]
+        assert part1.calls == [('phi_degree', 20.0)]
+
+        server.frame_presented(3)
+        replies = [client.receive(), client.receive()]
+        assert [reply['id'] for reply in replies] == [first, second]
+        assert all(reply['frame'] == 3 and reply['latency_ms'] >= 0 for reply in replies)
+
+        statistics = server.statistics.summary()
+        assert statistics['batches'] == 2
+        assert statistics['rejected'] == 1
+        assert statistics['coalesced'] == 1
+
+
+def test_invalid_batches_are_rejected(server):
+    with CommandClient(server.address) as client:
+        client.socket.sendall(b'not json\n')
+        assert client.receive()['id'] is None
+        batch_id = client.send([{'part': 'part0', 'origin': [0, 1]}])
+        assert client.receive() == {'id': batch_id, 'error': "origin must be 3 finite numbers, got [0, 1]"}
+    assert server.apply() == 0
+    assert server.parts['part0'].calls == []
+
+
+def test_close_with_a_client_connected(server):
+    with CommandClient(server.address) as client:
+        pending = client.send([{'part': 'part0', 'theta': 1.0}])
+        client.send([{'part': 'part0', 'phi': None}])
+        assert 'error' in client.receive()
+
+        assert closes_in_time(server)
+        # the batch that was never presented is answered, then the connection ends
+        reply = client.receive()
+        assert reply['id'] == pending and 'closed' in reply['error']
+        with pytest.raises(ConnectionError):
+            client.receive()
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from RobotArm.Parts import Part
+from RobotArm.Kinematics import Chain, IKSolver
+
+
+LENGTHS = (1.0, 0.8, 0.6)
+
+
+@pytest.fixture
+def chain():
+    return Chain([Part(origin=(0.5, -2, -5), length=length) for length in LENGTHS])
+
+
+def random_joints(count, seed=0):
+    return np.random.default_rng(seed).uniform(0.2, 1.2, (count, 2 * len(LENGTHS)))
+
+
+def test_forward_end_points_match_parts():
+    joints = random_joints(1)[0]
+    parts = []
+    origin = (0.5, -2, -5)
+    for index, length in enumerate(LENGTHS):
+        part = Part(origin=origin, length=length, theta=joints[2 * index], phi=joints[2 * index + 1])
+        parts.append(part)
+        # Part.x/y/z read the origin as (x, z, y)
+        origin = (part.x, part.z, part.y)
+
+    positions = Chain(parts).forward(joints)
+    assert positions.shape == (len(parts) + 1, 3)
+    assert positions[0] == pytest.approx([0.5, -5, -2])
+    for part, position in zip(parts, positions[1:]):
+        assert position == pytest.approx([part.x, part.y, part.z])
+
+
+def test_forward_is_batched_and_takes_degrees(chain):
+    joints = random_joints(4)
+    positions = chain.forward(joints)
+    assert positions.shape == (4, len(LENGTHS) + 1, 3)
+    assert positions[2] == pytest.approx(chain.forward(joints[2]))
+    assert chain.forward(np.degrees(joints), degrees=True) == pytest.approx(positions)
+    with pytest.raises(ValueError):
+        chain.forward(np.zeros(5))
+
+
+@pytest.mark.parametrize("cumulative", [False, True])
+def test_jacobian_matches_finite_differences(chain, cumulative):
+    joints = random_joints(3, seed=1)
+    jacobian = chain.jacobian(joints, cumulative)
+
+    step = 1e-6
+    for column in range(chain.joint_count):
+        delta = np.zeros(chain.joint_count)
+        delta[column] = step
+        numeric = (chain.end_effector(joints + delta, cumulative)
+                   - chain.end_effector(joints - delta, cumulative)) / (2 * step)
+        assert jacobian[:, :, column] == pytest.approx(numeric, abs=1e-6)
+
+
+@pytest.mark.parametrize("cumulative", [False, True])
+def test_ik_converges_on_reachable_targets(chain, cumulative):
+    targets = chain.end_effector(random_joints(20, seed=2), cumulative)
+    solver = IKSolver(chain, cumulative=cumulative)
+    result = solver.solve(targets, initial=np.full(chain.joint_count, 0.7))
+
+    assert result.converged.all()
+    assert chain.end_effector(result.joints, cumulative) == pytest.approx(targets, abs=solver.tolerance)
+    assert result.iterations.max() < solver.max_iterations
+
+
+def test_ik_reports_unreachable_targets(chain):
+    reach = sum(LENGTHS)
+    targets = np.vstack((chain.end_effector(random_joints(1, seed=3)),
+                         chain.base + [2 * reach, 0, 0]))
+    result = IKSolver(chain).solve(targets, initial=np.full(chain.joint_count, 0.7))
+
+    assert result.converged.tolist() == [True, False]
+    assert result.residuals[1] >= reach
+    assert result.summary()['converged'] == 1
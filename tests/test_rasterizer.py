@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import textwrap
+import numpy as np
+from solids.Rasterizer import Rasterizer, scene_geometry
+from solids.Solids import Cube
+from solids.SolidsArray import SolidsArray
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# None in sys.modules makes every import of OpenGL fail, as on a machine without the library
+WITHOUT_OPENGL = textwrap.dedent('''
+    import sys
+    sys.modules['OpenGL'] = None
+
+    import numpy as np
+    from solids.Solids import Cube
+    from solids.Rasterizer import Rasterizer
+    from solids.OfflineRender import FrameRenderer, TankAnimation
+
+    image, depth = Rasterizer((64, 48)).render(Cube(origin=(0, 0, -5)))
+    assert image.shape == (48, 64, 3)
+    assert (depth < 1).any()
+
+    renderer = FrameRenderer(TankAnimation, screen_size=(80, 60), backend="raster")
+    frame = renderer.render_frame(0)
+    assert frame.shape == (60, 80, 3)
+    assert frame.any()
+    renderer.close()
+
+    assert not any(name.startswith('OpenGL.') for name in sys.modules)
+''')
+
+
+def test_rasterizer_without_opengl():
+    result = subprocess.run([sys.executable, '-c', WITHOUT_OPENGL], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_solids_array_geometry_matches_its_solids():
+    cubes = [Cube(origin=(i - 1, 0, -5), size=0.5, theta=0.3 * i, color=(0.2 * i, 0.5, 0.1)) for i in range(3)]
+    for cube in cubes:
+        cube.color_offset = np.array([0.1, 0, 0])
+    array = SolidsArray.from_solids(cubes)
+    array.hide([1])
+
+    # the hidden element is left out, the others keep their colors and transforms
+    assert len(scene_geometry(array)) == len(scene_geometry([cubes[0], cubes[2]]))
+    rasterizer = Rasterizer((80, 60))
+    image, depth = rasterizer.render(array)
+    expected_image, expected_depth = rasterizer.render([cubes[0], cubes[2]])
+    assert (image == expected_image).all()
+    assert np.allclose(depth, expected_depth)
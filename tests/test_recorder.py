@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from RobotArm.Recorder import HEADER_SIZE, TrajectoryRecorder, TrajectoryReader, TrajectoryPlayer, read_header
+
+
+class Pose:
+    def __init__(self, theta, phi, origin):
+        self.theta = theta
+        self.phi = phi
+        self.origin = np.asarray(origin, np.dtype('float64'))
+
+
+def poses(frame):
+    return [Pose(0.1 * frame, 0.2 * frame, (frame, -frame, 2 * frame)),
+            Pose(-0.1 * frame, 0.05 * frame, (0, 1, frame))]
+
+
+def test_recording_round_trip(tmp_path):
+    path = str(tmp_path / "trajectory.bin")
+    # a small chunk makes the recording grow and remap several times
+    with TrajectoryRecorder(path, 2, chunk_frames=4) as recorder:
+        for frame in range(10):
+            recorder.record(poses(frame), 0.5 * frame)
+
+    header = read_header(path)
+    assert int(header['frames']) == 10
+    assert int(header['part_count']) == 2
+    reader = TrajectoryReader(path)
+    # close() trims the unused end of the last chunk
+    assert (tmp_path / "trajectory.bin").stat().st_size == HEADER_SIZE + 10 * reader.dtype.itemsize
+
+    assert len(reader) == 10
+    assert reader.duration == pytest.approx(4.5)
+    for frame in range(10):
+        record = reader[frame]
+        assert record['time'] == pytest.approx(0.5 * frame)
+        for index, pose in enumerate(poses(frame)):
+            assert record['theta'][index] == pytest.approx(pose.theta)
+            assert record['phi'][index] == pytest.approx(pose.phi)
+            assert record['origin'][index] == pytest.approx(pose.origin)
+
+    assert reader.frame_at(-1.0) == 0
+    assert reader.frame_at(1.2) == 2
+    assert reader.frame_at(1.5) == 3
+    assert reader.frame_at(100.0) == 9
+
+    parts = poses(0)
+    player = TrajectoryPlayer(reader)
+    player.advance(2.0, parts)
+    assert player.frame == 4
+    assert parts[0].origin == pytest.approx([4, -4, 8])
+
+
+def test_reader_sees_frames_recorded_so_far(tmp_path):
+    path = str(tmp_path / "live.bin")
+    recorder = TrajectoryRecorder(path, 2, chunk_frames=4)
+    try:
+        assert len(TrajectoryReader(path)) == 0
+        for frame in range(6):
+            recorder.record(poses(frame), 0.5 * frame)
+            reader = TrajectoryReader(path)
+            assert len(reader) == frame + 1
+            assert reader.times[-1] == pytest.approx(0.5 * frame)
+    finally:
+        recorder.close()
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b'not a trajectory'.ljust(HEADER_SIZE, b'\0'))
+    with pytest.raises(ValueError):
+        TrajectoryReader(str(path))
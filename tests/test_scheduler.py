@@ -0,0 +1,41 @@
+import pytest
+from RobotArm.Scheduler import FixedTimestepScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def run_frames(scheduler, clock, work_times):
+    for work in work_times:
+        scheduler.begin_frame()
+        clock.now += work
+        scheduler.end_frame()
+
+
+def test_every_frame_is_recorded_including_the_last():
+    clock = FakeClock()
+    scheduler = FixedTimestepScheduler(tick_rate=10, clock=clock, sleep=clock.sleep)
+    run_frames(scheduler, clock, [0.01, 0.25, 0.02])
+
+    summary = scheduler.statistics.summary()
+    assert summary['frames'] == 3
+    assert summary['missed_deadlines'] == 1
+    # frames that finish early are paced to the 100 ms slot, the overrun one keeps its own length
+    assert list(scheduler.statistics.frame_times) == pytest.approx([0.1, 0.25, 0.1])
+
+
+def test_headless_frames_are_recorded_without_sleeping():
+    clock = FakeClock()
+    scheduler = FixedTimestepScheduler(tick_rate=10, realtime=False, clock=clock, sleep=clock.sleep)
+    run_frames(scheduler, clock, [0.01, 0.02])
+
+    assert list(scheduler.statistics.frame_times) == pytest.approx([0.01, 0.02])
+    assert scheduler.statistics.missed_deadlines == 0